@@ -27,11 +27,19 @@ import atexit
 import signal
 import logging
 import threading
-import datetime
+import queue
 from typing import Optional
-from time import monotonic as _mono
+from collections import deque
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic as _mono, monotonic_ns as _mono_ns
 import re, unicodedata
 
+try:
+    import orjson  # optional: faster profile JSON parsing
+except ImportError:
+    orjson = None
+
 # ───────────────────────────── Flask imports ───────────────────────────────
 from flask import Flask
 from flask import redirect, url_for
@@ -59,12 +67,14 @@ import devices
 from devices import (
     init_actuators,
     _set_fan, _set_heater, _set_humidifier, _set_agitator, _set_air_pump, _set_main_pump,
-    apply_outputs_from_status, cleanup_gpio as devices_cleanup_gpio,
+    _all_outputs_off, apply_outputs_from_status, cleanup_gpio as devices_cleanup_gpio,
     fan_configured, pump_configured, heater_configured, humidifier_configured, agitator_configured, air_pump_configured,
     _ensure_gpio_mode,
 )
 
 from core.alerts import send_discord, stop_alert_worker
+from core.status import StatusData, CTRL_PAUSED, CTRL_PUMP_ON, CTRL_AGITATOR_ON, CTRL_AIR_PUMP_ON
+from web.system_routes import refresh_status_json
 
 from sensors.dht import read_humidity_top_bottom
 from sensors.ds18b20 import read_air_temps_top_bottom, read_water_temp
@@ -75,6 +85,7 @@ from reservoirs.persistence import load_last_fill_iso, load_humid_last_fill_iso
 
 # ── Scale (HX711) raw access (sampler below uses it internally) ───────────
 from sensors.scale import _SCALE_LOCK, _scale_read_counts, _load_scale_cal  # noqa: F401
+from sensors.scale import _scale_read_counts_humid, _load_humid_scale_cal, _median_ema
 
 # ── Structured logging (SQLite) ───────────────────────────────────────────
 from logging_store.store import EventLogger
@@ -86,6 +97,7 @@ from state_manager import save_state, load_state, clear_state
 # ── Global settings module ────────────────────────────────────────────────
 from global_settings import (
     load_global_settings, save_global_settings, validate_settings,
+    get_cached_global_settings,
     DEFAULTS as GLOBAL_DEFAULTS,
 )
 
@@ -135,82 +147,10 @@ app.register_blueprint(logs_bp, url_prefix="/logs/api")
 
 # ──────────────────────────── Runtime State ───────────────────────────────
 running_profile: Optional[str] = None  # filename of the running profile
-status_data = {
-    "profile":     None,
-    "pump_state":  "OFF",
-    "cycle_count": 0,
-    "start_time":  None,
-    "fan_state":   "OFF",
-    "heater_state":"OFF",
-    "humidifier_state": "OFF",
-    "paused": False,
-    "humidity": None,
-    "temperature_c": None,
-    "agitator_state": "OFF",
-    "last_error": None,
-
-    # Timed devices (phase bookkeeping)
-    "pump_resume_phase": None,
-    "pump_time_remaining_s": None,
-    "pump_phase_end_ts": None,
-    "pump_time_total_s": None,
-    "pump_resume_remaining_s": None,
-
-    # Reservoir exposure
-    "reservoir_status": None,
-    "humid_res_gross_kg": None,
-    "humid_res_water_raw": None,
-    "humid_res_water_kg": None,
-    "humid_reservoir_water_kg": None,
-    "humid_res_status": None,
-    "humid_res_debug": None,
-    "reservoir_weight_kg": None,
-    "reservoir_water_kg": None,
-    "pump_cycle_res_before_kg": None,
-    "reservoir_last_fill_iso": load_last_fill_iso(),
-    "humid_res_last_fill_iso": load_humid_last_fill_iso(),
-
-    # Manual overrides (per-device state + timers)
-    "manual_overrides": {},
-
-    # Concentrate mixer state (used as nutrient stirrer)
-    "concentrate_mix_state": "OFF",
-
-    # Agitator/Air pump timers
-    "agitator_time_remaining_s": None,
-    "agitator_phase_end_ts": None,
-    "agitator_time_total_s": None,
-    "air_pump_time_remaining_s": None,
-    "air_pump_phase_end_ts": None,
-    "air_pump_time_total_s": None,
-    
-    # NEW — nutrient dosing live flags (populated via devices + service)
-    "nutrient_A_on": False,         # True while pump A GPIO is energised
-    "nutrient_B_on": False,         # True while pump B GPIO is energised
-    "dosing_phase": None,           # "A" | "B" | None (which pump is running right now)
-    "dosing_running": False,        # True if either A or B is running
-
-    # Thresholds & readings (start cleared)
-    "temperature_min": None,
-    "temperature_target": None,
-    "temperature_max": None,
-    "humidity_min": None,
-    "humidity_target": None,
-    "humidity_max": None,
-    "water_temperature": None,
-    "water_temperature_min": None,
-    "water_temperature_target": None,
-    "water_temperature_max": None,
-    "water_quantity_min": None,
-    "temperature_top": None,
-    "temperature_bottom": None,
-    "temperature_avg": None,
-    "temperature_gradient": None,
-    "humidity_top": None,
-    "humidity_bottom": None,
-    "reservoir_gross_kg": None,
-
-}
+status_data = StatusData(
+    reservoir_last_fill_iso=load_last_fill_iso(),
+    humid_res_last_fill_iso=load_humid_last_fill_iso(),
+)
 
 # Last-good caches for UI smoothing (DHT/DS18B20)
 _last_hum_top = None
@@ -229,6 +169,10 @@ def _home_alias():
 # ───────────────────── Graceful stop plumbing ─────────────────────────────
 STOP_EVENT = threading.Event()
 SIM_THREAD: Optional[threading.Thread] = None
+# Set by the profile editor after it rewrites a profile; the loop reloads on its next tick
+PROFILE_RELOAD_EVENT = threading.Event()
+# Fallback mtime check for edits made outside the web UI
+PROFILE_MTIME_CHECK_S = 30.0
 
 def _graceful_stop(*_args):
     """Handle SIGTERM by signaling worker loop to exit."""
@@ -261,18 +205,37 @@ def _humid_tracker_settings(gs: dict) -> dict:
     }
 
 
+def _wait_until(stop_evt, deadline_ns, period_ns):
+    """Sleep to a fixed-cadence deadline (int ns); return the next one (skip ahead after an overrun)."""
+    sleep_ns = deadline_ns - _mono_ns()
+    if sleep_ns > 0:
+        stop_evt.wait(sleep_ns / 1e9)
+        return deadline_ns + period_ns
+    return _mono_ns() + period_ns
+
+
 class _ScaleSampler:
     """
     Lightweight HX711 sampler providing a thread-safe gross reservoir kg value.
     Keeps UI responsive without blocking control loop on each read.
     """
-    def __init__(self, period_s=0.5, n=6):
+    def __init__(self, period_s=0.5, n=3, ring=3, alpha=0.6):
         self.period_s = float(period_s)
         self.n = int(n)
+        # Few samples per tick; the median across the last `ring` ticks plus a
+        # light EMA does the noise rejection instead of long blocking reads.
+        self.alpha = float(alpha)
+        self._ring = deque(maxlen=int(ring))
+        self._ring_humid = deque(maxlen=int(ring))
         self._val = None
         self._humid_val = None
+        # counts()/counts_humid() hand out the latest raw HX711 read (None after a
+        # failed one); the median/EMA state behind value() lives separately and
+        # rides through a failed read instead of restarting from scratch.
         self._raw_counts = None
         self._raw_counts_humid = None
+        self._filt_counts = None
+        self._filt_counts_humid = None
         self._lock = threading.Lock()
         self._t = None
         self._stop = threading.Event()
@@ -305,88 +268,117 @@ class _ScaleSampler:
         with self._lock:
             return self._raw_counts_humid
 
-    def _run(self):
-        from sensors.scale import (
-            _SCALE_LOCK,
-            _HUMID_SCALE_LOCK,
-            _scale_read_counts,
-            _scale_read_counts_humid,
-            _load_scale_cal,
-            _load_humid_scale_cal,
-        )
-        from global_settings import load_global_settings
+    def filtered_counts(self):
+        with self._lock:
+            return self._filt_counts
+
+    def filtered_counts_humid(self):
+        with self._lock:
+            return self._filt_counts_humid
 
+    def _run(self):
+        # Hot names as locals (LOAD_FAST) for the sampling loop
+        read_counts, read_counts_humid = _scale_read_counts, _scale_read_counts_humid
+        load_cal, load_humid_cal = _load_scale_cal, _load_humid_scale_cal
+        load_gs, median_ema = get_cached_global_settings, _median_ema
+        n, alpha, lock = self.n, self.alpha, self._lock
+
+        period_ns = int(self.period_s * 1e9)
+        deadline = _mono_ns() + period_ns
         while not self._stop.is_set():
             try:
-                cal = _load_scale_cal()
+                cal = load_cal()
                 if cal:
-                    with _SCALE_LOCK:
-                        counts = _scale_read_counts(self.n)
+                    # _scale_read_counts takes _SCALE_LOCK itself, per read
+                    raw = read_counts(n)
+                    counts = None
+                    if raw is not None:
+                        self._ring.append(raw)
+                        counts = median_ema(self._ring, self._filt_counts, alpha)
                     if counts is not None:
                         water_kg = (counts - cal["baseline_counts"]) / cal["counts_per_kg"]
                         if water_kg < 0:
                             water_kg = 0.0
-                        gs = load_global_settings()
+                        gs = load_gs()
                         empty = float(gs.get("reservoir_empty_weight_kg", 0.0) or 0.0)
                         gross_kg = empty + water_kg
-                        with self._lock:
-                            self._raw_counts = counts
+                        with lock:
+                            self._raw_counts = raw
+                            self._filt_counts = counts
                             self._val = gross_kg
                     else:
-                        with self._lock:
+                        with lock:
                             self._raw_counts = None
                 else:
-                    with self._lock:
+                    with lock:
                         self._raw_counts = None
             except Exception:
-                with self._lock:
+                with lock:
                     self._raw_counts = None
             try:
-                hcal = _load_humid_scale_cal()
+                hcal = load_humid_cal()
                 if hcal:
-                    with _HUMID_SCALE_LOCK:
-                        hcounts = _scale_read_counts_humid(self.n)
+                    hraw = read_counts_humid(n)
+                    hcounts = None
+                    if hraw is not None:
+                        self._ring_humid.append(hraw)
+                        hcounts = median_ema(self._ring_humid, self._filt_counts_humid, alpha)
                     if hcounts is not None:
                         hwater_kg = (hcounts - hcal["baseline_counts"]) / hcal["counts_per_kg"]
                         if hwater_kg < 0:
                             hwater_kg = 0.0
-                        hgs = load_global_settings()
+                        hgs = load_gs()
                         hempty = float(hgs.get("humid_res_empty_weight_kg", 0.0) or 0.0)
                         hgross_kg = hempty + hwater_kg
-                        with self._lock:
-                            self._raw_counts_humid = hcounts
+                        with lock:
+                            self._raw_counts_humid = hraw
+                            self._filt_counts_humid = hcounts
                             self._humid_val = hgross_kg
                     else:
-                        with self._lock:
+                        with lock:
                             self._raw_counts_humid = None
                 else:
-                    with self._lock:
+                    with lock:
                         self._raw_counts_humid = None
             except Exception:
-                with self._lock:
+                with lock:
                     self._raw_counts_humid = None
-            self._stop.wait(self.period_s)
+            deadline = _wait_until(self._stop, deadline, period_ns)
 
 # Global sampler instance
-SCALE_SAMPLER = _ScaleSampler(period_s=0.5, n=6)
+SCALE_SAMPLER = _ScaleSampler(period_s=0.5, n=3)
+
+_NO_AIR = {"top": None, "bottom": None, "avg": None, "gradient": None}
+_NO_HUM = {"top": None, "bottom": None, "avg": None}
 
 class _AmbientSampler:
     """
-    Lightweight sampler for air temp, humidity, water temp AND reservoir
-    that runs only when there is NO active profile. Keeps UI populated at all times.
+    Sampler for air temp, humidity and water temp. Always reads, so the control
+    loop takes the latest cached readings instead of blocking on the sensors;
+    when there is NO active profile (or it is paused) it also publishes them and
+    the reservoir to status_data. Keeps UI populated at all times.
     """
+    # Readings older than this are reported as missing (sampler or bus stuck)
+    STALE_S = 10.0
+
     def __init__(self, period_s=1.0):
         self.period_s = float(period_s)
+        self._latest = (_NO_AIR, _NO_HUM, None, 0)  # air, hum, water_c, mono_ns
         self._t = None
         self._stop = threading.Event()
         # NEW: persistent reservoir tracker for smoothing while idle
         self._rt = ReservoirTracker(tau_s=8.0, snap_delta_kg=0.25, water_quant_kg=0.0, hyst_kg=0.5)
         self._humid_rt = ReservoirTracker(tau_s=8.0, snap_delta_kg=0.25, water_quant_kg=0.0, hyst_kg=0.5)
+        # Air/humidity/water reads run side by side so a tick costs ~max, not sum
+        self._pool = None
+        self._futs = {}
 
     def start(self):
         if self._t and self._t.is_alive():
             return
         self._stop.clear()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="amb")
         self._t = threading.Thread(target=self._run, daemon=True)
         self._t.start()
 
@@ -395,41 +387,67 @@ class _AmbientSampler:
             self._stop.set()
         except Exception:
             pass
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, name, fn):
+        # Don't queue another read behind one that is still stuck on the bus
+        fut = self._futs.get(name)
+        if fut is None or fut.done():
+            fut = self._futs[name] = self._pool.submit(fn)
+        return fut
+
+    @staticmethod
+    def _result(fut, default, timeout=2.0):
+        try:
+            return fut.result(timeout=timeout)
+        except Exception:
+            return default
+
+    def readings(self):
+        """Latest (air, hum, water_c); never blocks. Missing/stale reads come back as Nones."""
+        air, hum, water_c, ts_ns = self._latest
+        if _mono_ns() - ts_ns > self.STALE_S * 1e9:
+            return _NO_AIR, _NO_HUM, None
+        return air, hum, water_c
 
     def _run(self):
         # Uses existing globals and helpers in app.py
         global status_data, running_profile, _last_temp, _last_humidity
+        period_ns = int(self.period_s * 1e9)
+        deadline = _mono_ns() + period_ns
         while not self._stop.is_set():
             try:
-                # run when there is NO profile OR when a profile is paused
-                if (not running_profile) or bool(status_data.get("paused", False)):
-                    # ---- existing ambient sensors ----
-                    air = read_air_temps_top_bottom()     # dict: top, bottom, avg, gradient
-                    hum = read_humidity_top_bottom()      # dict: top, bottom, avg
-                    try:
-                        water_c = read_water_temp()
-                    except Exception:
-                        water_c = None
-
+                # ---- ambient sensors (read in parallel, every period) ----
+                f_air = self._submit("air", read_air_temps_top_bottom)
+                f_hum = self._submit("hum", read_humidity_top_bottom)
+                f_water = self._submit("water", read_water_temp)
+                air = self._result(f_air, None) or _NO_AIR   # dict: top, bottom, avg, gradient
+                hum = self._result(f_hum, None) or _NO_HUM   # dict: top, bottom, avg
+                water_c = self._result(f_water, None)
+                self._latest = (air, hum, water_c, _mono_ns())
+
+                # publish only when there is NO profile OR when a profile is paused
+                if (not running_profile) or bool(status_data.paused):
                     if air.get("avg") is not None:
                         _last_temp = air["avg"]
                     if hum.get("avg") is not None:
                         _last_humidity = hum["avg"]
 
-                    status_data.update(
-                        temperature_c=_last_temp,
-                        temperature_top=air.get("top"),
-                        temperature_bottom=air.get("bottom"),
-                        temperature_avg=air.get("avg"),
-                        temperature_gradient=air.get("gradient"),
-                        humidity=_last_humidity,
-                        humidity_top=hum.get("top"),
-                        humidity_bottom=hum.get("bottom"),
-                        water_temperature=water_c,
-                    )
+                    sd = status_data
+                    sd.temperature_c = _last_temp
+                    sd.temperature_top = air.get("top")
+                    sd.temperature_bottom = air.get("bottom")
+                    sd.temperature_avg = air.get("avg")
+                    sd.temperature_gradient = air.get("gradient")
+                    sd.humidity = _last_humidity
+                    sd.humidity_top = hum.get("top")
+                    sd.humidity_bottom = hum.get("bottom")
+                    sd.water_temperature = water_c
 
                     # ---- NEW: reservoir from scale sampler while idle ----
-                    gs = load_global_settings()  # use latest thresholds/capacities
+                    gs = get_cached_global_settings()  # use latest thresholds/capacities
                     res_gross = SCALE_SAMPLER.value()  # gross kg (empty+water) or None
 
                     if res_gross is not None:
@@ -440,34 +458,27 @@ class _AmbientSampler:
                             now_wall_s=time.time()
                         )
                         # Publish exactly what the UI expects
-                        status_data["reservoir_gross_kg"]  = info.get("gross_kg")
-                        status_data["reservoir_weight_kg"] = info.get("gross_kg")
-                        status_data["reservoir_water_raw"] = info.get("water_raw")
-                        status_data["reservoir_water_kg"]  = info.get("water_kg")
-                        status_data["reservoir_status"]    = info.get("status_label")
-                        status_data["reservoir_debug"]     = info.get("debug")
+                        sd.reservoir_gross_kg = sd.reservoir_weight_kg = info.get("gross_kg")
+                        sd.reservoir_water_raw = info.get("water_raw")
+                        sd.reservoir_water_kg = info.get("water_kg")
+                        sd.reservoir_status = info.get("status_label")
+                        sd.reservoir_debug = info.get("debug")
 
                         # --- ADDED: idle recovery banner clear ---
                         # If we’re idle and the reservoir is no longer below cutoff,
                         # clear a lingering banner set during a previous fault.
                         try:
-                            if (not running_profile) and status_data.get("last_error"):
+                            if (not running_profile) and sd.last_error:
                                 alerts = status_data.get("alert_states") or {}
                                 res_alert = alerts.get("reservoir_cutoff") or {}
                                 if (not info.get("below_cutoff_now")) and (not res_alert.get("active")):
-                                    status_data["last_error"] = None
+                                    sd.last_error = None
                         except Exception:
                             pass
 
                     else:
-                        status_data.update(
-                            reservoir_gross_kg=None,
-                            reservoir_weight_kg=None,
-                            reservoir_water_raw=None,
-                            reservoir_water_kg=None,
-                            reservoir_status=None,
-                            reservoir_debug=None
-                        )
+                        sd.reservoir_gross_kg = sd.reservoir_weight_kg = sd.reservoir_water_raw = None
+                        sd.reservoir_water_kg = sd.reservoir_status = sd.reservoir_debug = None
 
                     humid_gross = SCALE_SAMPLER.value_humid()
                     if humid_gross is not None:
@@ -478,26 +489,20 @@ class _AmbientSampler:
                             pump_on=False,
                             now_wall_s=time.time(),
                         )
-                        status_data["humid_res_gross_kg"] = hinfo.get("gross_kg")
-                        status_data["humid_res_water_raw"] = hinfo.get("water_raw")
-                        status_data["humid_res_water_kg"] = hinfo.get("water_kg")
-                        status_data["humid_reservoir_water_kg"] = hinfo.get("water_kg")
-                        status_data["humid_res_status"] = hinfo.get("status_label")
-                        status_data["humid_res_debug"] = hinfo.get("debug")
+                        sd.humid_res_gross_kg = hinfo.get("gross_kg")
+                        sd.humid_res_water_raw = hinfo.get("water_raw")
+                        sd.humid_res_water_kg = sd.humid_reservoir_water_kg = hinfo.get("water_kg")
+                        sd.humid_res_status = hinfo.get("status_label")
+                        sd.humid_res_debug = hinfo.get("debug")
                     else:
-                        status_data.update(
-                            humid_res_gross_kg=None,
-                            humid_res_water_raw=None,
-                            humid_res_water_kg=None,
-                            humid_reservoir_water_kg=None,
-                            humid_res_status=None,
-                            humid_res_debug=None,
-                        )
+                        sd.humid_res_gross_kg = sd.humid_res_water_raw = sd.humid_res_water_kg = None
+                        sd.humid_reservoir_water_kg = sd.humid_res_status = sd.humid_res_debug = None
             except Exception:
                 # Never crash the sampler loop
                 pass
 
-            self._stop.wait(self.period_s)
+            _refresh_status_json()
+            deadline = _wait_until(self._stop, deadline, period_ns)
 
 
 
@@ -506,56 +511,74 @@ class _AmbientSampler:
 
 
 # ───────────────────── System banner helper for UI ────────────────────────
+def _refresh_status_json():
+    """Re-serialize the cached /status.json body after a batch of status writes."""
+    try:
+        refresh_status_json(CTX)
+    except Exception:
+        pass  # CTX not built yet during import, or a transient payload error
+
+
+# Active-action messages, highest priority first: (state_key, unless_on_key, message)
+_ACTION_PRIORITY = (
+    ("heater_state",     None,         "Environment cold – heating now"),
+    ("humidifier_state", None,         "Air dry – humidifying now"),
+    ("fan_state",        None,         "Air hot/stale – extracting now"),
+    ("agitator_state",   "pump_state", "Mixing reservoir – agitator running"),
+    ("pump_state",       None,         "Irrigating – water pump running"),
+)
+
+# Out-of-range nudges: (reading_key, min_key, max_key, below_msg, above_msg)
+_RANGE_CHECKS = (
+    ("temperature_c", "temperature_min", "temperature_max", "Temperature below range", "Temperature above range"),
+    ("humidity",      "humidity_min",    "humidity_max",    "Humidity below range",    "Humidity above range"),
+)
+
+_ROTATE_MSGS = (
+    "Checking all systems…", "Everything looks good.", "Checking all systems…",
+    "Nothing on fire. Good start.", "Plants are plotting world domination.",
+    "Photosynthesis in progress.", "Holding steady.", "Sensors gossiping behind your back.",
+    "Humidity behaving (for now).", "Nutrients shaken, not stirred.",
+    "All sensors nominal.", "Counting imaginary sheep… I mean plants.",
+    "Logging sensor data… probably.", "AI says: everything looks tasty.",
+    "No weeds, we're in the clear.", "Roots on strike until further watering.",
+    "No leaks detected - just leeks detected",
+)
+
 def compute_banner(status: dict) -> dict:
     """
     Decide the top-of-dashboard system message.
     Priority: no-profile > error > paused > active action > out-of-range > ok
     Returns: {"level": "error|warning|info|ok", "message": str, "rotate": [str,...]}
     """
-    if not status.get("profile"):
+    get = status.get
+    if not get("profile"):
         return {"level": "info", "message": "Idle — live monitoring (no active profile)", "rotate": []}
 
-
-    err = status.get("last_error")
+    err = get("last_error")
     if err:
         return {"level": "error", "message": f"Fault detected – {err}", "rotate": []}
 
-    if status.get("paused"):
+    if get("paused"):
         return {"level": "warning", "message": "Paused – automation is halted", "rotate": []}
 
-    if status.get("heater_state") == "ON":
-        return {"level": "info", "message": "Environment cold – heating now", "rotate": []}
-    if status.get("humidifier_state") == "ON":
-        return {"level": "info", "message": "Air dry – humidifying now", "rotate": []}
-    if status.get("fan_state") == "ON":
-        return {"level": "info", "message": "Air hot/stale – extracting now", "rotate": []}
-    if status.get("agitator_state") == "ON" and status.get("pump_state") != "ON":
-        return {"level": "info", "message": "Mixing reservoir – agitator running", "rotate": []}
-    if status.get("pump_state") == "ON":
-        return {"level": "info", "message": "Irrigating – water pump running", "rotate": []}
+    for state_key, unless_key, msg in _ACTION_PRIORITY:
+        if get(state_key) == "ON" and (unless_key is None or get(unless_key) != "ON"):
+            return {"level": "info", "message": msg, "rotate": []}
 
     # quick out-of-range nudges
-    t = status.get("temperature_c")
-    tmin, tmax = status.get("temperature_min"), status.get("temperature_max")
-    h = status.get("humidity")
-    hmin, hmax = status.get("humidity_min"), status.get("humidity_max")
-
-    if t is not None and tmin is not None and t < tmin: return {"level": "warning", "message": "Temperature below range", "rotate": []}
-    if t is not None and tmax is not None and t > tmax: return {"level": "warning", "message": "Temperature above range", "rotate": []}
-    if h is not None and hmin is not None and h < hmin: return {"level": "warning", "message": "Humidity below range", "rotate": []}
-    if h is not None and hmax is not None and h > hmax: return {"level": "warning", "message": "Humidity above range", "rotate": []}
-
-    rotate_msgs = [
-        "Checking all systems…", "Everything looks good.", "Checking all systems…",
-        "Nothing on fire. Good start.", "Plants are plotting world domination.",
-        "Photosynthesis in progress.", "Holding steady.", "Sensors gossiping behind your back.",
-        "Humidity behaving (for now).", "Nutrients shaken, not stirred.",
-        "All sensors nominal.", "Counting imaginary sheep… I mean plants.",
-        "Logging sensor data… probably.", "AI says: everything looks tasty.",
-        "No weeds, we're in the clear.", "Roots on strike until further watering.",
-        "No leaks detected - just leeks detected",
-    ]
-    return {"level": "ok", "message": rotate_msgs[0], "rotate": rotate_msgs}
+    for key, lo_key, hi_key, below_msg, above_msg in _RANGE_CHECKS:
+        v = get(key)
+        if v is None:
+            continue
+        lo = get(lo_key)
+        if lo is not None and v < lo:
+            return {"level": "warning", "message": below_msg, "rotate": []}
+        hi = get(hi_key)
+        if hi is not None and v > hi:
+            return {"level": "warning", "message": above_msg, "rotate": []}
+
+    return {"level": "ok", "message": _ROTATE_MSGS[0], "rotate": _ROTATE_MSGS}
 
 
 # ─────────────────────────── Device + workers init ────────────────────────
@@ -576,6 +599,123 @@ AMBIENT_SAMPLER.start()
 atexit.register(stop_alert_worker)  # stop Discord alert worker on exit
 
 # ───────────────────── Control loop (simulate_profile) ────────────────────
+def _load_json_file(path: str, *, with_mtime: bool = False):
+    """
+    Parse a JSON file (orjson when available). with_mtime=True also returns the
+    st_mtime_ns of the opened file (fstat), i.e. of exactly the bytes parsed.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+        mtime_ns = os.fstat(f.fileno()).st_mtime_ns if with_mtime else None
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return (data, mtime_ns) if with_mtime else data
+
+def _make_window_check(start_h, end_h):
+    """
+    Build a predicate allowed(now_epoch): is the local hour within [start_h, end_h)?
+    Hours are parsed once here (per profile load), not on every tick, and the
+    answer is reused until the next local hour boundary.
+    """
+    if start_h is None or end_h is None:
+        return lambda now_epoch: True
+    try:
+        lo = int(start_h); hi = int(end_h)
+    except Exception:
+        return lambda now_epoch: True
+    if lo == hi:
+        return lambda now_epoch: False  # disabled
+    localtime = time.localtime
+    valid_until = 0.0
+    cached = False
+
+    def allowed(now_epoch):
+        nonlocal valid_until, cached
+        if now_epoch >= valid_until or now_epoch < valid_until - 3600:  # also catches a clock step back
+            lt = localtime(now_epoch)
+            h = lt.tm_hour
+            cached = (lo <= h < hi) if lo < hi else not (hi <= h < lo)  # wraps midnight: h >= lo or h < hi
+            valid_until = now_epoch - (lt.tm_min * 60 + lt.tm_sec + now_epoch % 1.0) + 3600
+        return cached
+    return allowed
+
+def _hyst(gs: dict, key: str, fallback_key: str, fallback: float) -> float:
+    """Dedicated hysteresis if set, else the general one (0.0 when blank)."""
+    v = gs.get(key)
+    return float((v if v is not None else gs.get(fallback_key, fallback)) or 0.0)
+
+# Hard safety limits: (alert name, reading index [air, humidity, water],
+# settings key, hysteresis attr, is-minimum, label, unit, payload keys)
+_HARD_LIMITS = (
+    ("temp_hard_low",   0, "absolute_temp_min_c",       "temp_hyst", True,  "Temperature",       "°C", ("air_t", "min_c", "hyst_c")),
+    ("temp_hard_high",  0, "absolute_temp_max_c",       "temp_hyst", False, "Temperature",       "°C", ("air_t", "max_c", "hyst_c")),
+    ("hum_hard_low",    1, "absolute_humidity_min_pct", "hum_hyst",  True,  "Humidity",          "%",  ("humidity", "min_pct", "hyst_pct")),
+    ("hum_hard_high",   1, "absolute_humidity_max_pct", "hum_hyst",  False, "Humidity",          "%",  ("humidity", "max_pct", "hyst_pct")),
+    ("water_temp_low",  2, "water_temp_min_c",          "wtmp_hyst", True,  "Water temperature", "°C", ("water_c", "min_c", "hyst_c")),
+    ("water_temp_high", 2, "water_temp_max_c",          "wtmp_hyst", False, "Water temperature", "°C", ("water_c", "max_c", "hyst_c")),
+)
+
+# Timed outputs: setter + the StatusData fields describing their current phase
+_TIMED_OUTPUTS = {
+    "pump":     (_set_main_pump, "pump_state", "pump_phase_end_ts", "pump_time_remaining_s"),
+    "agitator": (_set_agitator, "agitator_state", "agitator_phase_end_ts", "agitator_time_remaining_s"),
+    "air_pump": (_set_air_pump, "air_pump_state", "air_pump_phase_end_ts", "air_pump_time_remaining_s"),
+}
+
+# Countdown fields per timed output (pump, agitator, air pump) with the int
+# rounding its UI countdown uses: round() for the pump, ceil() for premix
+_COUNTDOWNS = tuple(
+    (state_k, end_k, rem_k, to_int)
+    for (_, state_k, end_k, rem_k), to_int in zip(
+        _TIMED_OUTPUTS.values(), (round, math.ceil, math.ceil))
+)
+
+def _force_off(sd, name: str):
+    """Switch a timed output OFF and clear its phase end + countdown."""
+    setter, state_k, end_k, rem_k = _TIMED_OUTPUTS[name]
+    setattr(sd, state_k, "OFF")
+    setattr(sd, end_k, None)
+    setattr(sd, rem_k, None)
+    setter(False)
+
+class _GSCache:
+    """
+    Global settings the control loop consults every tick, resolved and coerced
+    once per settings change instead of re-read from the dict on each pass.
+    """
+    __slots__ = (
+        "temp_hyst", "hum_hyst", "wtmp_hyst", "remind_cooldown", "hard_limits",
+        "cutoff_kg", "hyst_ex_t", "hyst_ex_h", "hyst_heater", "hyst_humidifier",
+        "fan_min_on", "heater_min_on", "humidifier_min_on",
+        "humid_settings", "humid_crit_kg", "humid_margin_kg",
+    )
+
+    def __init__(self, gs: dict):
+        self.temp_hyst = _hyst(gs, "absolute_temp_hyst_c", "hysteresis_temp_c", 0.5)
+        self.hum_hyst = _hyst(gs, "absolute_humidity_hyst_pct", "hysteresis_humidity_pct", 1.5)
+        self.wtmp_hyst = _hyst(gs, "absolute_water_temp_hyst_c", "hysteresis_temp_c", 0.5)
+        self.remind_cooldown = int(gs.get("hard_alert_cooldown_s") or 300)  # 5 min default
+        # Only the limits that are configured, with their hysteresis bound in
+        self.hard_limits = tuple(
+            (name, idx, gs[key], getattr(self, hyst), is_min, label, unit, keys)
+            for name, idx, key, hyst, is_min, label, unit, keys in _HARD_LIMITS
+            if gs.get(key) is not None
+        )
+        self.cutoff_kg = float(gs.get("reservoir_pump_cutoff_water_kg", 0) or 0.0)
+        self.hyst_ex_t = _hyst(gs, "hysteresis_temp_extractor_c", "hysteresis_temp_c", 0.5)
+        self.hyst_ex_h = _hyst(gs, "hysteresis_humidity_extractor_pct", "hysteresis_humidity_pct", 1.5)
+        self.hyst_heater = _hyst(gs, "hysteresis_temp_heater_c", "hysteresis_temp_c", 0.5)
+        self.hyst_humidifier = _hyst(gs, "hysteresis_humidity_humidifier_pct", "hysteresis_humidity_pct", 1.5)
+        self.fan_min_on = int(gs.get("fan_min_on_s", 0) or 0)
+        self.heater_min_on = int(gs.get("heater_min_on_s", 0) or 0)
+        self.humidifier_min_on = int(gs.get("humidifier_min_on_s", 0) or 0)
+        # Humidifier reservoir: tracker settings dict and the critical-alert thresholds
+        self.humid_settings = _humid_tracker_settings(gs)
+        try:
+            self.humid_crit_kg = float(gs.get("humid_res_critical_water_kg", 0.0) or 0.0)
+            self.humid_margin_kg = float(gs.get("humid_res_full_margin_kg", 0.0) or 0.0)
+        except Exception:
+            self.humid_crit_kg = self.humid_margin_kg = 0.0
+
 def simulate_profile(profile_name: str, profile_data: dict):
     """
     The main control loop thread for a running profile.
@@ -583,8 +723,6 @@ def simulate_profile(profile_name: str, profile_data: dict):
     Reads sensors; enforces climate thresholds; schedules pump/agitator/air-pump
     with hysteresis and windowing; emits structured logs; keeps UI fields updated.
     """
-    import math
-
     global running_profile, status_data, _last_humidity, _last_temp, _last_hum_top, _last_hum_bot, global_settings
 
     # Ensure GPIO mode is valid in this thread prior to any writes
@@ -595,7 +733,8 @@ def simulate_profile(profile_name: str, profile_data: dict):
     pump_off = int(profile_data.get("pump", {}).get("off_duration_sec", 0))
 
     running_profile = profile_name
-    status_data.update(profile=profile_name, cycle_count=0)
+    status_data.profile = profile_name
+    status_data.cycle_count = 0
     
     # Log the current Global Settings and the profile parameters (once per run)
     try:
@@ -607,34 +746,48 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
     profile_path = os.path.join(PROFILE_DIR, profile_name)
 
-    # Globals snapshot & refresh cadence
+    # Globals snapshot (re-applied in the loop whenever the cached settings change)
     gs = dict(global_settings)
-    next_gs_reload = 0.0
+    _gs_applied = None
 
     # Premix config
     ag_enabled = False; ag_run = 0
     air_enabled = False; air_run = 0
 
+    # Climate thresholds + pump window, refreshed only when the profile (re)loads
+    t_min = t_max = h_min = h_max = None
+    win_on = win_off = None
+    window_allowed = _make_window_check(None, None)
+
+    def _publish_totals():
+        """Expose the current phase lengths (whole seconds, None when unset) to the UI."""
+        sd = status_data
+        sd.pump_time_total_s = int(pump_on) if pump_on else None
+        sd.agitator_time_total_s = int(ag_run) if ag_run else None
+        sd.air_pump_time_total_s = int(air_run) if air_run else None
+
     def _apply_profile_cfg(cfg):
         """Refresh thresholds/durations/UI totals from profile JSON on disk."""
         nonlocal pump_on, pump_off, profile_data, ag_enabled, ag_run, air_enabled, air_run
+        nonlocal t_min, t_max, h_min, h_max, win_on, win_off, window_allowed
         profile_data = cfg
         t = cfg.get("temperature", {})
         h = cfg.get("humidity", {})
         w = cfg.get("water", {}).get("temperature", {})
         q = cfg.get("water", {}).get("quantity", {})
-        status_data.update(
-            temperature_min=t.get("min"),
-            temperature_target=t.get("target"),
-            temperature_max=t.get("max"),
-            humidity_min=h.get("min"),
-            humidity_target=h.get("target"),
-            humidity_max=h.get("max"),
-            water_temperature_min=w.get("min"),
-            water_temperature_target=w.get("target"),
-            water_temperature_max=w.get("max"),
-            water_quantity_min=q.get("min"),
-        )
+        t_min, t_max = t.get("min"), t.get("max")
+        h_min, h_max = h.get("min"), h.get("max")
+        sd = status_data
+        sd.temperature_min = t_min
+        sd.temperature_target = t.get("target")
+        sd.temperature_max = t_max
+        sd.humidity_min = h_min
+        sd.humidity_target = h.get("target")
+        sd.humidity_max = h_max
+        sd.water_temperature_min = w.get("min")
+        sd.water_temperature_target = w.get("target")
+        sd.water_temperature_max = w.get("max")
+        sd.water_quantity_min = q.get("min")
         try:
             pump_on  = int(cfg.get("pump", {}).get("on_duration_sec", pump_on))
             pump_off = int(cfg.get("pump", {}).get("off_duration_sec", pump_off))
@@ -651,35 +804,36 @@ def simulate_profile(profile_name: str, profile_data: dict):
             ag_enabled, ag_run = False, 0
             air_enabled, air_run = False, 0
 
-        status_data["pump_time_total_s"]      = int(pump_on) if pump_on else None
-        status_data["agitator_time_total_s"]  = int(ag_run)  if ag_run else None
-        status_data["air_pump_time_total_s"]  = int(air_run) if air_run else None
+        _publish_totals()
 
         # Carry window hours for scheduler
         P = cfg.get("pump", {}) or {}
         profile_data.setdefault("pump", {})
         profile_data["pump"]["_win_on_h"]  = P.get("on_time")
         profile_data["pump"]["_win_off_h"] = P.get("off_time")
+        win_on, win_off = P.get("on_time"), P.get("off_time")
+        window_allowed = _make_window_check(win_on, win_off)
 
     _apply_profile_cfg(profile_data)
 
     try:
-        _last_profile_mtime = os.path.getmtime(profile_path)
+        _last_profile_mtime_ns = os.stat(profile_path).st_mtime_ns
     except Exception:
-        _last_profile_mtime = None
+        _last_profile_mtime_ns = None
     _next_reload_check = 0.0
 
     # Fail-safe: ensure climate outputs and premix are OFF before entering loop
-    _set_fan(False);        status_data["fan_state"] = "OFF"
-    _set_heater(False);     status_data["heater_state"] = "OFF"
-    _set_humidifier(False); status_data["humidifier_state"] = "OFF"
-    _set_agitator(False);   status_data["agitator_state"] = "OFF"
-    _set_air_pump(False);   status_data["air_pump_state"] = "OFF"
+    # (setters are no-ops for outputs that are already off)
+    for _off in (_set_fan, _set_heater, _set_humidifier, _set_agitator, _set_air_pump):
+        _off(False)
+    status_data.fan_state = status_data.heater_state = status_data.humidifier_state = "OFF"
+    status_data.agitator_state = status_data.air_pump_state = "OFF"
 
     logging.info(f"🌱 Starting simulation for profile: {profile_name}")
 
     # Startup: merge in runtime-global premix config (seconds + enables only)
-    gs = load_global_settings()
+    gs = get_cached_global_settings()
+    gsc = _GSCache(gs)
     try:
         ag_enabled = bool(gs.get("agitator_enabled", ag_enabled))
         ag_run     = int(gs.get("agitator_run_sec", ag_run) or 0)
@@ -691,32 +845,13 @@ def simulate_profile(profile_name: str, profile_data: dict):
     except Exception:
         pass
 
-    status_data["pump_time_total_s"]     = int(pump_on) if pump_on else None
-    status_data["agitator_time_total_s"] = int(ag_run)  if ag_run  else None
-    status_data["air_pump_time_total_s"] = int(air_run) if air_run else None
+    _publish_totals()
 
     # ───────────────── STARTUP INITIALISATION ─────────────────
     now = time.time()
     now_m = _mono()
 
-    win_on  = profile_data.get("pump", {}).get("_win_on_h")
-    win_off = profile_data.get("pump", {}).get("_win_off_h")
-
-    def _in_hour_window(start_h, end_h, now_ts=None):
-        """Return True if local current hour is within [start_h, end_h)."""
-        try:
-            if start_h is None or end_h is None: return True
-            start_h = int(start_h); end_h = int(end_h)
-            if start_h == end_h: return False  # disabled
-            now_dt = datetime.datetime.now() if now_ts is None else datetime.datetime.fromtimestamp(now_ts)
-            h = now_dt.hour
-            if start_h < end_h:
-                return start_h <= h < end_h
-            return (h >= start_h) or (h < end_h)  # window wraps midnight
-        except Exception:
-            return True
-
-    def _next_window_open_ts(start_h, end_h, now_dt=None):
+    def _next_window_open_ts(start_h, end_h, now_epoch):
         """Epoch seconds when the next window opens at start_h, else None."""
         if start_h is None or end_h is None: return None
         try:
@@ -724,22 +859,36 @@ def simulate_profile(profile_name: str, profile_data: dict):
         except Exception:
             return None
         if start_h == end_h: return None
-        now_dt = now_dt or datetime.datetime.now()
-        today = now_dt.date()
-        cand = datetime.datetime.combine(today, datetime.time(hour=start_h, minute=0, second=0))
-        if cand <= now_dt:
-            cand = cand + datetime.timedelta(days=1)
-        return cand.timestamp()
-
-    allowed_now = _in_hour_window(win_on, win_off)
+        # Local seconds-since-midnight from struct_time; no datetime objects per tick
+        lt = time.localtime(now_epoch)
+        cand = now_epoch - (lt.tm_hour * 3600 + lt.tm_min * 60 + lt.tm_sec + (now_epoch % 1.0)) + start_h * 3600
+        if cand <= now_epoch:
+            cand += 86400
+        # DST change between now and cand shifts the wall clock by the offset delta
+        shift = lt.tm_gmtoff - time.localtime(cand).tm_gmtoff
+        if shift and time.localtime(cand + shift).tm_hour == start_h:
+            cand += shift  # else start_h is skipped by spring-forward: open at cand
+        return cand
+
+    _win_open_memo = [None, None]  # [(start_h, end_h), next opening ts]
+
+    def _next_window_open_cached(start_h, end_h, now_epoch):
+        """_next_window_open_ts, reused until that opening passes or the hours change."""
+        key, ts = _win_open_memo
+        if ts is None or key != (start_h, end_h) or not (now_epoch < ts <= now_epoch + 90000):
+            ts = _next_window_open_ts(start_h, end_h, now_epoch)
+            _win_open_memo[0] = (start_h, end_h); _win_open_memo[1] = ts
+        return ts
+
+    allowed_now = window_allowed(now)
 
     # ── Detect resume-after-crash via current status_data snapshot (no file IO) ──
     # control_routes.resume_profile() sets status_data before starting this thread.
     # If pump_state was ON and we are not paused, it's a crash-resume case.
     do_crash_premix = (
-        status_data.get("profile") == profile_name and
-        str(status_data.get("pump_state", "OFF")).upper() == "ON" and
-        not bool(status_data.get("paused", False))
+        status_data.profile == profile_name and
+        status_data.pump_state == "ON" and
+        not bool(status_data.paused)
     )
     
     
@@ -772,15 +921,15 @@ def simulate_profile(profile_name: str, profile_data: dict):
         except Exception:
             pass
         # Ensure the main pump is OFF so premix has exclusive control.
-        if force or status_data.get("pump_state") == "ON":
+        if force or status_data.pump_state == "ON":
             try:
                 if pump_configured:
                     _set_main_pump(False)
             except Exception:
                 pass
-            status_data["pump_state"] = "OFF"
-            status_data["pump_phase_end_ts"] = None
-            status_data["pump_time_remaining_s"] = None
+            status_data.pump_state = "OFF"
+            status_data.pump_phase_end_ts = None
+            status_data.pump_time_remaining_s = None
             pump_state = False
             pump_timer = now_mono
         agitator_started_this_cycle = False
@@ -795,37 +944,30 @@ def simulate_profile(profile_name: str, profile_data: dict):
         target_delay = float(longest if longest > 0 else 0.0)
         pump_delay = max(existing_delay, target_delay)
         next_on_due_at = now_wall + pump_delay
-        clamp = pump_delay
+        # Each premix device runs for its configured time, clamped to the pump delay
+        sd = status_data
         if air_enabled and air_run > 0:
             _set_air_pump(True)
-            status_data["air_pump_state"] = "ON"
             air_timer = now_mono
             air_started_this_cycle = True
-            end_by_run = air_timer + air_run
-            end_by_pump = now_mono + clamp
-            status_data["air_pump_phase_end_ts"] = min(end_by_run, end_by_pump)
-            status_data["air_pump_time_remaining_s"] = int(
-                math.ceil(max(0.0, status_data["air_pump_phase_end_ts"] - now_mono))
-            )
+            run_s = min(air_run, pump_delay)
+            sd.air_pump_state = "ON"
+            sd.air_pump_phase_end_ts = now_mono + run_s
+            sd.air_pump_time_remaining_s = int(math.ceil(run_s))
         else:
-            status_data["air_pump_state"] = "OFF"
-            status_data["air_pump_phase_end_ts"] = None
-            status_data["air_pump_time_remaining_s"] = None
+            sd.air_pump_state = "OFF"
+            sd.air_pump_phase_end_ts = sd.air_pump_time_remaining_s = None
         if ag_enabled and ag_run > 0:
             _set_agitator(True)
-            status_data["agitator_state"] = "ON"
             agitator_timer = now_mono
             agitator_started_this_cycle = True
-            end_by_run = agitator_timer + ag_run
-            end_by_pump = now_mono + clamp
-            status_data["agitator_phase_end_ts"] = min(end_by_run, end_by_pump)
-            status_data["agitator_time_remaining_s"] = int(
-                math.ceil(max(0.0, status_data["agitator_phase_end_ts"] - now_mono))
-            )
+            run_s = min(ag_run, pump_delay)
+            sd.agitator_state = "ON"
+            sd.agitator_phase_end_ts = now_mono + run_s
+            sd.agitator_time_remaining_s = int(math.ceil(run_s))
         else:
-            status_data["agitator_state"] = "OFF"
-            status_data["agitator_phase_end_ts"] = None
-            status_data["agitator_time_remaining_s"] = None
+            sd.agitator_state = "OFF"
+            sd.agitator_phase_end_ts = sd.agitator_time_remaining_s = None
         return pump_delay
 
 
@@ -833,7 +975,7 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
     # First due time:
     if not allowed_now:
-        next_on_due_at = _next_window_open_ts(win_on, win_off, now_dt=datetime.datetime.now())
+        next_on_due_at = _next_window_open_cached(win_on, win_off, now)
     else:
         if status_data.pop("startup_kick", False) or do_crash_premix:
             _trigger_startup_premix(now, now_m, force=do_crash_premix)
@@ -843,27 +985,28 @@ def simulate_profile(profile_name: str, profile_data: dict):
     # If allowed and nothing pending, start pump now
     if allowed_now and next_on_due_at is not None and next_on_due_at <= now and not (agitator_started_this_cycle or air_started_this_cycle):
         if pump_on > 0:
-            status_data["pump_state"] = "ON"
+            status_data.pump_state = "ON"
             pump_state = True
             pump_timer = now_m
-            status_data["cycle_count"] += 1
+            status_data.cycle_count += 1
             _set_main_pump(True)
-            status_data["pump_phase_end_ts"] = now_m + pump_on
+            status_data.pump_phase_end_ts = now_m + pump_on
         else:
-            status_data["pump_state"] = "OFF"
+            status_data.pump_state = "OFF"
             pump_state = False
             pump_timer = now_m
-            status_data["pump_phase_end_ts"] = None
+            status_data.pump_phase_end_ts = None
     else:
-        status_data["pump_state"] = "OFF"
-        status_data["pump_phase_end_ts"] = None
-        status_data["pump_time_remaining_s"] = None
+        status_data.pump_state = "OFF"
+        status_data.pump_phase_end_ts = None
+        status_data.pump_time_remaining_s = None
 
     # Pause/resume and logging trackers
-    last_paused = bool(status_data.get("paused", False))
+    last_paused = bool(status_data.paused)
     pump_resume_phase = None
     last_state_save = time.time()
     state_save_interval = 60
+    last_saved_snapshot = None  # resume fields as of the last write
     last_logged_pump_state = None
     last_logged_error = None
 
@@ -881,16 +1024,28 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
 
     # Per-alert state container (only alert once per hard fault)
-    status_data.setdefault("alert_states", {})
+    alert_states = status_data.setdefault("alert_states", {})
+    # How many alert_states entries are active; every active flip goes through _mark_alert
+    active_alert_count = sum(1 for v in alert_states.values() if v.get("active"))
+
+    def _mark_alert(st: dict, active: bool):
+        nonlocal active_alert_count
+        if bool(st.get("active")) != active:
+            active_alert_count += 1 if active else -1
+        st["active"] = active
 
     def _alert_state(name: str):
-        st = status_data["alert_states"].setdefault(name, {
-            "active": False,
-            "first_triggered": None,
-            "last_notified": 0.0,
-            "message": None,
-        })
+        st = alert_states.get(name)
+        if st is None:
+            st = alert_states[name] = {
+                "active": False,
+                "first_triggered": None,
+                "last_notified": 0.0,
+                "message": None,
+            }
         return st
+
+    _alert_state("reservoir_cutoff")  # checked every tick by the cutoff block
         
     def _log_alert(kind: str, phase: str, msg: str, payload: dict | None = None):
         """
@@ -901,14 +1056,14 @@ def simulate_profile(profile_name: str, profile_data: dict):
         payload: extra measurements/thresholds for audit
         """
         try:
-            LOGGER.log_event(
-                event_type="alert",
-                reason_code=f"{kind}:{phase}",
-                msg=msg,
-                profile_id=profile_name,
-                actor="safety",
-                payload=payload or {}
-            )
+            LOGGER.emit({
+                "event_type": "alert",
+                "reason_code": f"{kind}:{phase}",
+                "msg": msg,
+                "profile_id": profile_name,
+                "actor": "safety",
+                "payload": payload,
+            })
         except Exception:
             pass
 
@@ -930,16 +1085,16 @@ def simulate_profile(profile_name: str, profile_data: dict):
         - While breached: optionally send periodic reminders (no extra logs to avoid noise)
         - On recovery: clear active + last_error and notify, LOG 'recover'
         """
-        now_ts = time.time()
+        now_ts = now  # the loop's cached wall clock for this tick
         st = _alert_state(name)
 
         # Enter breach
         if breach_now and not st["active"]:
-            st["active"] = True
+            _mark_alert(st, True)
             st["first_triggered"] = now_ts
             st["last_notified"] = 0.0  # force immediate notify
             st["message"] = msg
-            status_data["last_error"] = msg  # drives the banner/sound
+            status_data.last_error = msg  # drives the banner/sound
 
             # --- NEW: write breach log row
             _log_alert(name, "breach", msg, payload)
@@ -952,7 +1107,7 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
         # Still in breach: throttle reminders (NO log row here)
         if breach_now and st["active"]:
-            if (now_ts - (st["last_notified"] or 0)) >= float(cooldown_s or 0):
+            if (now_ts - st["last_notified"]) >= cooldown_s:
                 st["last_notified"] = now_ts
                 try:
                     send_discord(f"⚠️ Still breached: {msg}")
@@ -962,16 +1117,15 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
         # Recovery edge
         if recovered_now and st["active"]:
-            st["active"] = False
+            _mark_alert(st, False)
             st["message"] = None
 
             # --- NEW: write recovery log row
             _log_alert(name, "recover", f"Recovered: {msg}", payload)
 
             # Only clear last_error if no *other* hard alerts are active
-            any_active = any(v.get("active") for k, v in status_data["alert_states"].items())
-            if not any_active:
-                status_data["last_error"] = None
+            if active_alert_count == 0:
+                status_data.last_error = None
             try:
                 send_discord("✅ Recovery: back within hard limit + hysteresis")
             except Exception:
@@ -995,12 +1149,12 @@ def simulate_profile(profile_name: str, profile_data: dict):
         Does NOT drive hard-stop behaviour or last_error; just tracks state + notifies.
         Returns True if currently active.
         """
-        now_ts = time.time()
+        now_ts = now  # the loop's cached wall clock for this tick
         st = _alert_state(name)
 
         if breach_now and not st["active"]:
+            _mark_alert(st, True)
             st.update({
-                "active": True,
                 "first_triggered": now_ts,
                 "last_notified": 0.0,
                 "message": msg,
@@ -1013,7 +1167,7 @@ def simulate_profile(profile_name: str, profile_data: dict):
             return True
 
         if breach_now and st["active"]:
-            if (now_ts - (st.get("last_notified") or 0.0)) >= float(cooldown_s or 0):
+            if (now_ts - st["last_notified"]) >= cooldown_s:
                 st["last_notified"] = now_ts
                 try:
                     send_discord(f"⚠️ Still breached: {msg}")
@@ -1022,7 +1176,8 @@ def simulate_profile(profile_name: str, profile_data: dict):
             return True
 
         if recovered_now and st["active"]:
-            st.update({"active": False, "message": None})
+            _mark_alert(st, False)
+            st["message"] = None
             _log_alert(name, "recover", f"Recovered: {msg}", payload)
             try:
                 send_discord(f"✅ Recovered: {msg}")
@@ -1033,16 +1188,12 @@ def simulate_profile(profile_name: str, profile_data: dict):
         return st.get("active", False)
 
 
-    def _update_humid_alerts(water_kg: float | None, gs_local: dict, cooldown_s: int = 300) -> dict:
+    def _update_humid_alerts(water_kg: float | None, cooldown_s: int = 300) -> dict:
         """
         Single critical alert/log/discord when humidifier reservoir is critical.
-        Returns {"critical": bool}.
+        Thresholds come from the current _GSCache. Returns {"critical": bool}.
         """
-        try:
-            crit = float(gs_local.get("humid_res_critical_water_kg", 0.0) or 0.0)
-            hyst = float(gs_local.get("humid_res_full_margin_kg", 0.0) or 0.0)
-        except Exception:
-            crit = 0.0; hyst = 0.0
+        crit, hyst = gsc.humid_crit_kg, gsc.humid_margin_kg
 
         water_val = None if water_kg is None else float(water_kg)
         crit_breach = bool(crit > 0 and water_val is not None and water_val <= crit)
@@ -1064,11 +1215,11 @@ def simulate_profile(profile_name: str, profile_data: dict):
         )
 
         if crit_active:
-            status_data["last_error"] = "Humidifier module offline until reservoir is renewed"
-        elif status_data.get("last_error") == "Humidifier module offline until reservoir is renewed":
-            status_data["last_error"] = None
+            status_data.last_error = "Humidifier module offline until reservoir is renewed"
+        elif status_data.last_error == "Humidifier module offline until reservoir is renewed":
+            status_data.last_error = None
 
-        status_data["humid_reservoir_critical"] = bool(crit_active)
+        status_data.humid_reservoir_critical = bool(crit_active)
         return {"critical": bool(crit_active)}
 
 
@@ -1076,74 +1227,76 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
 
 
+
+    def _rem_from(end_ts, now_mono):
+        # *_phase_end_ts is only ever None or a monotonic float (see StatusData)
+        if end_ts is not None:
+            r = end_ts - now_mono
+            return r if r > 0 else 0.0
+        return 0.0
+
     # ───────────────────────────── main loop ───────────────────────────────
+    # Clocks are read once per tick (and once more after the blocking sensor
+    # reads); everything below uses the cached now/now_m.
     while (running_profile == profile_name) and (not STOP_EVENT.is_set()):
         now = time.time()
         now_m = _mono()
 
         # ─── Pause/Resume edges ───
-        paused_now = bool(status_data.get("paused", False))
+        # One snapshot of the paused/ON states for the bookkeeping below
+        sd = status_data
+        flags = sd.ctrl_flags
+        paused_now = bool(flags & CTRL_PAUSED)
         if paused_now and not last_paused:
-            phase_from_status = status_data.get("pump_resume_phase")
-            pump_resume_phase = phase_from_status if phase_from_status in ("ON", "OFF") else ("ON" if (status_data.get("pump_state") == "ON") else "OFF")
+            phase_from_status = sd.pump_resume_phase
+            pump_resume_phase = phase_from_status if phase_from_status in ("ON", "OFF") else ("ON" if flags & CTRL_PUMP_ON else "OFF")
 
         # Capture remaining times + phases for premix on pause
-        def _rem_from(end_ts, now_mono):
-            try:
-                if isinstance(end_ts, (int, float)) and end_ts > 0:
-                    r = float(end_ts) - float(now_mono)
-                    return r if r > 0 else 0.0
-            except Exception:
-                pass
-            return 0.0
-
         # Agitator
-        status_data["agitator_resume_phase"] = "ON" if status_data.get("agitator_state") == "ON" else "OFF"
-        status_data["agitator_resume_remaining_s"] = int(_rem_from(status_data.get("agitator_phase_end_ts"), _mono()))
+        sd.agitator_resume_phase = "ON" if flags & CTRL_AGITATOR_ON else "OFF"
+        sd.agitator_resume_remaining_s = int(_rem_from(sd.agitator_phase_end_ts, now_m))
 
         # Air pump
-        status_data["air_pump_resume_phase"] = "ON" if status_data.get("air_pump_state") == "ON" else "OFF"
-        status_data["air_pump_resume_remaining_s"] = int(_rem_from(status_data.get("air_pump_phase_end_ts"), _mono()))
+        sd.air_pump_resume_phase = "ON" if flags & CTRL_AIR_PUMP_ON else "OFF"
+        sd.air_pump_resume_remaining_s = int(_rem_from(sd.air_pump_phase_end_ts, now_m))
 
         # Pump remaining (useful if not already set by routes/UI)
-        if status_data.get("pump_state") == "ON":
-            status_data["pump_resume_remaining_s"] = int(_rem_from(status_data.get("pump_phase_end_ts"), _mono()))
+        if flags & CTRL_PUMP_ON:
+            status_data.pump_resume_remaining_s = int(_rem_from(status_data.pump_phase_end_ts, now_m))
         else:
-            status_data["pump_resume_remaining_s"] = None
+            status_data.pump_resume_remaining_s = None
 
 
         if (not paused_now) and last_paused:
             # Resume path...
             if pump_resume_phase not in ("ON", "OFF"):
-                pump_resume_phase = status_data.get("pump_resume_phase")
+                pump_resume_phase = status_data.pump_resume_phase
 
             if pump_resume_phase == "ON":
-                remaining = status_data.get("pump_resume_remaining_s")
+                remaining = status_data.pump_resume_remaining_s
                 try: _ensure_gpio_mode()
                 except Exception: pass
                 if isinstance(remaining, (int, float)) and remaining > 0:
                     elapsed = max(0.0, float(pump_on) - float(remaining))
-                    status_data["pump_phase_end_ts"] = (now_m - elapsed) + float(pump_on)
-                    status_data["pump_time_remaining_s"] = int(math.ceil(float(remaining)))
+                    status_data.pump_phase_end_ts = (now_m - elapsed) + float(pump_on)
+                    status_data.pump_time_remaining_s = int(math.ceil(float(remaining)))
                 else:
-                    status_data["pump_phase_end_ts"] = now_m + float(pump_on)
-                    status_data["pump_time_remaining_s"] = int(math.ceil(float(pump_on))) if pump_on else None
+                    status_data.pump_phase_end_ts = now_m + float(pump_on)
+                    status_data.pump_time_remaining_s = int(math.ceil(float(pump_on))) if pump_on else None
                 _set_main_pump(True)
-                status_data["pump_state"] = "ON"
+                status_data.pump_state = "ON"
                 next_on_due_at = None
             else:
                 def _rem(v):
-                    try:
-                        v = float(v)
-                        return v if v > 0 else 0.0
-                    except Exception:
-                        return 0.0
+                    if isinstance(v, (int, float)) and v > 0:
+                        return float(v)
+                    return 0.0
 
-                remain_air = _rem(status_data.get("air_pump_resume_remaining_s"))
-                remain_ag  = _rem(status_data.get("agitator_resume_remaining_s"))
+                remain_air = _rem(status_data.air_pump_resume_remaining_s)
+                remain_ag  = _rem(status_data.agitator_resume_remaining_s)
 
-                resume_air_phase = str(status_data.get("air_pump_resume_phase") or "").upper()
-                resume_ag_phase  = str(status_data.get("agitator_resume_phase") or "").upper()
+                resume_air_phase = status_data.air_pump_resume_phase  # "ON"/"OFF" from pause_profile
+                resume_ag_phase  = status_data.agitator_resume_phase
 
                 longest = 0.0
 
@@ -1151,29 +1304,29 @@ def simulate_profile(profile_name: str, profile_data: dict):
                 if air_enabled and ((resume_air_phase == "ON") or (remain_air > 0)):
                     run_sec = remain_air if remain_air > 0 else float(air_run or 0)
                     if run_sec > 0:
-                        _set_air_pump(True); status_data["air_pump_state"] = "ON"
+                        _set_air_pump(True); status_data.air_pump_state = "ON"
                         air_timer = now_m; air_started_this_cycle = True
-                        status_data["air_pump_phase_end_ts"] = now_m + run_sec
-                        status_data["air_pump_time_remaining_s"] = int(math.ceil(run_sec))
+                        status_data.air_pump_phase_end_ts = now_m + run_sec
+                        status_data.air_pump_time_remaining_s = int(math.ceil(run_sec))
                         longest = max(longest, run_sec)
                 else:
-                    status_data["air_pump_state"] = "OFF"
-                    status_data["air_pump_phase_end_ts"] = None
-                    status_data["air_pump_time_remaining_s"] = None
+                    status_data.air_pump_state = "OFF"
+                    status_data.air_pump_phase_end_ts = None
+                    status_data.air_pump_time_remaining_s = None
 
                 # AGITATOR: resume only if it was ON at pause OR there is actual remainder
                 if ag_enabled and ((resume_ag_phase == "ON") or (remain_ag > 0)):
                     run_sec = remain_ag if remain_ag > 0 else float(ag_run or 0)
                     if run_sec > 0:
-                        _set_agitator(True); status_data["agitator_state"] = "ON"
+                        _set_agitator(True); status_data.agitator_state = "ON"
                         agitator_timer = now_m; agitator_started_this_cycle = True
-                        status_data["agitator_phase_end_ts"] = now_m + run_sec
-                        status_data["agitator_time_remaining_s"] = int(math.ceil(run_sec))
+                        status_data.agitator_phase_end_ts = now_m + run_sec
+                        status_data.agitator_time_remaining_s = int(math.ceil(run_sec))
                         longest = max(longest, run_sec)
                 else:
-                    status_data["agitator_state"] = "OFF"
-                    status_data["agitator_phase_end_ts"] = None
-                    status_data["agitator_time_remaining_s"] = None
+                    status_data.agitator_state = "OFF"
+                    status_data.agitator_phase_end_ts = None
+                    status_data.agitator_time_remaining_s = None
 
                 next_on_due_at = now + longest if longest > 0 else (now if (pump_off or 0) <= 0 else _schedule_next_on(now))
 
@@ -1183,29 +1336,24 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
             # Clear one-shot resume hints
             pump_resume_phase = None
-            status_data["pump_resume_remaining_s"] = None
-            status_data["pump_resume_phase"] = None
-            status_data["agitator_resume_remaining_s"] = None
-            status_data["agitator_resume_phase"] = None
-            status_data["air_pump_resume_remaining_s"] = None
-            status_data["air_pump_resume_phase"] = None
+            status_data.pump_resume_remaining_s = None
+            status_data.pump_resume_phase = None
+            status_data.agitator_resume_remaining_s = None
+            status_data.agitator_resume_phase = None
+            status_data.air_pump_resume_remaining_s = None
+            status_data.air_pump_resume_phase = None
 
         last_paused = paused_now
 
         if paused_now:
-            # --- SAFETY: ensure all actuators are OFF exactly as you already do ---
+            # --- SAFETY: ensure all actuators are OFF (one bulk write; no-op once off) ---
             try:
-                _set_main_pump(False)
-                _set_agitator(False)
-                _set_air_pump(False)
-                _set_fan(False)
-                _set_heater(False)
-                _set_humidifier(False)
+                _all_outputs_off()
             except Exception:
                 pass
 
             # Make sure status reflects paused (keeps your UI badges consistent)
-            status_data["paused"] = True
+            status_data.paused = True
 
             # --- keep reservoir/scale live while paused ---
             # We publish a fresh reservoir snapshot so /status.json and /api/reservoirs/live
@@ -1219,64 +1367,60 @@ def simulate_profile(profile_name: str, profile_data: dict):
                     res_gross,
                     gs,                       # your current global settings object in scope
                     pump_on=False,            # paused => no pump activity
-                    now_wall_s=time.time(),   # use wall clock for user-facing timestamps
+                    now_wall_s=now,           # use wall clock for user-facing timestamps
                 )
 
                 if info.get("gross_kg") is not None:
                     # Maintain the exact keys your UI already reads
-                    status_data["reservoir_gross_kg"]  = info["gross_kg"]
-                    status_data["reservoir_weight_kg"] = info["gross_kg"]  # you mirror gross here
-                    status_data["reservoir_water_raw"] = info.get("water_raw")
-                    status_data["reservoir_water_kg"]  = info.get("water_kg")
-                    status_data["reservoir_status"]    = info.get("status_label")
-                    status_data["reservoir_debug"]     = info.get("debug")
+                    status_data.reservoir_gross_kg  = info["gross_kg"]
+                    status_data.reservoir_weight_kg = info["gross_kg"]  # you mirror gross here
+                    status_data.reservoir_water_raw = info.get("water_raw")
+                    status_data.reservoir_water_kg  = info.get("water_kg")
+                    status_data.reservoir_status    = info.get("status_label")
+                    status_data.reservoir_debug     = info.get("debug")
                 else:
                     # Explicitly publish Nones if we can't compute a reading
-                    status_data.update(
-                        reservoir_gross_kg=None,
-                        reservoir_weight_kg=None,
-                        reservoir_water_raw=None,
-                        reservoir_water_kg=None,
-                        reservoir_status=None,
-                        reservoir_debug=None,
-                    )
+                    status_data.reservoir_gross_kg = None
+                    status_data.reservoir_weight_kg = None
+                    status_data.reservoir_water_raw = None
+                    status_data.reservoir_water_kg = None
+                    status_data.reservoir_status = None
+                    status_data.reservoir_debug = None
 
                 try:
                     humid_gross = SCALE_SAMPLER.value_humid()
                     hinfo = humid_tracker.update(
                         humid_gross,
-                        _humid_tracker_settings(gs),
+                        gsc.humid_settings,
                         pump_on=False,
-                        now_wall_s=time.time(),
+                        now_wall_s=now,
                     )
-                    status_data["humid_res_gross_kg"] = hinfo.get("gross_kg")
-                    status_data["humid_res_water_raw"] = hinfo.get("water_raw")
-                    status_data["humid_res_water_kg"] = hinfo.get("water_kg")
-                    status_data["humid_reservoir_water_kg"] = hinfo.get("water_kg")
-                    status_data["humid_res_status"] = hinfo.get("status_label")
-                    status_data["humid_res_debug"] = hinfo.get("debug")
+                    status_data.humid_res_gross_kg = hinfo.get("gross_kg")
+                    status_data.humid_res_water_raw = hinfo.get("water_raw")
+                    status_data.humid_res_water_kg = hinfo.get("water_kg")
+                    status_data.humid_reservoir_water_kg = hinfo.get("water_kg")
+                    status_data.humid_res_status = hinfo.get("status_label")
+                    status_data.humid_res_debug = hinfo.get("debug")
                     try:
                         _update_humid_alerts(
                             hinfo.get("water_kg"),
-                            gs,
-                            int(gs.get("hard_alert_cooldown_s") or 300),
+                            gsc.remind_cooldown,
                         )
                     except Exception:
                         pass
                 except Exception:
-                    status_data.update(
-                        humid_res_gross_kg=None,
-                        humid_res_water_raw=None,
-                        humid_res_water_kg=None,
-                        humid_reservoir_water_kg=None,
-                        humid_res_status=None,
-                        humid_res_debug=None,
-                    )
+                    status_data.humid_res_gross_kg = None
+                    status_data.humid_res_water_raw = None
+                    status_data.humid_res_water_kg = None
+                    status_data.humid_reservoir_water_kg = None
+                    status_data.humid_res_status = None
+                    status_data.humid_res_debug = None
             except Exception:
                 # Never let a UI refresh failure break the pause safety path
                 logging.exception("Paused-state reservoir refresh failed")
 
             # Preserve your existing short sleep + loop continue while paused
+            _refresh_status_json()
             if STOP_EVENT.wait(0.25):
                 return
             continue
@@ -1284,13 +1428,14 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
 
 
-        # ─── Periodic global settings refresh ───
-        if now >= next_gs_reload:
-            gs = load_global_settings()
-            status_data["water_temperature_min"]    = gs.get("water_temp_min_c")
-            status_data["water_temperature_target"] = gs.get("water_temp_target_c")
-            status_data["water_temperature_max"]    = gs.get("water_temp_max_c")
-            next_gs_reload = now + 5.0
+        # ─── Global settings refresh (cached; reparsed only when the file changes) ───
+        _gs_now = get_cached_global_settings()
+        if _gs_now is not _gs_applied:
+            gs = _gs_applied = _gs_now
+            gsc = _GSCache(gs)
+            status_data.water_temperature_min    = gs.get("water_temp_min_c")
+            status_data.water_temperature_target = gs.get("water_temp_target_c")
+            status_data.water_temperature_max    = gs.get("water_temp_max_c")
             try:
                 ag_enabled = bool(gs.get("agitator_enabled", ag_enabled))
                 ag_run     = int(gs.get("agitator_run_sec", ag_run) or 0)
@@ -1301,25 +1446,26 @@ def simulate_profile(profile_name: str, profile_data: dict):
                 air_run     = int(gs.get("air_pump_run_sec", air_run) or 0)
             except Exception:
                 pass
-            status_data["agitator_time_total_s"] = int(ag_run)  if ag_run  else None
-            status_data["air_pump_time_total_s"] = int(air_run) if air_run else None
+            _publish_totals()
 
         # ─── Hot-reload the profile JSON ───
-        if now >= _next_reload_check:
-            _next_reload_check = now + 3.0
+        # UI edits signal PROFILE_RELOAD_EVENT; the stat is only a slow fallback
+        reload_requested = PROFILE_RELOAD_EVENT.is_set()
+        if reload_requested or now >= _next_reload_check:
+            PROFILE_RELOAD_EVENT.clear()
+            _next_reload_check = now + PROFILE_MTIME_CHECK_S
             try:
-                mtime = os.path.getmtime(profile_path)
-                if _last_profile_mtime is None or mtime > _last_profile_mtime:
-                    with open(profile_path) as f:
-                        new_cfg = json.load(f)
+                # An explicit request skips the stat: one open+fstat+read instead
+                if reload_requested or os.stat(profile_path).st_mtime_ns != _last_profile_mtime_ns:
+                    new_cfg, mtime_ns = _load_json_file(profile_path, with_mtime=True)
                     _apply_profile_cfg(new_cfg)
-                    _last_profile_mtime = mtime
+                    _last_profile_mtime_ns = mtime_ns
                     logging.info("♻️  Hot-reloaded profile config from disk.")
             except Exception as e:
                 logging.warning(f"Hot-reload failed: {e}")
 
-        # ─── Sensors ───
-        hum = read_humidity_top_bottom()
+        # ─── Sensors (latest from AMBIENT_SAMPLER; never blocks the tick) ───
+        air, hum, water_c = AMBIENT_SAMPLER.readings()
         if hum["top"] is not None: _last_hum_top = hum["top"]
         if hum["bottom"] is not None: _last_hum_bot = hum["bottom"]
         if _last_hum_top is not None and _last_hum_bot is not None:
@@ -1328,256 +1474,161 @@ def simulate_profile(profile_name: str, profile_data: dict):
             _last_humidity = _last_hum_top
         elif _last_hum_bot is not None:
             _last_humidity = _last_hum_bot
-        status_data.update(humidity=_last_humidity, humidity_top=_last_hum_top, humidity_bottom=_last_hum_bot)
+        status_data.humidity = _last_humidity
+        status_data.humidity_top = _last_hum_top
+        status_data.humidity_bottom = _last_hum_bot
 
-        air = read_air_temps_top_bottom()
         if air["avg"] is not None: _last_temp = air["avg"]
-        status_data.update(
-            temperature_c=_last_temp,
-            temperature_top=air["top"],
-            temperature_bottom=air["bottom"],
-            temperature_avg=air["avg"],
-            temperature_gradient=air["gradient"],
-        )
-        try:
-            water_c = read_water_temp()
-        except Exception:
-            water_c = None
-        status_data["water_temperature"] = water_c
+        status_data.temperature_c = _last_temp
+        status_data.temperature_top = air["top"]
+        status_data.temperature_bottom = air["bottom"]
+        status_data.temperature_avg = air["avg"]
+        status_data.temperature_gradient = air["gradient"]
+        status_data.water_temperature = water_c
 
         # HX711 reservoir (thread-averaged)
         res_gross = SCALE_SAMPLER.value()
         info = tracker.update(
             res_gross,
             gs,
-            pump_on=(status_data.get("pump_state") == "ON"),
+            pump_on=(status_data.pump_state == "ON"),
             now_wall_s=now
         )
 
         if info["gross_kg"] is not None:
-            status_data["reservoir_gross_kg"]  = info["gross_kg"]
-            status_data["reservoir_weight_kg"] = info["gross_kg"]
-            status_data["reservoir_water_raw"] = info["water_raw"]
-            status_data["reservoir_water_kg"]  = info["water_kg"]
-            status_data["reservoir_status"]    = info["status_label"]
-            status_data["reservoir_debug"]     = info["debug"]
+            status_data.reservoir_gross_kg  = info["gross_kg"]
+            status_data.reservoir_weight_kg = info["gross_kg"]
+            status_data.reservoir_water_raw = info["water_raw"]
+            status_data.reservoir_water_kg  = info["water_kg"]
+            status_data.reservoir_status    = info["status_label"]
+            status_data.reservoir_debug     = info["debug"]
 
             below_cutoff_now   = info["below_cutoff_now"]
             below_cutoff_value = info["below_cutoff_value"]
             
             # Proactively de-stale the reservoir_cutoff alert if readings are OK
             try:
-                status_data.setdefault("alert_states", {})
-                rc = status_data["alert_states"].setdefault("reservoir_cutoff", {})
                 if not info.get("below_cutoff_now", False):
-                    rc["active"] = False
+                    rc = _alert_state("reservoir_cutoff")
+                    _mark_alert(rc, False)
                     rc["message"] = None
             except Exception:
                 pass
     
             
         else:
-            status_data.update(
-                reservoir_gross_kg=None,
-                reservoir_weight_kg=None,
-                reservoir_water_raw=None,
-                reservoir_water_kg=None,
-                reservoir_status=None,
-                reservoir_debug=None
-            )
+            status_data.reservoir_gross_kg = None
+            status_data.reservoir_weight_kg = None
+            status_data.reservoir_water_raw = None
+            status_data.reservoir_water_kg = None
+            status_data.reservoir_status = None
+            status_data.reservoir_debug = None
             below_cutoff_now = False
 
         try:
             humid_gross = SCALE_SAMPLER.value_humid()
             hinfo = humid_tracker.update(
                 humid_gross,
-                _humid_tracker_settings(gs),
+                gsc.humid_settings,
                 pump_on=False,
                 now_wall_s=now,
             )
-            status_data["humid_res_gross_kg"] = hinfo.get("gross_kg")
-            status_data["humid_res_water_raw"] = hinfo.get("water_raw")
-            status_data["humid_res_water_kg"] = hinfo.get("water_kg")
-            status_data["humid_reservoir_water_kg"] = hinfo.get("water_kg")
-            status_data["humid_res_status"] = hinfo.get("status_label")
-            status_data["humid_res_debug"] = hinfo.get("debug")
+            status_data.humid_res_gross_kg = hinfo.get("gross_kg")
+            status_data.humid_res_water_raw = hinfo.get("water_raw")
+            status_data.humid_res_water_kg = hinfo.get("water_kg")
+            status_data.humid_reservoir_water_kg = hinfo.get("water_kg")
+            status_data.humid_res_status = hinfo.get("status_label")
+            status_data.humid_res_debug = hinfo.get("debug")
             try:
                 _update_humid_alerts(
                     hinfo.get("water_kg"),
-                    gs,
-                    int(gs.get("hard_alert_cooldown_s") or 300),
+                    gsc.remind_cooldown,
                 )
             except Exception:
                 pass
         except Exception:
-            status_data.update(
-                humid_res_gross_kg=None,
-                humid_res_water_raw=None,
-                humid_res_water_kg=None,
-                humid_reservoir_water_kg=None,
-                humid_res_status=None,
-                humid_res_debug=None,
-            )
+            status_data.humid_res_gross_kg = None
+            status_data.humid_res_water_raw = None
+            status_data.humid_res_water_kg = None
+            status_data.humid_reservoir_water_kg = None
+            status_data.humid_res_status = None
+            status_data.humid_res_debug = None
 
         # ─── Hard safety limits (edge-based with hysteresis + cooldown) ───
         # Hysteresis values (fallback to your general hysteresis if dedicated one not set)
-        TEMP_HYST = float((gs.get("absolute_temp_hyst_c")
-                           if gs.get("absolute_temp_hyst_c") is not None
-                           else gs.get("hysteresis_temp_c", 0.5)) or 0.0)
-        HUM_HYST  = float((gs.get("absolute_humidity_hyst_pct")
-                           if gs.get("absolute_humidity_hyst_pct") is not None
-                           else gs.get("hysteresis_humidity_pct", 1.5)) or 0.0)
-        WTMP_HYST = float((gs.get("absolute_water_temp_hyst_c")
-                           if gs.get("absolute_water_temp_hyst_c") is not None
-                           else gs.get("hysteresis_temp_c", 0.5)) or 0.0)
-        REMIND_COOLDOWN_S = int(gs.get("hard_alert_cooldown_s") or 300)  # 5 min default
-
-        abs_tmin = gs.get("absolute_temp_min_c")
-        abs_tmax = gs.get("absolute_temp_max_c")
-        abs_hmin = gs.get("absolute_humidity_min_pct")
-        abs_hmax = gs.get("absolute_humidity_max_pct")
-        abs_wmin = gs.get("water_temp_min_c")
-        abs_wmax = gs.get("water_temp_max_c")
-
-        # Current readings
-        air_t   = _last_temp
-        hum_av  = _last_humidity
-        water_c = status_data.get("water_temperature")
-
-        # Breach/recovery booleans (use hysteresis for clear)
-        t_low_breach = (air_t is not None and abs_tmin is not None and air_t < abs_tmin)
-        t_low_recover = (air_t is not None and abs_tmin is not None and air_t >= (abs_tmin + TEMP_HYST))
-
-        t_high_breach = (air_t is not None and abs_tmax is not None and air_t > abs_tmax)
-        t_high_recover = (air_t is not None and abs_tmax is not None and air_t <= (abs_tmax - TEMP_HYST))
-
-        h_low_breach = (hum_av is not None and abs_hmin is not None and hum_av < abs_hmin)
-        h_low_recover = (hum_av is not None and abs_hmin is not None and hum_av >= (abs_hmin + HUM_HYST))
-
-        h_high_breach = (hum_av is not None and abs_hmax is not None and hum_av > abs_hmax)
-        h_high_recover = (hum_av is not None and abs_hmax is not None and hum_av <= (abs_hmax - HUM_HYST))
-
-        w_low_breach = (water_c is not None and abs_wmin is not None and water_c < abs_wmin)
-        w_low_recover = (water_c is not None and abs_wmin is not None and water_c >= (abs_wmin + WTMP_HYST))
-
-        w_high_breach = (water_c is not None and abs_wmax is not None and water_c > abs_wmax)
-        w_high_recover = (water_c is not None and abs_wmax is not None and water_c <= (abs_wmax - WTMP_HYST))
+        # and the configured limits are resolved once per settings change in _GSCache
+        REMIND_COOLDOWN_S = gsc.remind_cooldown
+
+        # Current readings (indexed by _HARD_LIMITS)
+        readings = (_last_temp, _last_humidity, status_data.water_temperature)
 
         # Reservoir cutoff breach (already debounced in your tracker output)
         below_cutoff_now   = bool(below_cutoff_now)
         cutoff_recover     = not below_cutoff_now
 
         # Evaluate each hard alert; ALWAYS call _edge_alert so recovery is seen
+        # (_edge_alert is a no-op unless breached or the alert is active, so the
+        #  message/payload are only built in those cases)
         hard_stop = False
-        cutoff_msg = (
-            f"Reservoir {float(below_cutoff_value or 0.0):.2f} kg ≤ cutoff "
-            f"{float(gs.get('reservoir_pump_cutoff_water_kg', 0) or 0.0):.2f} kg"
-        )
-        hard_stop |= _edge_alert(
-            "reservoir_cutoff",
-            below_cutoff_now,       # breach_now
-            cutoff_recover,         # recovered_now
-            cutoff_msg,
-            REMIND_COOLDOWN_S,
-            payload={
-                "gross_kg": info.get("gross_kg"),
-                "water_kg": info.get("water_kg"),
-                "cutoff_kg": float(gs.get("reservoir_pump_cutoff_water_kg", 0) or 0.0),
-            },
-        )
-
-
-
-        if abs_tmin is not None:
-            hard_stop |= _edge_alert(
-            "temp_hard_low",
-            t_low_breach,
-            t_low_recover,
-            f"Temperature {air_t:.1f}°C below hard minimum {abs_tmin}°C",
-            REMIND_COOLDOWN_S,
-            payload={"air_t": air_t, "min_c": abs_tmin, "hyst_c": TEMP_HYST},
-        )
-
-        if abs_tmax is not None:
+        if below_cutoff_now or _alert_state("reservoir_cutoff")["active"]:
+            cutoff_msg = (
+                f"Reservoir {float(below_cutoff_value or 0.0):.2f} kg ≤ cutoff "
+                f"{gsc.cutoff_kg:.2f} kg"
+            )
             hard_stop |= _edge_alert(
-            "temp_hard_high",
-            t_high_breach,
-            t_high_recover,
-            f"Temperature {air_t:.1f}°C above hard maximum {abs_tmax}°C",
-            REMIND_COOLDOWN_S,
-            payload={"air_t": air_t, "max_c": abs_tmax, "hyst_c": TEMP_HYST},
-        )
+                "reservoir_cutoff",
+                below_cutoff_now,       # breach_now
+                cutoff_recover,         # recovered_now
+                cutoff_msg,
+                REMIND_COOLDOWN_S,
+                payload={
+                    "gross_kg": info.get("gross_kg"),
+                    "water_kg": info.get("water_kg"),
+                    "cutoff_kg": gsc.cutoff_kg,
+                },
+            )
 
-        if abs_hmin is not None:
-            hard_stop |= _edge_alert(
-            "hum_hard_low",
-            h_low_breach,
-            h_low_recover,
-            f"Humidity {hum_av:.1f}% below hard minimum {abs_hmin}%",
-            REMIND_COOLDOWN_S,
-            payload={"humidity": hum_av, "min_pct": abs_hmin, "hyst_pct": HUM_HYST},
-        )
 
-        if abs_hmax is not None:
-            hard_stop |= _edge_alert(
-            "hum_hard_high",
-            h_high_breach,
-            h_high_recover,
-            f"Humidity {hum_av:.1f}% above hard maximum {abs_hmax}%",
-            REMIND_COOLDOWN_S,
-            payload={"humidity": hum_av, "max_pct": abs_hmax, "hyst_pct": HUM_HYST},
-        )
 
-        if abs_wmin is not None:
-            hard_stop |= _edge_alert(
-            "water_temp_low",
-            w_low_breach,
-            w_low_recover,
-            f"Water temperature {water_c:.1f}°C below hard minimum {abs_wmin}°C",
-            REMIND_COOLDOWN_S,
-            payload={"water_c": water_c, "min_c": abs_wmin, "hyst_c": WTMP_HYST},
-        )
-
-        if abs_wmax is not None:
-            hard_stop |= _edge_alert(
-            "water_temp_high",
-            w_high_breach,
-            w_high_recover,
-            f"Water temperature {water_c:.1f}°C above hard maximum {abs_wmax}°C",
-            REMIND_COOLDOWN_S,
-            payload={"water_c": water_c, "max_c": abs_wmax, "hyst_c": WTMP_HYST},
-        )
+        # Hard limits: breach past the limit, recover once back inside by the hysteresis.
+        # A missing reading can neither breach nor recover, so it is skipped.
+        for name, idx, limit, hyst, is_min, label, unit, (vk, lk, hk) in gsc.hard_limits:
+            v = readings[idx]
+            if v is None:
+                continue
+            breach = v < limit if is_min else v > limit
+            if not breach and not _alert_state(name)["active"]:
+                continue
+            if is_min:
+                recover = v >= limit + hyst
+                msg = f"{label} {v:.1f}{unit} below hard minimum {limit}{unit}"
+            else:
+                recover = v <= limit - hyst
+                msg = f"{label} {v:.1f}{unit} above hard maximum {limit}{unit}"
+            hard_stop |= _edge_alert(name, breach, recover, msg, REMIND_COOLDOWN_S,
+                                     payload={vk: v, lk: limit, hk: hyst})
 
 
         if hard_stop:
             # Apply your existing 'all outputs OFF' behaviour while any hard fault is active.
-            status_data["last_error"] = status_data.get("last_error")  # unchanged; set by _edge_alert
-            _set_fan(False);        status_data["fan_state"] = "OFF"
-            _set_heater(False);     status_data["heater_state"] = "OFF"
-            _set_humidifier(False); status_data["humidifier_state"] = "OFF"
-            if status_data.get("agitator_state") == "ON":
-                _set_agitator(False); status_data["agitator_state"] = "OFF"
-            if status_data.get("air_pump_state") == "ON":
-                _set_air_pump(False); status_data["air_pump_state"] = "OFF"
-            status_data["agitator_phase_end_ts"] = None
-            status_data["agitator_time_remaining_s"] = None
-            status_data["air_pump_phase_end_ts"] = None
-            status_data["air_pump_time_remaining_s"] = None
+            # last_error is left as set by _edge_alert
+            _all_outputs_off()
+            sd = status_data
+            sd.fan_state = sd.heater_state = sd.humidifier_state = "OFF"
+            sd.agitator_state = sd.air_pump_state = "OFF"
+            sd.agitator_phase_end_ts = sd.agitator_time_remaining_s = None
+            sd.air_pump_phase_end_ts = sd.air_pump_time_remaining_s = None
             if pump_configured:
-                _set_main_pump(False); status_data["pump_state"] = "OFF"
-                if STOP_EVENT.wait(timeout=1.0): return
-            # Skip the rest of this tick while in hard-stop
+                sd.pump_state = "OFF"
+            # Skip the rest of this tick while in hard-stop (always sleep: no spin without a pump)
+            _refresh_status_json()
+            if STOP_EVENT.wait(timeout=1.0): return
             continue
         
         
         # --- Force-clear phantom errors if nothing is active anymore ---
-        try:
-            alerts = status_data.get("alert_states", {})
-            any_active = any(bool(v.get("active")) for v in alerts.values())
-            if not any_active and status_data.get("last_error"):
-                status_data["last_error"] = None
-        except Exception:
-            pass
+        if active_alert_count == 0 and status_data.last_error:
+            status_data.last_error = None
 
 
 
@@ -1585,123 +1636,89 @@ def simulate_profile(profile_name: str, profile_data: dict):
 
 
                 # Manual override helpers (per-device opt-out from automation)
-        manual_overrides = status_data.setdefault("manual_overrides", {})
+        manual_overrides = status_data.manual_overrides
 
         def _manual_entry(name: str):
             return manual_overrides.get(name, {}) if isinstance(manual_overrides, dict) else {}
 
         def _manual_active(name: str) -> bool:
-            try:
-                return bool(_manual_entry(name).get("active"))
-            except Exception:
-                return False
+            return bool(_manual_entry(name).get("active"))
 
         def _manual_on(name: str) -> bool:
-            try:
-                return str(_manual_entry(name).get("state", "OFF")).upper() == "ON"
-            except Exception:
-                return False
+            # manual_routes only ever stores the "ON"/"OFF" literals
+            return _manual_entry(name).get("state") == "ON"
 
 
         # ─── Climate control (fan/heater/humidifier) ───
-        humid_critical = bool(status_data.get("humid_reservoir_critical"))
+        humid_critical = status_data.humid_reservoir_critical
         if _manual_active("extractor"):
             desired = _manual_on("extractor")
             _set_fan(desired)
-            status_data["fan_state"] = "ON" if desired else "OFF"
+            status_data.fan_state = "ON" if desired else "OFF"
         elif _last_temp is None or _last_humidity is None:
-            _set_fan(False);        status_data["fan_state"] = "OFF"
-            _set_heater(False);     status_data["heater_state"] = "OFF"
-            _set_humidifier(False); status_data["humidifier_state"] = "OFF"
+            _set_fan(False);        status_data.fan_state = "OFF"
+            _set_heater(False);     status_data.heater_state = "OFF"
+            _set_humidifier(False); status_data.humidifier_state = "OFF"
         else:
             fan_should_on = devices.fan_on
             fan_cause = None
-            if not status_data.get("paused", False):
-                t_max = status_data.get("temperature_max")
-                h_max = status_data.get("humidity_max")
+            if not status_data.paused:
                 if _last_temp is not None and t_max is not None:
-                    HYST_EX_T = float((gs.get("hysteresis_temp_extractor_c")
-                                      if gs.get("hysteresis_temp_extractor_c") is not None
-                                      else gs.get("hysteresis_temp_c", 0.5)) or 0.0)
                     if _last_temp > t_max:
                         fan_should_on = True; fan_cause = "temperature"
-                    elif _last_temp < (t_max - HYST_EX_T):
+                    elif _last_temp < (t_max - gsc.hyst_ex_t):
                         fan_should_on = False
                 if _last_humidity is not None and h_max is not None:
-                    HYST_EX_H = float((gs.get("hysteresis_humidity_extractor_pct")
-                                      if gs.get("hysteresis_humidity_extractor_pct") is not None
-                                      else gs.get("hysteresis_humidity_pct", 1.5)) or 0.0)
                     if _last_humidity > h_max:
                         fan_should_on = True
                         if not (_last_temp is not None and t_max is not None and _last_temp > t_max):
                             fan_cause = "humidity"
-                    elif _last_humidity < (h_max - HYST_EX_H):
+                    elif _last_humidity < (h_max - gsc.hyst_ex_h):
                         if not (_last_temp is not None and t_max is not None and _last_temp > t_max):
                             fan_should_on = False
-            fan_min_on = int(gs.get("fan_min_on_s", 0) or 0)
-            if (not fan_should_on and devices.fan_on and devices.fan_on_since is not None
-                    and (_mono() - devices.fan_on_since) < fan_min_on):
-                fan_should_on = True
             if not devices.fan_on and fan_should_on:
                 devices.fan_trigger_cause = fan_cause or "temperature"
-            status_data["fan_state"] = "ON" if fan_should_on else "OFF"
-            _set_fan(fan_should_on)
+            # The setter holds the fan ON until fan_min_on has elapsed
+            fan_should_on = _set_fan(fan_should_on, min_on_s=gsc.fan_min_on)
+            status_data.fan_state = "ON" if fan_should_on else "OFF"
 
             # heater
             if _manual_active("heater"):
                 desired_heat = _manual_on("heater")
                 _set_heater(desired_heat)
-                status_data["heater_state"] = "ON" if desired_heat else "OFF"
+                status_data.heater_state = "ON" if desired_heat else "OFF"
             else:
-                t_min = status_data.get("temperature_min")
                 if t_min is not None and _last_temp is not None:
-                    HYST = float((gs.get("hysteresis_temp_heater_c")
-                                 if gs.get("hysteresis_temp_heater_c") is not None
-                                 else gs.get("hysteresis_temp_c", 0.5)) or 0.0)
                     heater_should_on = devices.heater_on
                     if _last_temp < t_min:
                         heater_should_on = True
-                    elif _last_temp >= (t_min + HYST):
+                    elif _last_temp >= (t_min + gsc.hyst_heater):
                         heater_should_on = False
-                    heater_min_on = int(gs.get("heater_min_on_s", 0) or 0)
-                    if ((not heater_should_on) and devices.heater_on and devices.heater_on_since is not None
-                            and (_mono() - devices.heater_on_since) < heater_min_on):
-                        heater_should_on = True
-                    _set_heater(heater_should_on)
-                    status_data["heater_state"] = "ON" if heater_should_on else "OFF"
+                    heater_should_on = _set_heater(heater_should_on, min_on_s=gsc.heater_min_on)
+                    status_data.heater_state = "ON" if heater_should_on else "OFF"
 
             # humidifier
             if humid_critical:
                 _set_humidifier(False)
-                status_data["humidifier_state"] = "OFF"
+                status_data.humidifier_state = "OFF"
             elif _manual_active("humidifier"):
                 desired_humid = _manual_on("humidifier")
                 if humid_critical:
                     desired_humid = False
                 _set_humidifier(desired_humid)
-                status_data["humidifier_state"] = "ON" if desired_humid else "OFF"
+                status_data.humidifier_state = "ON" if desired_humid else "OFF"
             else:
-                h_min = status_data.get("humidity_min")
                 if h_min is not None and _last_humidity is not None:
-                    HUM_HYST = float((gs.get("hysteresis_humidity_humidifier_pct")
-                                     if gs.get("hysteresis_humidity_humidifier_pct") is not None
-                                     else gs.get("hysteresis_humidity_pct", 1.5)) or 0.0)
                     humid_should_on = devices.humidifier_on
                     if _last_humidity < h_min:
                         humid_should_on = True
-                    elif _last_humidity >= (h_min + HUM_HYST):
+                    elif _last_humidity >= (h_min + gsc.hyst_humidifier):
                         humid_should_on = False
-                    humidifier_min_on = int(gs.get("humidifier_min_on_s", 0) or 0)
-                    if ((not humid_should_on) and devices.humidifier_on and devices.humidifier_on_since is not None
-                            and (_mono() - devices.humidifier_on_since) < humidifier_min_on):
-                        humid_should_on = True
-                    _set_humidifier(humid_should_on)
-                    status_data["humidifier_state"] = "ON" if humid_should_on else "OFF"
+                    humid_should_on = _set_humidifier(humid_should_on, min_on_s=gsc.humidifier_min_on)
+                    status_data.humidifier_state = "ON" if humid_should_on else "OFF"
 
-        # ─── Pump window hard gate ───
-        win_on  = profile_data.get("pump", {}).get("_win_on_h")
-        win_off = profile_data.get("pump", {}).get("_win_off_h")
-        allowed_now = _in_hour_window(win_on, win_off)
+        # ─── Pump window hard gate (hours come from _apply_profile_cfg) ───
+        allowed_now = window_allowed(now)
         manual_pump_active = _manual_active("main_pump")
         manual_ag_active = _manual_active("agitator_pump")
         manual_air_active = _manual_active("air_pump")
@@ -1709,38 +1726,32 @@ def simulate_profile(profile_name: str, profile_data: dict):
         if manual_pump_active:
             desired_pump = _manual_on("main_pump")
             _set_main_pump(desired_pump)
-            status_data["pump_state"] = "ON" if desired_pump else "OFF"
-            status_data["pump_phase_end_ts"] = None
-            status_data["pump_time_remaining_s"] = None
+            status_data.pump_state = "ON" if desired_pump else "OFF"
+            status_data.pump_phase_end_ts = None
+            status_data.pump_time_remaining_s = None
         if manual_ag_active:
             desired_ag = _manual_on("agitator_pump")
             _set_agitator(desired_ag)
-            status_data["agitator_state"] = "ON" if desired_ag else "OFF"
-            status_data["agitator_phase_end_ts"] = None
-            status_data["agitator_time_remaining_s"] = None
+            status_data.agitator_state = "ON" if desired_ag else "OFF"
+            status_data.agitator_phase_end_ts = None
+            status_data.agitator_time_remaining_s = None
         if manual_air_active:
             desired_air = _manual_on("air_pump")
             _set_air_pump(desired_air)
-            status_data["air_pump_state"] = "ON" if desired_air else "OFF"
-            status_data["air_pump_phase_end_ts"] = None
-            status_data["air_pump_time_remaining_s"] = None
+            status_data.air_pump_state = "ON" if desired_air else "OFF"
+            status_data.air_pump_phase_end_ts = None
+            status_data.air_pump_time_remaining_s = None
 
         if not allowed_now:
-            if status_data.get("pump_state") == "ON" and not manual_pump_active:
-                status_data["pump_state"] = "OFF"
-                _set_main_pump(False)
-                status_data["pump_phase_end_ts"] = None
-                status_data["pump_time_remaining_s"] = None
-            if status_data.get("agitator_state") == "ON" and not manual_ag_active:
-                _set_agitator(False); status_data["agitator_state"] = "OFF"
-                status_data["agitator_phase_end_ts"] = None
-                status_data["agitator_time_remaining_s"] = None
-            if status_data.get("air_pump_state") == "ON" and not manual_air_active:
-                _set_air_pump(False); status_data["air_pump_state"] = "OFF"
-                status_data["air_pump_phase_end_ts"] = None
-                status_data["air_pump_time_remaining_s"] = None
-            next_on_due_at = _next_window_open_ts(win_on, win_off, now_dt=datetime.datetime.now())
+            if status_data.pump_state == "ON" and not manual_pump_active:
+                _force_off(status_data, "pump")
+            if status_data.agitator_state == "ON" and not manual_ag_active:
+                _force_off(status_data, "agitator")
+            if status_data.air_pump_state == "ON" and not manual_air_active:
+                _force_off(status_data, "air_pump")
+            next_on_due_at = _next_window_open_cached(win_on, win_off, now)
             if not (manual_pump_active or manual_ag_active or manual_air_active):
+                _refresh_status_json()
                 if STOP_EVENT.wait(0.25):
                     return
                 continue
@@ -1749,196 +1760,159 @@ def simulate_profile(profile_name: str, profile_data: dict):
         # ─── Scheduler (pump + premix) ───
         manual_scheduler_locked = manual_pump_active or manual_ag_active or manual_air_active
         if manual_scheduler_locked:
-            if (not manual_pump_active) and status_data.get("pump_state") == "ON":
-                status_data["pump_state"] = "OFF"
+            if (not manual_pump_active) and status_data.pump_state == "ON":
+                status_data.pump_state = "OFF"
                 _set_main_pump(False)
-            status_data["pump_phase_end_ts"] = None if not manual_pump_active else status_data.get("pump_phase_end_ts")
-            status_data["pump_time_remaining_s"] = None
+            status_data.pump_phase_end_ts = None if not manual_pump_active else status_data.pump_phase_end_ts
+            status_data.pump_time_remaining_s = None
             if not manual_ag_active:
-                status_data["agitator_phase_end_ts"] = None
-                status_data["agitator_time_remaining_s"] = None
+                status_data.agitator_phase_end_ts = None
+                status_data.agitator_time_remaining_s = None
             if not manual_air_active:
-                status_data["air_pump_phase_end_ts"] = None
-                status_data["air_pump_time_remaining_s"] = None
+                status_data.air_pump_phase_end_ts = None
+                status_data.air_pump_time_remaining_s = None
         elif pump_off <= 0 and pump_on <= 0:
             # disabled
-            if status_data.get("pump_state") == "ON":
-                status_data["pump_state"] = "OFF"
+            if status_data.pump_state == "ON":
+                status_data.pump_state = "OFF"
                 _set_main_pump(False)
-            if status_data.get("agitator_state") == "ON":
-                _set_agitator(False); status_data["agitator_state"] = "OFF"
-                status_data["agitator_phase_end_ts"] = None
-                status_data["agitator_time_remaining_s"] = None
-            if status_data.get("air_pump_state") == "ON":
-                _set_air_pump(False); status_data["air_pump_state"] = "OFF"
-                status_data["air_pump_phase_end_ts"] = None
-                status_data["air_pump_time_remaining_s"] = None
+            if status_data.agitator_state == "ON":
+                _force_off(status_data, "agitator")
+            if status_data.air_pump_state == "ON":
+                _force_off(status_data, "air_pump")
         else:
-            if status_data.get("startup_kick", False):
-                status_data.pop("startup_kick", None)
+            if status_data.startup_kick:
+                status_data.startup_kick = False
                 _trigger_startup_premix(now, now_m)
 
 
-            if status_data.get("pump_state") != "ON":
+            if status_data.pump_state != "ON":
                 if next_on_due_at is None:
                     next_on_due_at = _schedule_next_on(now)
 
                 # Air premix: finish at pump start (clamped)
                 if air_enabled and air_run > 0 and next_on_due_at is not None:
                     if (not air_started_this_cycle) and (now >= (next_on_due_at - air_run)):
-                        _set_air_pump(True); status_data["air_pump_state"] = "ON"
+                        _set_air_pump(True); status_data.air_pump_state = "ON"
                         air_timer = now_m; air_started_this_cycle = True
                         end_by_run  = air_timer + air_run
                         end_by_pump = now_m + max(0.0, float(next_on_due_at - now))
-                        status_data["air_pump_phase_end_ts"] = min(end_by_run, end_by_pump)
-                    ap_end = status_data.get("air_pump_phase_end_ts")
-                    if status_data.get("air_pump_state") == "ON" and ap_end and now_m >= float(ap_end):
-                        _set_air_pump(False); status_data["air_pump_state"] = "OFF"
-                        status_data["air_pump_phase_end_ts"] = None
-                        status_data["air_pump_time_remaining_s"] = None
+                        status_data.air_pump_phase_end_ts = min(end_by_run, end_by_pump)
+                    ap_end = status_data.air_pump_phase_end_ts
+                    if status_data.air_pump_state == "ON" and ap_end is not None and now_m >= ap_end:
+                        _force_off(status_data, "air_pump")
 
                 # Agitator premix
                 if ag_enabled and ag_run > 0 and next_on_due_at is not None:
                     if (not agitator_started_this_cycle) and (now >= (next_on_due_at - ag_run)):
-                        _set_agitator(True); status_data["agitator_state"] = "ON"
+                        _set_agitator(True); status_data.agitator_state = "ON"
                         agitator_timer = now_m; agitator_started_this_cycle = True
                         end_by_run  = agitator_timer + ag_run
                         end_by_pump = now_m + max(0.0, float(next_on_due_at - now))
-                        status_data["agitator_phase_end_ts"] = min(end_by_run, end_by_pump)
-                    a_end = status_data.get("agitator_phase_end_ts")
-                    if status_data.get("agitator_state") == "ON" and a_end and now_m >= float(a_end):
-                        _set_agitator(False); status_data["agitator_state"] = "OFF"
-                        status_data["agitator_phase_end_ts"] = None
-                        status_data["agitator_time_remaining_s"] = None
+                        status_data.agitator_phase_end_ts = min(end_by_run, end_by_pump)
+                    a_end = status_data.agitator_phase_end_ts
+                    if status_data.agitator_state == "ON" and a_end is not None and now_m >= a_end:
+                        _force_off(status_data, "agitator")
 
                 # Turn ON main pump when due (after premix finishes or is clamped)
                 if next_on_due_at is not None and now >= next_on_due_at:
-                    status_data["pump_state"] = "ON"
+                    status_data.pump_state = "ON"
                     pump_state, pump_timer = True, now_m
-                    status_data["cycle_count"] += 1
+                    status_data.cycle_count += 1
                     _set_main_pump(True)
-                    status_data["pump_phase_end_ts"] = now_m + pump_on
+                    status_data.pump_phase_end_ts = now_m + pump_on
             else:
                 # Pump is ON; turn OFF after pump_on seconds and schedule next
                 if now_m - pump_timer >= pump_on:
-                    status_data["pump_state"] = "OFF"
                     pump_state, pump_timer = False, now_m
-                    _set_main_pump(False)
                     next_on_due_at = _schedule_next_on(now)
                     agitator_started_this_cycle = False
                     air_started_this_cycle = False
-                    status_data["pump_phase_end_ts"] = None
-                    status_data["pump_time_remaining_s"] = None
-                    if status_data.get("agitator_state") == "ON":
-                        _set_agitator(False); status_data["agitator_state"] = "OFF"
-                    status_data["agitator_phase_end_ts"] = None
-                    status_data["agitator_time_remaining_s"] = None
-                    if status_data.get("air_pump_state") == "ON":
-                        _set_air_pump(False); status_data["air_pump_state"] = "OFF"
-                    status_data["air_pump_phase_end_ts"] = None
-                    status_data["air_pump_time_remaining_s"] = None
+                    # setters no-op for outputs already off
+                    for _name in _TIMED_OUTPUTS:
+                        _force_off(status_data, _name)
 
 
 # ─── Update countdowns (for UI) ───
-        if status_data.get("pump_state") == "ON":
-            end_ts = status_data.get("pump_phase_end_ts")
-            if isinstance(end_ts, (int, float)) and end_ts > 0:
-                rem = max(0, math.ceil(round(end_ts - now_m)))
-            else:
-                rem = max(0, math.ceil(round(pump_on - (now_m - pump_timer))))
-                status_data["pump_phase_end_ts"] = now_m + rem
-            status_data["pump_time_remaining_s"] = rem
-        else:
-            status_data["pump_time_remaining_s"] = None
-
-        if status_data.get("agitator_state") == "ON":
-            a_end = status_data.get("agitator_phase_end_ts")
-            if not isinstance(a_end, (int, float)) or a_end <= 0:
-                a_end = agitator_timer + float(ag_run)
-                status_data["agitator_phase_end_ts"] = a_end
-            a_rem_f = a_end - now_m
-            status_data["agitator_time_remaining_s"] = 0 if a_rem_f < 0 else int(math.ceil(a_rem_f))
-        else:
-            status_data["agitator_time_remaining_s"] = None
-            status_data["agitator_phase_end_ts"] = None
-
-        if status_data.get("air_pump_state") == "ON":
-            ap_end = status_data.get("air_pump_phase_end_ts")
-            if not isinstance(ap_end, (int, float)) or ap_end <= 0:
-                ap_end = air_timer + float(air_run)
-                status_data["air_pump_phase_end_ts"] = ap_end
-            ap_rem_f = ap_end - now_m
-            status_data["air_pump_time_remaining_s"] = 0 if ap_rem_f < 0 else int(math.ceil(ap_rem_f))
-        else:
-            status_data["air_pump_time_remaining_s"] = None
-            status_data["air_pump_phase_end_ts"] = None
+        # One pass over the timed outputs (_COUNTDOWNS); a missing phase end
+        # falls back to timer + run length. The resolved phase ends also give
+        # the nearest deadline for the sleep below.
+        sd = status_data
+        next_end = None
+        for (state_k, end_k, rem_k, to_int), fallback_end in zip(
+            _COUNTDOWNS, (pump_timer + pump_on, agitator_timer + ag_run, air_timer + air_run)
+        ):
+            if getattr(sd, state_k) == "ON":
+                end_ts = getattr(sd, end_k)
+                if end_ts is None:
+                    end_ts = fallback_end
+                    setattr(sd, end_k, end_ts)
+                rem_f = end_ts - now_m
+                setattr(sd, rem_k, 0 if rem_f < 0 else to_int(rem_f))
+                if next_end is None or end_ts < next_end:
+                    next_end = end_ts
+            elif getattr(sd, rem_k) is not None or getattr(sd, end_k) is not None:
+                # only on the tick an output goes OFF; idle outputs are left alone
+                setattr(sd, rem_k, None)
+                setattr(sd, end_k, None)
 
         # ─── Periodic state save (for resume) ───
+        # Skipped when the fields resume_profile reads back are unchanged; the
+        # last_temp/last_humidity readings alone don't justify an fsync'd write.
         if now - last_state_save >= state_save_interval:
-            save_state({
-                "running_profile": profile_name,
-                "start_time":      status_data["start_time"],
-                "cycle_count":     status_data["cycle_count"],
-                "pump_state":      status_data["pump_state"],
-                "fan_state":       status_data["fan_state"],
-                "last_temp":       _last_temp,
-                "last_humidity":   _last_humidity,
-                "paused":          status_data.get("paused", False)
-            })
             last_state_save = now
-            logging.info("✅ Saved state to disk.")
-
-        # Deadline-aware sleep
-        cands = []
-        for key in ("pump_phase_end_ts", "agitator_phase_end_ts", "air_pump_phase_end_ts"):
-            ts = status_data.get(key)
-            if isinstance(ts, (int, float)) and ts > 0:
-                cands.append(ts)
-        now_m = _mono()
-        if cands:
-            sleep_s = max(0.02, min(0.05, min(cands) - now_m))
-        else:
-            sleep_s = 0.25
+            snapshot = (profile_name, status_data.start_time, status_data.cycle_count,
+                        status_data.pump_state, status_data.fan_state, status_data.paused)
+            if snapshot != last_saved_snapshot:
+                save_state({
+                    "running_profile": profile_name,
+                    "start_time":      status_data.start_time,
+                    "cycle_count":     status_data.cycle_count,
+                    "pump_state":      status_data.pump_state,
+                    "fan_state":       status_data.fan_state,
+                    "last_temp":       _last_temp,
+                    "last_humidity":   _last_humidity,
+                    "paused":          status_data.paused
+                })
+                last_saved_snapshot = snapshot
+                logging.info("✅ Saved state to disk.")
+
+        # Deadline-aware sleep: the base 0.25 s tick, cut short only when a phase
+        # end (next_end, from the countdown block) falls inside it
+        now_m = _mono()  # fresh: the sleep is computed against real remaining time
+        sleep_s = 0.25
+        if next_end is not None and next_end - now_m < sleep_s:
+            sleep_s = max(0.02, next_end - now_m)
+        _refresh_status_json()
         if STOP_EVENT.wait(timeout=sleep_s):
             return
 
     # ───────────────────────────── Cleanup (thread exit) ───────────────────
     logging.info(f"⛔ Simulation for '{profile_name}' ended.")
     running_profile = None
-    status_data.update(
-        profile=None,
-        pump_state="OFF",
-        fan_state="OFF",
-        heater_state="OFF",
-        humidifier_state="OFF",
-        start_time=None,
-
-        # Clear ONLY profile thresholds – keep live readings intact so the
-        # Ambient Sampler can continue showing data on the UI.
-        temperature_min=None, temperature_target=None, temperature_max=None,
-        humidity_min=None,    humidity_target=None,    humidity_max=None,
-        water_temperature_min=None, water_temperature_target=None, water_temperature_max=None,
-        water_quantity_min=None
-        # Do NOT touch:
-        #   humidity, temperature_c, temperature_top/bottom/avg/gradient,
-        #   humidity_top/bottom, water_temperature
-    )
-    try: _set_fan(False)
-    except Exception: pass
-    try: _set_main_pump(False)
-    except Exception: pass
-    try: _set_agitator(False)
-    except Exception: pass
-    try: _set_air_pump(False)
-    except Exception: pass
-    try: _set_heater(False)
-    except Exception: pass
-    try: _set_humidifier(False)
-    except Exception: pass
-    status_data["agitator_state"] = "OFF"
-    status_data["air_pump_state"] = "OFF"
-    status_data["air_pump_phase_end_ts"] = None
-    status_data["air_pump_time_remaining_s"] = None
+    sd = status_data
+    sd.profile = None
+    sd.pump_state = "OFF"
+    sd.fan_state = "OFF"
+    sd.heater_state = "OFF"
+    sd.humidifier_state = "OFF"
+    sd.start_time = None
+
+    # Clear ONLY profile thresholds – keep live readings intact so the
+    # Ambient Sampler can continue showing data on the UI.
+    sd.temperature_min = sd.temperature_target = sd.temperature_max = None
+    sd.humidity_min = sd.humidity_target = sd.humidity_max = None
+    sd.water_temperature_min = sd.water_temperature_target = sd.water_temperature_max = None
+    sd.water_quantity_min = None
+    # Do NOT touch:
+    #   humidity, temperature_c, temperature_top/bottom/avg/gradient,
+    #   humidity_top/bottom, water_temperature
+    for _name in _TIMED_OUTPUTS:
+        try: _force_off(sd, _name)
+        except Exception: logging.warning("OFF failed for %s", _name, exc_info=True)
+    for _off in (_set_fan, _set_heater, _set_humidifier):
+        try: _off(False)
+        except Exception: logging.warning("OFF failed: %s", _off.__name__, exc_info=True)
     clear_state()
 
 
@@ -1949,22 +1923,51 @@ def _get_running_profile() -> Optional[str]:
     return running_profile
 
 def _set_running_profile(name: Optional[str]):
-    global running_profile
+    global running_profile, _SIM_GEN
     running_profile = name
+    _SIM_GEN += 1  # any run still queued from before this start/stop is stale
+
+# Profile runs are queued to one long-lived worker: no thread spawn per run, and
+# a new run only starts once the previous loop has finished its exit cleanup.
+_SIM_JOBS: "queue.Queue" = queue.Queue()
+_SIM_STOP = object()  # queued by _ordered_shutdown(); the worker exits on it
+_SIM_GEN = 0  # bumped by _set_running_profile; jobs carry the value they were queued under
+
+def _sim_worker():
+    while True:
+        job = _SIM_JOBS.get()
+        if job is _SIM_STOP:
+            return
+        if STOP_EVENT.is_set():
+            continue  # shutting down: drop runs still queued
+        gen, profile_name, pdata = job
+        if gen != _SIM_GEN:
+            continue  # stopped or replaced while it waited
+        try:
+            simulate_profile(profile_name, pdata)
+        except Exception:
+            logging.exception(f"Control loop for '{profile_name}' crashed")
 
 def _start_sim_thread(profile_name: str, pdata: dict) -> threading.Thread:
-    """Start the control loop thread for a given profile."""
+    """Queue a control loop run for a given profile; returns the worker thread."""
     global SIM_THREAD
     STOP_EVENT.clear()
-    t = threading.Thread(target=simulate_profile, args=(profile_name, pdata), daemon=False)
-    t.start()
-    SIM_THREAD = t
-    return t
+    if SIM_THREAD is None or not SIM_THREAD.is_alive():
+        # Daemon: an idle worker must not hold up interpreter exit; shutdown
+        # stops it explicitly through _SIM_STOP + join.
+        SIM_THREAD = threading.Thread(target=_sim_worker, name="sim-worker", daemon=True)
+        SIM_THREAD.start()
+    _SIM_JOBS.put((_SIM_GEN, profile_name, pdata))
+    return SIM_THREAD
 
 # ───────────────────────── Small parsing helpers for blueprints ─────────────────────────
 def _to_int(v, default=None):
     """Parse an integer from form values like '12' or '12.0'. Returns default on failure."""
+    if type(v) is int:
+        return v
     try:
+        if isinstance(v, float):
+            return int(v)
         if v is None or (isinstance(v, str) and v.strip() == ""):
             return default
         return int(float(v))
@@ -1973,6 +1976,8 @@ def _to_int(v, default=None):
 
 def _to_float(v, default=None):
     """Parse a float from form values. Returns default on failure."""
+    if type(v) is float:
+        return v
     try:
         if v is None or (isinstance(v, str) and v.strip() == ""):
             return default
@@ -1980,14 +1985,17 @@ def _to_float(v, default=None):
     except Exception:
         return default
 
+_TRUTHY = frozenset(("1", "true", "yes", "on", "checked"))
+_FALSY = frozenset(("0", "false", "no", "off", ""))
+
 def _parse_bool(v, default=False):
     """Accepts checkboxes/strings like 'on', 'true', '1'."""
     if isinstance(v, bool):
         return v
     s = str(v or "").strip().lower()
-    if s in ("1", "true", "yes", "on", "checked"):
+    if s in _TRUTHY:
         return True
-    if s in ("0", "false", "no", "off", ""):
+    if s in _FALSY:
         return False
     return bool(default)
 
@@ -2003,9 +2011,14 @@ def _clamp_hour(h, default=None):
 
 
 # ───────────────────────── Small parsing helpers for blueprints ─────────────────────────
+_SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+_NFKD = unicodedata.normalize
+
 def _slugify(name: str, maxlen: int = 80) -> str:
-    s = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
-    s = re.sub(r"[^a-zA-Z0-9]+", "-", s).strip("-").lower()
+    s = str(name or "")
+    if not s.isascii():  # plain ASCII names need no NFKD/encode round trip
+        s = _NFKD("NFKD", s).encode("ascii", "ignore").decode("ascii")
+    s = _SLUG_RE.sub("-", s).strip("-").lower()
     s = s[:maxlen].strip("-")
     return s or "profile"
 
@@ -2013,13 +2026,23 @@ def _slugify(name: str, maxlen: int = 80) -> str:
 
 
 
-CTX = {
+def _global_settings_ref():
+    """Current global settings snapshot (rebound by _set_global_settings)."""
+    return global_settings
+
+def _set_global_settings(d):
+    global global_settings
+    global_settings = d
+
+# Read-only view: blueprints look things up, nothing rebinds entries at runtime
+CTX = MappingProxyType({
     # state & io
     "status_data":          status_data,
     "get_running_profile":  _get_running_profile,
     "set_running_profile":  _set_running_profile,
     "start_sim_thread":     _start_sim_thread,
     "STOP_EVENT":           STOP_EVENT,
+    "request_profile_reload": PROFILE_RELOAD_EVENT.set,
 
     # logging & stores
     "LOGGER":               LOGGER,
@@ -2032,8 +2055,8 @@ CTX = {
     "save_global_settings": save_global_settings,
     "validate_settings":    validate_settings,
     "GLOBAL_DEFAULTS":      GLOBAL_DEFAULTS,
-    "global_settings_ref":  lambda: global_settings,   # read current snapshot
-    "set_global_settings":  lambda d: globals().__setitem__('global_settings', d),
+    "global_settings_ref":  _global_settings_ref,   # read current snapshot
+    "set_global_settings":  _set_global_settings,
 
     # devices/helpers
     "apply_outputs_from_status": apply_outputs_from_status,
@@ -2055,9 +2078,7 @@ CTX = {
 
     # scale sampler (for teardown)
     "SCALE_SAMPLER":             SCALE_SAMPLER,
-    
-
-}
+})
 app.config["CTX"] = CTX  # make available to blueprints via current_app.config["CTX"]
 
 
@@ -2087,50 +2108,34 @@ def cleanup_gpio():
     try:
         devices_cleanup_gpio()
     except Exception:
-        pass
+        logging.warning("GPIO cleanup failed; falling back to GPIO.cleanup()", exc_info=True)
+        try:
+            GPIO.cleanup()
+        except Exception:
+            pass
+
+def _stop_sim_worker():
+    if SIM_THREAD is not None and SIM_THREAD.is_alive():
+        _SIM_JOBS.put(_SIM_STOP)
+        SIM_THREAD.join(timeout=5.0)
+
+# Shutdown steps in order; a failing step is logged and the rest still run
+_SHUTDOWN_STEPS = (
+    ("scale sampler", lambda: SCALE_SAMPLER.stop()),  # first, so HX711 is released
+    ("alert worker", stop_alert_worker),
+    ("stop signal", STOP_EVENT.set),
+    ("control loop", _stop_sim_worker),
+    ("gpio mode", _ensure_gpio_mode),  # valid mode for the final OFF writes
+    ("gpio cleanup", cleanup_gpio),  # devices → sensors
+)
 
 def _ordered_shutdown():
     """Stop worker thread(s) cleanly, then do GPIO cleanup."""
-    # 0a) Stop the scale sampler first so HX711 is released
-    try:
-        SCALE_SAMPLER.stop()
-    except Exception:
-        pass
-
-    # 0b) Stop the Discord alert worker
-    try:
-        stop_alert_worker()
-    except Exception:
-        pass
-
-    # 1) Signal the control loop to stop
-    try:
-        STOP_EVENT.set()
-    except Exception:
-        pass
-
-    # 2) Wait briefly for the worker thread to exit
-    try:
-        if SIM_THREAD is not None and SIM_THREAD.is_alive():
-            SIM_THREAD.join(timeout=5.0)
-    except Exception:
-        pass
-
-    # 3) Ensure GPIO mode is valid for any final OFF writes
-    try:
-        _ensure_gpio_mode()
-    except Exception:
-        pass
-
-    # 4) Perform cleanup (devices → sensors)
-    try:
-        cleanup_gpio()
-    except Exception:
-        # Last resort direct cleanup
+    for label, step in _SHUTDOWN_STEPS:
         try:
-            GPIO.cleanup()
+            step()
         except Exception:
-            pass
+            logging.warning("Shutdown step '%s' failed", label, exc_info=True)
 
 atexit.register(_ordered_shutdown)
 atexit.register(lambda: SCALE_SAMPLER.stop())
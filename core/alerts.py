@@ -1,56 +1,119 @@
 # core/alerts.py
 import os
+import json
 import threading
+import time
 import queue
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # optional: faster webhook body encoding
+except ImportError:
+    orjson = None
 
 DISCORD_WEBHOOK = os.getenv(
     "DISCORD_WEBHOOK",
     "https://discord.com/api/webhooks/1410644857579503740/WX8bUFFQ7Y4QJ9c957-8k58d2aPFprYwKSsClvcLEdu9gh3sb6-jpmtVupajI84O7gEU"
 )
 
+# Resolved once: send_discord() checks this on every call
+_WEBHOOK_ENABLED = bool(DISCORD_WEBHOOK)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _encode_body(content: str) -> bytes:
+    if orjson is not None:
+        return orjson.dumps({"content": content})
+    return json.dumps({"content": content}).encode("utf-8")
+
 _alert_q: "queue.Queue[str]" = queue.Queue(maxsize=256)
 _worker_thread: threading.Thread | None = None
-_stop_evt = threading.Event()
+_STOP = object()  # queued by stop_alert_worker(); the worker exits when it dequeues it
+_drops = 0  # alerts discarded because the queue was full
+
+# Identical texts sent again within this window are coalesced into the first one
+DEDUP_WINDOW_S = 0.25
+_last_sent: dict[str, float] = {}
+
+# Queued alerts are joined into one webhook post (Discord caps content at 2000 chars)
+MAX_BATCH = 10
+DISCORD_MAX_CHARS = 2000
 
 def _worker():
-    while not _stop_evt.is_set():
-        try:
-            msg = _alert_q.get(timeout=0.2)
-        except queue.Empty:
-            continue
+    # One session for the worker's lifetime: keep-alive reuses the TLS connection
+    sess = requests.Session()
+    sess.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+    carry = None  # message that did not fit in the previous batch
+    stopping = False
+    while not stopping:
+        # Blocks with no timeout: an idle worker never wakes
+        msg = _alert_q.get() if carry is None else carry
+        carry = None
+        if msg is _STOP:
+            _alert_q.task_done()
+            break
+        batch = [msg]
+        size = len(msg)
+        while len(batch) < MAX_BATCH:
+            try:
+                nxt = _alert_q.get_nowait()
+            except queue.Empty:
+                break
+            if nxt is _STOP:
+                _alert_q.task_done()
+                stopping = True  # post what is already drained, then exit
+                break
+            if size + 1 + len(nxt) > DISCORD_MAX_CHARS:
+                carry = nxt
+                break
+            batch.append(nxt)
+            size += 1 + len(nxt)
         try:
-            if DISCORD_WEBHOOK:
-                requests.post(DISCORD_WEBHOOK, json={"content": msg}, timeout=5)
+            if _WEBHOOK_ENABLED:
+                sess.post(DISCORD_WEBHOOK, data=_encode_body("\n".join(batch)),
+                          headers=_JSON_HEADERS, timeout=5)
         except Exception:
             pass
         finally:
-            _alert_q.task_done()
+            for _ in batch:
+                _alert_q.task_done()
+    sess.close()
 
 def start_alert_worker():
     global _worker_thread
     if _worker_thread and _worker_thread.is_alive():
         return
-    _stop_evt.clear()
     _worker_thread = threading.Thread(target=_worker, name="discord-alerts", daemon=True)
     _worker_thread.start()
 
 def stop_alert_worker():
-    _stop_evt.set()
+    if not (_worker_thread and _worker_thread.is_alive()):
+        return
     try:
-        _alert_q.put_nowait("")
-    except Exception:
-        pass
-    if _worker_thread and _worker_thread.is_alive():
-        _worker_thread.join(timeout=2.0)
+        _alert_q.put(_STOP, timeout=2.0)
+    except queue.Full:
+        return  # worker is wedged on the network; it is a daemon thread
+    _worker_thread.join(timeout=2.0)
 
 def send_discord(text: str):
-    if not text or not DISCORD_WEBHOOK:
+    """Non-blocking: enqueue for the worker; never waits on the network."""
+    global _drops
+    if not text or not _WEBHOOK_ENABLED:
+        return
+    text = str(text)
+    now = time.monotonic()
+    if now - _last_sent.get(text, float("-inf")) < DEDUP_WINDOW_S:
         return
+    if len(_last_sent) > 256:
+        _last_sent.clear()
+    _last_sent[text] = now
     try:
-        _alert_q.put_nowait(str(text))
+        _alert_q.put_nowait(text)
     except queue.Full:
-        pass
+        _drops += 1
+
+def dropped_alerts() -> int:
+    return _drops
 
 start_alert_worker()
 
@@ -0,0 +1,199 @@
+# core/status.py
+import threading
+from collections.abc import MutableMapping
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Optional
+
+# Bits of StatusData.ctrl_flags (plain ints: IntFlag arithmetic allocates)
+CTRL_PAUSED = 1
+CTRL_PUMP_ON = 2
+CTRL_AGITATOR_ON = 4
+CTRL_AIR_PUMP_ON = 8
+CTRL_FAN_ON = 16
+CTRL_HEATER_ON = 32
+CTRL_HUMIDIFIER_ON = 64
+
+
+@dataclass(slots=True)
+class StatusData(MutableMapping):
+    """
+    Live controller status shared by the control loop, samplers and web routes.
+
+    The control loop reads/writes fields as attributes (fixed slots, no per-tick
+    dict hashing). Routes keep using the dict-style API: known fields map onto
+    the slots, anything else lands in `_extra`, so ad-hoc keys still work.
+
+    Bulk writes (`set_many`/`update`) and `as_dict` snapshots share `_lock`, so
+    a snapshot never sees half of a route's multi-key update.
+    """
+    profile: Optional[str] = None
+    pump_state: str = "OFF"
+    cycle_count: int = 0
+    start_time: Optional[float] = None
+    fan_state: str = "OFF"
+    heater_state: str = "OFF"
+    humidifier_state: str = "OFF"
+    paused: bool = False
+    startup_kick: bool = False  # one-shot premix request from resume/renew routes
+    humidity: Optional[float] = None
+    temperature_c: Optional[float] = None
+    agitator_state: str = "OFF"
+    air_pump_state: str = "OFF"
+    last_error: Optional[str] = None
+
+    # Timed devices (phase bookkeeping). *_phase_end_ts is None or a float
+    # time.monotonic() deadline; writers keep it that way, so readers only test `is None`.
+    pump_resume_phase: Optional[str] = None
+    pump_time_remaining_s: Optional[int] = None
+    pump_phase_end_ts: Optional[float] = None
+    pump_time_total_s: Optional[int] = None
+    pump_resume_remaining_s: Optional[float] = None
+
+    # Reservoir exposure
+    reservoir_status: Optional[str] = None
+    humid_res_gross_kg: Optional[float] = None
+    humid_res_water_raw: Optional[float] = None
+    humid_res_water_kg: Optional[float] = None
+    humid_reservoir_water_kg: Optional[float] = None
+    humid_res_status: Optional[str] = None
+    humid_res_debug: Any = None
+    reservoir_weight_kg: Optional[float] = None
+    reservoir_water_kg: Optional[float] = None
+    pump_cycle_res_before_kg: Optional[float] = None
+    reservoir_last_fill_iso: Optional[str] = None
+    humid_res_last_fill_iso: Optional[str] = None
+    humid_reservoir_critical: bool = False
+
+    # Manual overrides (per-device state + timers)
+    manual_overrides: dict = field(default_factory=dict)
+
+    # Concentrate mixer state (used as nutrient stirrer)
+    concentrate_mix_state: str = "OFF"
+
+    # Agitator/Air pump timers
+    agitator_time_remaining_s: Optional[int] = None
+    agitator_phase_end_ts: Optional[float] = None
+    agitator_time_total_s: Optional[int] = None
+    agitator_resume_phase: Optional[str] = None
+    agitator_resume_remaining_s: Optional[float] = None
+    air_pump_time_remaining_s: Optional[int] = None
+    air_pump_phase_end_ts: Optional[float] = None
+    air_pump_time_total_s: Optional[int] = None
+    air_pump_resume_phase: Optional[str] = None
+    air_pump_resume_remaining_s: Optional[float] = None
+
+    # Nutrient dosing live flags (populated via devices + service)
+    nutrient_A_on: bool = False
+    nutrient_B_on: bool = False
+    dosing_phase: Optional[str] = None
+    dosing_running: bool = False
+
+    # Thresholds & readings (start cleared)
+    temperature_min: Optional[float] = None
+    temperature_target: Optional[float] = None
+    temperature_max: Optional[float] = None
+    humidity_min: Optional[float] = None
+    humidity_target: Optional[float] = None
+    humidity_max: Optional[float] = None
+    water_temperature: Optional[float] = None
+    water_temperature_min: Optional[float] = None
+    water_temperature_target: Optional[float] = None
+    water_temperature_max: Optional[float] = None
+    water_quantity_min: Optional[float] = None
+    temperature_top: Optional[float] = None
+    temperature_bottom: Optional[float] = None
+    temperature_avg: Optional[float] = None
+    temperature_gradient: Optional[float] = None
+    humidity_top: Optional[float] = None
+    humidity_bottom: Optional[float] = None
+    reservoir_gross_kg: Optional[float] = None
+    reservoir_water_raw: Optional[float] = None
+    reservoir_debug: Any = None
+
+    # Keys set ad hoc by routes/helpers that are not part of the fixed layout
+    _extra: dict = field(default_factory=dict, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    # ---------- dict-style API (routes, devices, legacy call sites) ----------
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            # Fixed fields always exist; "deleting" one restores its default.
+            setattr(self, key, _DEFAULTS[key]())
+        else:
+            del self._extra[key]
+
+    def __iter__(self):
+        yield from _FIELD_NAMES
+        yield from list(self._extra)
+
+    def __len__(self):
+        return len(_FIELD_NAMES) + len(self._extra)
+
+    def __contains__(self, key):
+        return key in _FIELD_SET or key in self._extra
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        return self._extra.get(key, default)
+
+    def set_many(self, pairs):
+        """Bulk write from (key, value) pairs without building a kwargs dict."""
+        extra = self._extra
+        with self._lock:
+            for k, v in pairs:
+                if k in _FIELD_SET:
+                    setattr(self, k, v)
+                else:
+                    extra[k] = v
+
+    def update(self, other=(), /, **kw):
+        pairs = other.items() if hasattr(other, "items") else other
+        if kw:
+            pairs = [*pairs, *kw.items()]
+        self.set_many(pairs)
+
+    @property
+    def ctrl_flags(self) -> int:
+        """
+        Paused/ON states packed into one int (CTRL_* bits), derived from the
+        state fields so routes writing "ON"/"OFF" strings stay the only source.
+        """
+        return (
+            (CTRL_PAUSED if self.paused else 0)
+            | (CTRL_PUMP_ON if self.pump_state == "ON" else 0)
+            | (CTRL_AGITATOR_ON if self.agitator_state == "ON" else 0)
+            | (CTRL_AIR_PUMP_ON if self.air_pump_state == "ON" else 0)
+            | (CTRL_FAN_ON if self.fan_state == "ON" else 0)
+            | (CTRL_HEATER_ON if self.heater_state == "ON" else 0)
+            | (CTRL_HUMIDIFIER_ON if self.humidifier_state == "ON" else 0)
+        )
+
+    def as_dict(self) -> dict:
+        """Shallow plain-dict snapshot for JSON endpoints (atomic w.r.t. bulk writes)."""
+        with self._lock:
+            d = {k: getattr(self, k) for k in _FIELD_NAMES}
+            d.update(self._extra)
+        return d
+
+
+def _default_factory(f):
+    if f.default_factory is not MISSING:
+        return f.default_factory
+    return lambda v=f.default: v
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(StatusData) if not f.name.startswith("_"))
+_FIELD_SET = frozenset(_FIELD_NAMES)
+_DEFAULTS = {f.name: _default_factory(f) for f in fields(StatusData) if not f.name.startswith("_")}
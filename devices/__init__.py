@@ -9,6 +9,7 @@ Public API (compat with current app.py):
 - cleanup_gpio()
 - _ensure_gpio_mode()
 
+- _all_outputs_off()
 - _set_fan(on: bool)
 - _set_heater(on: bool)
 - _set_humidifier(on: bool)
@@ -18,7 +19,7 @@ Public API (compat with current app.py):
 
 Also exports runtime flags (names preserved):
 - fan_configured, pump_configured, heater_configured, humidifier_configured, agitator_configured, air_pump_configured
-- fan_on, heater_on, humidifier_on, agitator_on, air_pump_on
+- fan_on, heater_on, humidifier_on, agitator_on, air_pump_on, nutrient_a_on, nutrient_b_on
 - fan_on_since, heater_on_since
 - fan_trigger_cause
 """
@@ -27,27 +28,81 @@ import os
 os.environ.setdefault("BLINKA_PIN_FACTORY", "RPiGPIO")
 
 from time import monotonic as _mono
-import RPi.GPIO as GPIO
-from gpiozero import Device
-from gpiozero.pins.rpigpio import RPiGPIOFactory
-Device.pin_factory = RPiGPIOFactory()
+from contextlib import suppress
+from collections.abc import Mapping
+from typing import NamedTuple
+from . import _gpio  # pin writes (mmap GPSET0/GPCLR0 when available)
+from ._gpio import GPIO  # RPi.GPIO, or a null backend off-Pi
+from core.status import (
+    CTRL_PUMP_ON, CTRL_AGITATOR_ON, CTRL_AIR_PUMP_ON,
+    CTRL_FAN_ON, CTRL_HEATER_ON, CTRL_HUMIDIFIER_ON,
+)
+if _gpio.HARDWARE:
+    from gpiozero import Device
+    from gpiozero.pins.rpigpio import RPiGPIOFactory
+    Device.pin_factory = RPiGPIOFactory()
+else:
+    print("⚠️ RPi.GPIO unavailable: outputs are tracked but not driven")
 
 # ---- External dependencies (late-bound by init_actuators) -----------------
 _LOGGER = None
-_status_ref = None   # dict or callable returning dict
+# status_data as given to init_actuators: a mapping lands in _status_map (read
+# directly by the setters), a callable in _status_fn (resolved via _status()).
+_status_map = None
+_status_fn = None
 _send_discord = None
 
+def _noop(*args, **kwargs):
+    return None
+
+# Call targets bound by init_actuators (no-ops until then / when not provided)
+_log_event = _noop
+_discord = _noop
+
 def _status():
-    return _status_ref() if callable(_status_ref) else _status_ref
+    """Mapping returned by the status callable, or None if it isn't one."""
+    sd = _status_fn()
+    return sd if isinstance(sd, Mapping) else None
+
+def _no_status(key, default=None):
+    return None
+
+def _status_get():
+    """Bound `get` of the status mapping, or a stand-in returning None."""
+    sd = _status_map if _status_fn is None else _status()
+    return _no_status if sd is None else sd.get
+
+# (payload key, status key) pairs reported with each climate actuator change
+_CLIMATE_PAYLOAD_KEYS = (
+    ("air_temp_c", "temperature_c"),
+    ("air_rh_pct", "humidity"),
+    ("water_temp_c", "water_temperature"),
+    ("reservoir_water_kg", "reservoir_water_kg"),
+)
+_HEATER_PAYLOAD_KEYS = (("trigger", "last_trigger"),) + _CLIMATE_PAYLOAD_KEYS
+
+def _payload(device_name, on, get, keys):
+    payload = {"device_name": device_name, "after_state": "on" if on else "off"}
+    for out_key, sd_key in keys:
+        payload[out_key] = get(sd_key)
+    return payload
 
 def init_actuators(LOGGER, status_data, send_discord_fn):
     """
     Call once from app.py after LOGGER and status_data exist.
+    Setters call LOGGER.log_event and send_discord_fn inline after the pin
+    write, so both must only enqueue (EventLogger ring / alert worker queue).
     """
-    global _LOGGER, _status_ref, _send_discord
+    global _LOGGER, _status_map, _status_fn, _send_discord, _log_event, _discord
     _LOGGER = LOGGER
-    _status_ref = status_data
+    _log_event = LOGGER.log_event if LOGGER is not None else _noop
+    if callable(status_data):
+        _status_map, _status_fn = None, status_data
+    else:
+        _status_map = status_data if isinstance(status_data, Mapping) else None
+        _status_fn = None
     _send_discord = send_discord_fn
+    _discord = send_discord_fn or _noop
 
 # ---- Pins & polarity (identical to current app.py) ------------------------
 FAN_PIN         = 22
@@ -76,10 +131,52 @@ GPIO.setmode(GPIO.BCM)
 def _on_level(active_high: bool):   return GPIO.HIGH if active_high else GPIO.LOW
 def _off_level(active_high: bool):  return GPIO.LOW if active_high else GPIO.HIGH
 
+class _Pin(NamedTuple):
+    """Static metadata of one output (its runtime state stays in the module flags)."""
+    name: str          # flag prefix: <name>_configured / <name>_on
+    pin: int           # BCM number
+    active_high: bool
+    label: str         # for setup warnings
+    on_level: int
+    off_level: int
+
+def _pin(name: str, pin: int, active_high: bool, label: str) -> _Pin:
+    return _Pin(name, pin, active_high, label, _on_level(active_high), _off_level(active_high))
+
+_PINS = (
+    _pin("fan", FAN_PIN, FAN_ACTIVE_HIGH, "FAN_PIN"),
+    _pin("pump", MAIN_PUMP_PIN, PUMP_ACTIVE_HIGH, "MAIN_PUMP_PIN"),
+    _pin("heater", HEATER_PIN, HEATER_ACTIVE_HIGH, "HEATER_PIN"),
+    _pin("humidifier", HUMIDIFIER_PIN, HUMIDIFIER_ACTIVE_HIGH, "HUMIDIFIER_PIN"),
+    _pin("agitator", AGITATOR_PIN, AGITATOR_ACTIVE_HIGH, "AGITATOR_PIN"),
+    _pin("concentrate_mix", CONCENTRATE_MIX_PIN, CONCENTRATE_MIX_ACTIVE_HIGH, "CONCENTRATE_MIX_PIN"),
+    _pin("air_pump", AIR_PUMP_PIN, AIR_PUMP_ACTIVE_HIGH, "AIR_PUMP_PIN"),
+    _pin("nutrient_a", NUTRIENT_A_PIN, NUTRIENT_ACTIVE_HIGH, "NUTRIENT_A_PIN"),
+    _pin("nutrient_b", NUTRIENT_B_PIN, NUTRIENT_ACTIVE_HIGH, "NUTRIENT_B_PIN"),
+)
+# Per-pin drive levels, resolved once (setup, _all_outputs_off, relay factory)
+_ON_LEVEL = {p.pin: p.on_level for p in _PINS}
+_OFF_LEVEL = {p.pin: p.off_level for p in _PINS}
+# ...and as plain constants for the hand-written setters (no dict lookup per write)
+_FAN_ON_LVL, _FAN_OFF_LVL = _ON_LEVEL[FAN_PIN], _OFF_LEVEL[FAN_PIN]
+_HEATER_ON_LVL, _HEATER_OFF_LVL = _ON_LEVEL[HEATER_PIN], _OFF_LEVEL[HEATER_PIN]
+_HUMIDIFIER_ON_LVL, _HUMIDIFIER_OFF_LVL = _ON_LEVEL[HUMIDIFIER_PIN], _OFF_LEVEL[HUMIDIFIER_PIN]
+_CONCENTRATE_MIX_ON_LVL, _CONCENTRATE_MIX_OFF_LVL = _ON_LEVEL[CONCENTRATE_MIX_PIN], _OFF_LEVEL[CONCENTRATE_MIX_PIN]
+_NUTRIENT_A_ON_LVL, _NUTRIENT_A_OFF_LVL = _ON_LEVEL[NUTRIENT_A_PIN], _OFF_LEVEL[NUTRIENT_A_PIN]
+_NUTRIENT_B_ON_LVL, _NUTRIENT_B_OFF_LVL = _ON_LEVEL[NUTRIENT_B_PIN], _OFF_LEVEL[NUTRIENT_B_PIN]
+
+# RPi.GPIO mode is process-global and was set above; only GPIO.cleanup() clears
+# it, so _ensure_gpio_mode() is for routes/shutdown after a cleanup, not setters.
+_GPIO_MODE_SET = True
+
 def _ensure_gpio_mode():
+    global _GPIO_MODE_SET
+    if _GPIO_MODE_SET:
+        return
     if GPIO.getmode() is None:
         GPIO.setwarnings(False)
         GPIO.setmode(GPIO.BCM)
+    _GPIO_MODE_SET = True
 
 # ---- Configured flags (names preserved) -----------------------------------
 fan_configured = pump_configured = heater_configured = humidifier_configured = False
@@ -93,261 +190,209 @@ fan_on = heater_on = humidifier_on = False
 agitator_on = False
 concentrate_mix_on = False
 air_pump_on = False
+nutrient_a_on = nutrient_b_on = False
 
 fan_trigger_cause = None  # "temperature" | "humidity" | None
 
+# Bumped by the status-driven setters whenever a tracked ON flag flips
+_outputs_version = 0
+
 # Anti short-cycle timers
 fan_on_since = None
 heater_on_since = None
 humidifier_on_since = None
 
-# ---- Hardware setup (unchanged) ------------------------------------------
-try:
-    GPIO.setup(FAN_PIN, GPIO.OUT, initial=_off_level(FAN_ACTIVE_HIGH))
-    fan_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup FAN_PIN: {e}")
-
-try:
-    GPIO.setup(MAIN_PUMP_PIN, GPIO.OUT, initial=_off_level(PUMP_ACTIVE_HIGH))
-    pump_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup MAIN_PUMP_PIN: {e}")
-
-try:
-    GPIO.setup(HEATER_PIN, GPIO.OUT, initial=_off_level(HEATER_ACTIVE_HIGH))
-    heater_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup HEATER_PIN: {e}")
-
-try:
-    GPIO.setup(HUMIDIFIER_PIN, GPIO.OUT, initial=_off_level(HUMIDIFIER_ACTIVE_HIGH))
-    humidifier_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup HUMIDIFIER_PIN: {e}")
-
-try:
-    GPIO.setup(AGITATOR_PIN, GPIO.OUT, initial=_off_level(AGITATOR_ACTIVE_HIGH))
-    agitator_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup AGITATOR_PIN: {e}")
-
-try:
-    GPIO.setup(CONCENTRATE_MIX_PIN, GPIO.OUT, initial=_off_level(CONCENTRATE_MIX_ACTIVE_HIGH))
-    concentrate_mix_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup CONCENTRATE_MIX_PIN: {e}")
-
-try:
-    GPIO.setup(AIR_PUMP_PIN, GPIO.OUT, initial=_off_level(AIR_PUMP_ACTIVE_HIGH))
-    air_pump_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup AIR_PUMP_PIN: {e}")
-    
-try:
-    GPIO.setup(NUTRIENT_A_PIN, GPIO.OUT, initial=_off_level(NUTRIENT_ACTIVE_HIGH))
-    nutrient_a_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup NUTRIENT_A_PIN: {e}")
-
-try:
-    GPIO.setup(NUTRIENT_B_PIN, GPIO.OUT, initial=_off_level(NUTRIENT_ACTIVE_HIGH))
-    nutrient_b_configured = True
-except Exception as e:
-    print(f"⚠️ Failed to setup NUTRIENT_B_PIN: {e}")
-
-
-
-
-
+# ---- Hardware setup ------------------------------------------------------
+# Each output is set up OFF; a pin whose setup fails stays unconfigured.
+_CONFIGURED_MASK = 0  # 1 << pin for every output whose setup succeeded
+for _p in _PINS:
+    try:
+        GPIO.setup(_p.pin, GPIO.OUT, initial=_p.off_level)
+        globals()[_p.name + "_configured"] = True
+        _CONFIGURED_MASK |= 1 << _p.pin
+    except Exception as e:
+        print(f"⚠️ Failed to setup {_p.label}: {e}")
+
+# OFF for every output as one GPSET0 mask (active-low pins) + one GPCLR0 mask (active-high)
+_OFF_SET_MASK = _OFF_CLR_MASK = 0
+for _p in _PINS:
+    if _p.active_high:
+        _OFF_CLR_MASK |= 1 << _p.pin
+    else:
+        _OFF_SET_MASK |= 1 << _p.pin
+del _p
 
 
 # ---- Device setters (unchanged behaviour + structured logs) --------------
-def _set_fan(on: bool, *, log: bool = True, notify: bool = True):
-    global fan_on, fan_on_since, fan_trigger_cause
+def _set_fan(on: bool, *, log: bool = True, notify: bool = True, write: bool = True,
+             min_on_s: float = 0):
+    """
+    Switch the extractor fan; returns the resulting state. With min_on_s
+    (opt-in, used by the rule engine) an OFF request arriving before the fan
+    has run that long is refused and the fan stays ON. Safety paths
+    (_all_outputs_off, cleanup) don't pass it.
+    """
+    global fan_on, fan_on_since, fan_trigger_cause, _outputs_version
     if not fan_configured or on == fan_on:
-        return
-    GPIO.output(FAN_PIN, _on_level(FAN_ACTIVE_HIGH) if on else _off_level(FAN_ACTIVE_HIGH))
-    if on and not fan_on:
-        fan_on_since = _mono()
-    if not on:
-        fan_on_since = None
+        return on
+    if not on and min_on_s and fan_on_since is not None and _mono() - fan_on_since < min_on_s:
+        return True
+    if write:
+        _gpio.output(FAN_PIN, _FAN_ON_LVL if on else _FAN_OFF_LVL)
+    fan_on_since = _mono() if on else None  # guard above: this is a real transition
     fan_on = on
+    _outputs_version += 1
 
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "actuator_change",
-                    msg=f"Extractor fan {'ON' if fan_on else 'OFF'}",
-                    reason_code=(
-                        "humidity_high"
-                        if (fan_trigger_cause == "humidity")
-                        else ("temp_high" if fan_on else "hysteresis_clear")
-                    ),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="rule_engine",
-                    payload={
-                        "device_name": "<extractor fan>",
-                        "after_state": ("on" if on else "off"),
-                        "air_temp_c": sd.get("temperature_c") if isinstance(sd, dict) else None,
-                        "air_rh_pct": sd.get("humidity") if isinstance(sd, dict) else None,
-                        "water_temp_c": sd.get("water_temperature") if isinstance(sd, dict) else None,
-                        "reservoir_water_kg": sd.get("reservoir_water_kg") if isinstance(sd, dict) else None,
-                    },
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "actuator_change",
+                msg=f"Extractor fan {'ON' if fan_on else 'OFF'}",
+                reason_code=(
+                    "humidity_high"
+                    if (fan_trigger_cause == "humidity")
+                    else ("temp_high" if fan_on else "hysteresis_clear")
+                ),
+                profile_id=get("profile"),
+                actor="rule_engine",
+                payload=_payload("<extractor fan>", on, get, _CLIMATE_PAYLOAD_KEYS),
+            )
 
     if notify:
-        try:
-            if _send_discord:
-                if fan_on:
-                    cause = fan_trigger_cause or "temperature"
-                    if cause == "humidity":
-                        _send_discord("Feels like a rainforest in here… Extracting moisture: **Extractor Fan: ON**")
-                    else:
-                        _send_discord("Good heavens it's warm… Exchanging some air: **Extractor Fan: ON**")
+        with suppress(Exception):
+            if fan_on:
+                cause = fan_trigger_cause or "temperature"
+                if cause == "humidity":
+                    _discord("Feels like a rainforest in here… Extracting moisture: **Extractor Fan: ON**")
+                else:
+                    _discord("Good heavens it's warm… Exchanging some air: **Extractor Fan: ON**")
             fan_trigger_cause = None
-        except Exception:
-            pass
+    return on
 
 
-def _set_heater(on: bool, *, log: bool = True, notify: bool = True):
-    global heater_on, heater_on_since
+def _set_heater(on: bool, *, log: bool = True, notify: bool = True, write: bool = True,
+                min_on_s: float = 0):
+    global heater_on, heater_on_since, _outputs_version
     if not heater_configured or on == heater_on:
-        return
-    GPIO.output(HEATER_PIN, _on_level(HEATER_ACTIVE_HIGH) if on else _off_level(HEATER_ACTIVE_HIGH))
-    if on and not heater_on:
-        heater_on_since = _mono()
-    if not on:
-        heater_on_since = None
+        return on
+    if not on and min_on_s and heater_on_since is not None and _mono() - heater_on_since < min_on_s:
+        return True
+    if write:
+        _gpio.output(HEATER_PIN, _HEATER_ON_LVL if on else _HEATER_OFF_LVL)
+    heater_on_since = _mono() if on else None
     heater_on = on
+    _outputs_version += 1
 
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "actuator_change",
-                    msg=f"Heater {'ON' if heater_on else 'OFF'}",
-                    reason_code=("temp_below_min" if heater_on else "hysteresis_clear"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="rule_engine",
-                    payload={
-                        "device_name": "<heater>",
-                        "after_state": ("on" if on else "off"),
-                        "trigger": sd.get("last_trigger") if isinstance(sd, dict) else None,
-                        "air_temp_c": sd.get("temperature_c") if isinstance(sd, dict) else None,
-                        "air_rh_pct": sd.get("humidity") if isinstance(sd, dict) else None,
-                        "water_temp_c": sd.get("water_temperature") if isinstance(sd, dict) else None,
-                        "reservoir_water_kg": sd.get("reservoir_water_kg") if isinstance(sd, dict) else None,
-                    },
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "actuator_change",
+                msg=f"Heater {'ON' if heater_on else 'OFF'}",
+                reason_code=("temp_below_min" if heater_on else "hysteresis_clear"),
+                profile_id=get("profile"),
+                actor="rule_engine",
+                payload=_payload("<heater>", on, get, _HEATER_PAYLOAD_KEYS),
+            )
 
     if notify:
-        try:
-            if _send_discord and heater_on:
-                _send_discord("Brrr. It's a little chilly...️ Adding some heat: **Heater: ON**")
-        except Exception:
-            pass
+        with suppress(Exception):
+            if heater_on:
+                _discord("Brrr. It's a little chilly...️ Adding some heat: **Heater: ON**")
+    return on
 
 
-def _set_humidifier(on: bool, *, log: bool = True, notify: bool = True):
-    global humidifier_on, humidifier_on_since
+def _set_humidifier(on: bool, *, log: bool = True, notify: bool = True, write: bool = True,
+                    min_on_s: float = 0):
+    global humidifier_on, humidifier_on_since, _outputs_version
     if not humidifier_configured or on == humidifier_on:
-        return
-    GPIO.output(HUMIDIFIER_PIN, _on_level(HUMIDIFIER_ACTIVE_HIGH) if on else _off_level(HUMIDIFIER_ACTIVE_HIGH))
-    if on and not humidifier_on:
-        humidifier_on_since = _mono()
-    if not on:
-        humidifier_on_since = None
+        return on
+    if not on and min_on_s and humidifier_on_since is not None and _mono() - humidifier_on_since < min_on_s:
+        return True
+    if write:
+        _gpio.output(HUMIDIFIER_PIN, _HUMIDIFIER_ON_LVL if on else _HUMIDIFIER_OFF_LVL)
+    humidifier_on_since = _mono() if on else None
     humidifier_on = on
+    _outputs_version += 1
 
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "actuator_change",
-                    msg=f"Humidifier {'ON' if humidifier_on else 'OFF'}",
-                    reason_code=("humidity_below_min" if humidifier_on else "hysteresis_clear"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="rule_engine",
-                    payload={
-                        "device_name": "<humidifier>",
-                        "after_state": ("on" if on else "off"),
-                        "air_temp_c": sd.get("temperature_c") if isinstance(sd, dict) else None,
-                        "air_rh_pct": sd.get("humidity") if isinstance(sd, dict) else None,
-                        "water_temp_c": sd.get("water_temperature") if isinstance(sd, dict) else None,
-                        "reservoir_water_kg": sd.get("reservoir_water_kg") if isinstance(sd, dict) else None,
-                    },
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "actuator_change",
+                msg=f"Humidifier {'ON' if humidifier_on else 'OFF'}",
+                reason_code=("humidity_below_min" if humidifier_on else "hysteresis_clear"),
+                profile_id=get("profile"),
+                actor="rule_engine",
+                payload=_payload("<humidifier>", on, get, _CLIMATE_PAYLOAD_KEYS),
+            )
 
     if notify:
-        try:
-            if _send_discord and humidifier_on:
-                _send_discord("Paahh. It's dry in here...️ Adding some humidity: **Humidifier: ON**")
-        except Exception:
-            pass
-
-
-def _set_agitator(on: bool, *, log: bool = True, notify: bool = True):
-    global agitator_on
-    if not agitator_configured or on == agitator_on:
-        return
-    GPIO.output(AGITATOR_PIN, _on_level(AGITATOR_ACTIVE_HIGH) if on else _off_level(AGITATOR_ACTIVE_HIGH))
-    agitator_on = on
-
-    if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "irrigation_cycle",
-                    msg=f"Agitator {'ON' if on else 'OFF'}",
-                    reason_code=("premix" if on else "premix_end"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="scheduler",
-                )
-        except Exception:
-            pass
-
+        with suppress(Exception):
+            if humidifier_on:
+                _discord("Paahh. It's dry in here...️ Adding some humidity: **Humidifier: ON**")
+    return on
 
-def _set_air_pump(on: bool, *, log: bool = True, notify: bool = True):
-    global air_pump_on
-    if not air_pump_configured or on == air_pump_on:
-        return
-    GPIO.output(AIR_PUMP_PIN, _on_level(AIR_PUMP_ACTIVE_HIGH) if on else _off_level(AIR_PUMP_ACTIVE_HIGH))
-    air_pump_on = on
 
-    if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
+def _make_relay_setter(name: str, label: str, pin: int, reason_on: str, reason_off: str,
+                       *, mirror_status: bool = False):
+    """
+    Build the setter for a scheduler-driven relay. State stays in the module
+    flags `<name>_on` / `<name>_configured` (read by app.py); pin, levels and
+    log strings are bound once here instead of looked up on every call.
+    mirror_status also writes `<name>_state` to status_data and clears the
+    phase countdown on OFF.
+    """
+    g = globals()
+    flag_key, configured_key = name + "_on", name + "_configured"
+    on_level, off_level = _ON_LEVEL[pin], _OFF_LEVEL[pin]
+    msg_on, msg_off = f"{label} ON", f"{label} OFF"
+    state_key = name + "_state"
+    end_key, rem_key = name + "_phase_end_ts", name + "_time_remaining_s"
+
+    def setter(on: bool, *, log: bool = True, notify: bool = True, write: bool = True):
+        global _outputs_version
+        if not g[configured_key] or on == g[flag_key]:
+            return
+        if write:
+            _gpio.output(pin, on_level if on else off_level)
+        g[flag_key] = on
+        _outputs_version += 1
+
+        if log:
+            with suppress(Exception):
+                _log_event(
                     "irrigation_cycle",
-                    msg=f"Air pump {'ON' if on else 'OFF'}",
-                    reason_code=("premix" if on else "premix_end"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
+                    msg=msg_on if on else msg_off,
+                    reason_code=reason_on if on else reason_off,
+                    profile_id=_status_get()("profile"),
                     actor="scheduler",
                 )
-        except Exception:
-            pass
-    try:
-        sd = _status()
-        if isinstance(sd, dict):
-            sd["air_pump_state"] = "ON" if on else "OFF"
-            if not on:
-                sd["air_pump_phase_end_ts"] = None
-                sd["air_pump_time_remaining_s"] = None
-    except Exception:
-        pass
+        if mirror_status:
+            # Most callers stamp the same fields themselves; only write what differs
+            try:
+                sd = _status_map if _status_fn is None else _status()
+                if sd is not None:
+                    get = sd.get
+                    state = "ON" if on else "OFF"
+                    if get(state_key) != state:
+                        sd[state_key] = state
+                    if not on:
+                        if get(end_key) is not None:
+                            sd[end_key] = None
+                        if get(rem_key) is not None:
+                            sd[rem_key] = None
+            except Exception:
+                pass
+
+    setter.__name__ = setter.__qualname__ = "_set_" + name
+    return setter
+
+
+_set_agitator = _make_relay_setter("agitator", "Agitator", AGITATOR_PIN, "premix", "premix_end")
+_set_air_pump = _make_relay_setter("air_pump", "Air pump", AIR_PUMP_PIN, "premix", "premix_end",
+                                   mirror_status=True)
 
 
 def _set_concentrate_mix(on: bool, *, log: bool = True, notify: bool = True):
@@ -356,45 +401,40 @@ def _set_concentrate_mix(on: bool, *, log: bool = True, notify: bool = True):
     if not concentrate_mix_configured or on == concentrate_mix_on:
         return
 
-    _ensure_gpio_mode()
-    GPIO.output(
-        CONCENTRATE_MIX_PIN,
-        _on_level(CONCENTRATE_MIX_ACTIVE_HIGH) if on else _off_level(CONCENTRATE_MIX_ACTIVE_HIGH),
-    )
+    _gpio.output(CONCENTRATE_MIX_PIN, _CONCENTRATE_MIX_ON_LVL if on else _CONCENTRATE_MIX_OFF_LVL)
     concentrate_mix_on = on
 
     try:
-        sd = _status()
-        if isinstance(sd, dict):
+        sd = _status_map if _status_fn is None else _status()
+        if sd is not None:
             sd["concentrate_mix_state"] = "ON" if on else "OFF"
     except Exception:
         pass
 
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "reservoir_mix",
-                    msg=f"Concentrate mix relay {'ON' if on else 'OFF'}",
-                    reason_code=("mix" if on else "mix_end"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="wizard",
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "reservoir_mix",
+                msg=f"Concentrate mix relay {'ON' if on else 'OFF'}",
+                reason_code=("mix" if on else "mix_end"),
+                profile_id=get("profile"),
+                actor="wizard",
+            )
 
 
 def _set_nutrient_a(on: bool, *, log: bool = True, notify: bool = True):
-    if not nutrient_a_configured:
+    global nutrient_a_on
+    on = bool(on)
+    if not nutrient_a_configured or on == nutrient_a_on:
         return
-    _ensure_gpio_mode()
-    GPIO.output(NUTRIENT_A_PIN, _on_level(NUTRIENT_ACTIVE_HIGH) if on else _off_level(NUTRIENT_ACTIVE_HIGH))
+    _gpio.output(NUTRIENT_A_PIN, _NUTRIENT_A_ON_LVL if on else _NUTRIENT_A_OFF_LVL)
+    nutrient_a_on = on
 
     # --- NEW: reflect in shared status_data
     try:
-        sd = _status()
-        if isinstance(sd, dict):
+        sd = _status_map if _status_fn is None else _status()
+        if sd is not None:
             sd["nutrient_A_on"] = bool(on)
             if on:
                 sd["dosing_phase"] = "A"
@@ -410,31 +450,30 @@ def _set_nutrient_a(on: bool, *, log: bool = True, notify: bool = True):
 
     # Optional: structured log (unchanged)
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                (_LOGGER.log_event)(
-                    "actuator_change",
-                    msg=f"Nutrient pump A {'ON' if on else 'OFF'}",
-                    reason_code="nutrient_a_toggle",
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="wizard_or_calibration",
-                    payload={"device_name": "nutrient_pump_a", "after_state": ("on" if on else "off")},
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "actuator_change",
+                msg=f"Nutrient pump A {'ON' if on else 'OFF'}",
+                reason_code="nutrient_a_toggle",
+                profile_id=get("profile"),
+                actor="wizard_or_calibration",
+                payload={"device_name": "nutrient_pump_a", "after_state": ("on" if on else "off")},
+            )
 
 
 def _set_nutrient_b(on: bool, *, log: bool = True, notify: bool = True):
-    if not nutrient_b_configured:
+    global nutrient_b_on
+    on = bool(on)
+    if not nutrient_b_configured or on == nutrient_b_on:
         return
-    _ensure_gpio_mode()
-    GPIO.output(NUTRIENT_B_PIN, _on_level(NUTRIENT_ACTIVE_HIGH) if on else _off_level(NUTRIENT_ACTIVE_HIGH))
+    _gpio.output(NUTRIENT_B_PIN, _NUTRIENT_B_ON_LVL if on else _NUTRIENT_B_OFF_LVL)
+    nutrient_b_on = on
 
     # --- NEW: reflect in shared status_data
     try:
-        sd = _status()
-        if isinstance(sd, dict):
+        sd = _status_map if _status_fn is None else _status()
+        if sd is not None:
             sd["nutrient_B_on"] = bool(on)
             if on:
                 sd["dosing_phase"] = "B"
@@ -449,19 +488,16 @@ def _set_nutrient_b(on: bool, *, log: bool = True, notify: bool = True):
 
     # Optional: structured log (unchanged)
     if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                (_LOGGER.log_event)(
-                    "actuator_change",
-                    msg=f"Nutrient pump B {'ON' if on else 'OFF'}",
-                    reason_code="nutrient_b_toggle",
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="wizard_or_calibration",
-                    payload={"device_name": "nutrient_pump_b", "after_state": ("on" if on else "off")},
-                )
-        except Exception:
-            pass
+        with suppress(Exception):
+            get = _status_get()
+            _log_event(
+                "actuator_change",
+                msg=f"Nutrient pump B {'ON' if on else 'OFF'}",
+                reason_code="nutrient_b_toggle",
+                profile_id=get("profile"),
+                actor="wizard_or_calibration",
+                payload={"device_name": "nutrient_pump_b", "after_state": ("on" if on else "off")},
+            )
 
 
 
@@ -473,71 +509,128 @@ def _set_nutrient_b(on: bool, *, log: bool = True, notify: bool = True):
 
 pump_on = False  # track state for idempotence
 
-def _set_main_pump(on: bool, *, log: bool = True, notify: bool = True):
-    global pump_on
-    if not pump_configured or on == pump_on:
-        return
-    GPIO.output(MAIN_PUMP_PIN, _on_level(PUMP_ACTIVE_HIGH) if on else _off_level(PUMP_ACTIVE_HIGH))
-    pump_on = on
-    
-    if log:
-        try:
-            if _LOGGER is not None:
-                sd = _status()
-                _LOGGER.log_event(
-                    "irrigation_cycle",
-                    msg=f"Main irrigation pump {'ON' if on else 'OFF'}",
-                    reason_code=("cycle_start" if on else "cycle_end"),
-                    profile_id=sd.get("profile") if isinstance(sd, dict) else None,
-                    actor="scheduler",
-                )
-        except Exception:
-            pass
+_set_main_pump = _make_relay_setter("pump", "Main irrigation pump", MAIN_PUMP_PIN, "cycle_start", "cycle_end")
 
 
+def _all_outputs_off(*, log: bool = True, notify: bool = True):
+    """
+    Safety OFF for pump, premix and climate outputs: one GPIO.output(list, list)
+    write for every energised pin, then each setter (write=False) for its
+    flag/log/status bookkeeping. No-op when everything is already off.
+    """
+    outs = (
+        (pump_configured and pump_on, MAIN_PUMP_PIN, PUMP_ACTIVE_HIGH, _set_main_pump),
+        (agitator_configured and agitator_on, AGITATOR_PIN, AGITATOR_ACTIVE_HIGH, _set_agitator),
+        (air_pump_configured and air_pump_on, AIR_PUMP_PIN, AIR_PUMP_ACTIVE_HIGH, _set_air_pump),
+        (fan_configured and fan_on, FAN_PIN, FAN_ACTIVE_HIGH, _set_fan),
+        (heater_configured and heater_on, HEATER_PIN, HEATER_ACTIVE_HIGH, _set_heater),
+        (humidifier_configured and humidifier_on, HUMIDIFIER_PIN, HUMIDIFIER_ACTIVE_HIGH, _set_humidifier),
+    )
+    live = [o for o in outs if o[0]]
+    if not live:
+        return
+    _ensure_gpio_mode()
+    _gpio.output([o[1] for o in live], [_OFF_LEVEL[o[1]] for o in live])
+    for _, _, _, setter in live:
+        setter(False, log=log, notify=notify, write=False)
 
 
+# ---- Sync + cleanup -------------------------------------------------------
+def _output_flags() -> int:
+    """Tracked ON flags of the relay outputs as CTRL_* bits (same layout as StatusData.ctrl_flags)."""
+    return (
+        (CTRL_PUMP_ON if pump_on else 0)
+        | (CTRL_AGITATOR_ON if agitator_on else 0)
+        | (CTRL_AIR_PUMP_ON if air_pump_on else 0)
+        | (CTRL_FAN_ON if fan_on else 0)
+        | (CTRL_HEATER_ON if heater_on else 0)
+        | (CTRL_HUMIDIFIER_ON if humidifier_on else 0)
+    )
 
+def _configured_flags() -> int:
+    return (
+        (CTRL_PUMP_ON if pump_configured else 0)
+        | (CTRL_AGITATOR_ON if agitator_configured else 0)
+        | (CTRL_AIR_PUMP_ON if air_pump_configured else 0)
+        | (CTRL_FAN_ON if fan_configured else 0)
+        | (CTRL_HEATER_ON if heater_configured else 0)
+        | (CTRL_HUMIDIFIER_ON if humidifier_configured else 0)
+    )
 
+# (bit, status key, pin mask, polarity, setter) for the outputs status_data drives
+_STATUS_OUTPUTS = (
+    (CTRL_PUMP_ON, "pump_state", 1 << MAIN_PUMP_PIN, PUMP_ACTIVE_HIGH, _set_main_pump),
+    (CTRL_FAN_ON, "fan_state", 1 << FAN_PIN, FAN_ACTIVE_HIGH, _set_fan),
+    (CTRL_HEATER_ON, "heater_state", 1 << HEATER_PIN, HEATER_ACTIVE_HIGH, _set_heater),
+    (CTRL_HUMIDIFIER_ON, "humidifier_state", 1 << HUMIDIFIER_PIN, HUMIDIFIER_ACTIVE_HIGH, _set_humidifier),
+    (CTRL_AGITATOR_ON, "agitator_state", 1 << AGITATOR_PIN, AGITATOR_ACTIVE_HIGH, _set_agitator),
+    (CTRL_AIR_PUMP_ON, "air_pump_state", 1 << AIR_PUMP_PIN, AIR_PUMP_ACTIVE_HIGH, _set_air_pump),
+)
+ALL_PIN_MASK = 0
+for _o in _STATUS_OUTPUTS:
+    ALL_PIN_MASK |= _o[2]
+del _o
+
+_applied_key = None  # (wanted bits, _outputs_version) of the last completed sync
 
-# ---- Sync + cleanup -------------------------------------------------------
 def apply_outputs_from_status():
+    """
+    Drive the outputs to the "ON"/"OFF" states in status_data. The wanted and
+    tracked states are diffed as CTRL_* bitmasks (XOR) and only the differing
+    pins are folded into set/clear masks, written as one GPSET0 + one GPCLR0
+    store (_gpio.write_masks); each setter
+    (write=False, silent) then updates its flag, so later setter calls keep
+    skipping redundant writes against the real pin state. A repeat call with
+    the same wanted bits and no setter activity since returns straight away.
+    """
+    global _applied_key
     try:
-        sd = _status()
-        if not isinstance(sd, dict):
+        sd = _status_map if _status_fn is None else _status()
+        if sd is None:
             return
-        if pump_configured:
-            GPIO.output(MAIN_PUMP_PIN, _on_level(PUMP_ACTIVE_HIGH) if str(sd.get("pump_state")) == "ON" else _off_level(PUMP_ACTIVE_HIGH))
-        if fan_configured:
-            GPIO.output(FAN_PIN, _on_level(FAN_ACTIVE_HIGH) if str(sd.get("fan_state")) == "ON" else _off_level(FAN_ACTIVE_HIGH))
-        if heater_configured:
-            GPIO.output(HEATER_PIN, _on_level(HEATER_ACTIVE_HIGH) if str(sd.get("heater_state")) == "ON" else _off_level(HEATER_ACTIVE_HIGH))
-        if humidifier_configured:
-            GPIO.output(HUMIDIFIER_PIN, _on_level(HUMIDIFIER_ACTIVE_HIGH) if str(sd.get("humidifier_state")) == "ON" else _off_level(HUMIDIFIER_ACTIVE_HIGH))
-        if agitator_configured:
-            GPIO.output(AGITATOR_PIN, _on_level(AGITATOR_ACTIVE_HIGH) if str(sd.get("agitator_state")) == "ON" else _off_level(AGITATOR_ACTIVE_HIGH))
-        if air_pump_configured:
-            GPIO.output(AIR_PUMP_PIN, _on_level(AIR_PUMP_ACTIVE_HIGH) if str(sd.get("air_pump_state")) == "ON" else _off_level(AIR_PUMP_ACTIVE_HIGH))
+        want = getattr(sd, "ctrl_flags", None)
+        if want is None:  # plain mapping: derive the same bits from the strings
+            want = 0
+            for bit, key, _, _, _ in _STATUS_OUTPUTS:
+                if sd.get(key) == "ON":
+                    want |= bit
+        if (want, _outputs_version) == _applied_key:
+            return
+        dirty = (want ^ _output_flags()) & _configured_flags()
+        if not dirty:
+            _applied_key = (want, _outputs_version)
+            return
+        outs = [o for o in _STATUS_OUTPUTS if o[0] & dirty]
+        set_mask = clr_mask = 0
+        for bit, _, pin_mask, active_high, _ in outs:
+            if bool(want & bit) == active_high:
+                set_mask |= pin_mask
+            else:
+                clr_mask |= pin_mask
+        _ensure_gpio_mode()
+        _gpio.write_masks(set_mask, clr_mask)
+        for bit, _, _, _, setter in outs:
+            setter(bool(want & bit), log=False, notify=False, write=False)
+        _applied_key = (want, _outputs_version)
     except Exception:
         pass
 
 def cleanup_gpio():
+    global _GPIO_MODE_SET, pump_on, fan_on, heater_on, humidifier_on, agitator_on, air_pump_on, _outputs_version
+    global concentrate_mix_on, nutrient_a_on, nutrient_b_on
     try:
-        if fan_configured: GPIO.output(FAN_PIN, _off_level(FAN_ACTIVE_HIGH))
-        if pump_configured: GPIO.output(MAIN_PUMP_PIN, _off_level(PUMP_ACTIVE_HIGH))
-        if heater_configured: GPIO.output(HEATER_PIN, _off_level(HEATER_ACTIVE_HIGH))
-        if humidifier_configured: GPIO.output(HUMIDIFIER_PIN, _off_level(HUMIDIFIER_ACTIVE_HIGH))
-        if agitator_configured: GPIO.output(AGITATOR_PIN, _off_level(AGITATOR_ACTIVE_HIGH))
-        if air_pump_configured: GPIO.output(AIR_PUMP_PIN, _off_level(AIR_PUMP_ACTIVE_HIGH))
-        if nutrient_a_configured: GPIO.output(NUTRIENT_A_PIN, _off_level(NUTRIENT_ACTIVE_HIGH))
-        if nutrient_b_configured: GPIO.output(NUTRIENT_B_PIN, _off_level(NUTRIENT_ACTIVE_HIGH))
-
+        _gpio.write_masks(_OFF_SET_MASK & _CONFIGURED_MASK, _OFF_CLR_MASK & _CONFIGURED_MASK)
     except Exception:
         pass
     try:
         GPIO.cleanup()
     except Exception:
         pass
+    _GPIO_MODE_SET = False
+    # Pins were driven OFF above; keep the no-op checks in the setters truthful
+    pump_on = fan_on = heater_on = humidifier_on = agitator_on = air_pump_on = False
+    concentrate_mix_on = nutrient_a_on = nutrient_b_on = False
+    _outputs_version += 1
 
 
 
@@ -0,0 +1,117 @@
+# devices/_gpio.py
+"""
+Output writes straight to the BCM2835/6/7 / BCM2711 GPIO block via /dev/gpiomem:
+a 32-bit store to GPSET0/GPCLR0 instead of an RPi.GPIO.output() round trip per pin
+(what pigpio/rppal do internally).
+
+Pin setup/mode stays with RPi.GPIO. Anything this shim can't map (Pi 5/RP1,
+no /dev/gpiomem, not a Pi) falls back to RPi.GPIO.output(), so callers don't care.
+Pin numbers are BCM, matching GPIO.setmode(GPIO.BCM).
+
+Off-Pi (RPi.GPIO missing, or refusing to load) `GPIO` is a null backend that
+accepts every call and drives nothing, so the package still imports.
+"""
+import mmap
+import os
+import struct
+
+
+class _NullGPIO:
+    """Stand-in for the RPi.GPIO module calls the devices package makes."""
+    BCM, BOARD = 11, 10
+    OUT, IN = 0, 1
+    HIGH, LOW = 1, 0
+
+    def __init__(self):
+        self._mode = None
+
+    def setwarnings(self, flag):
+        pass
+
+    def setmode(self, mode):
+        self._mode = mode
+
+    def getmode(self):
+        return self._mode
+
+    def setup(self, channel, direction, initial=None, **kw):
+        pass
+
+    def output(self, channel, value):
+        pass
+
+    def cleanup(self, *channels):
+        self._mode = None
+
+
+try:
+    import RPi.GPIO as GPIO
+    HARDWARE = True
+except (ImportError, RuntimeError):  # RPi.GPIO raises RuntimeError on non-Pi boards
+    GPIO = _NullGPIO()
+    HARDWARE = False
+
+_GPSET0 = 0x1C
+_GPCLR0 = 0x28
+_SUPPORTED_SOCS = (b"brcm,bcm2835", b"brcm,bcm2836", b"brcm,bcm2837", b"brcm,bcm2711")
+
+
+def _map_gpiomem():
+    try:
+        with open("/proc/device-tree/compatible", "rb") as f:
+            compat = f.read()
+    except OSError:
+        return None
+    if not any(soc in compat for soc in _SUPPORTED_SOCS):
+        return None
+    try:
+        fd = os.open("/dev/gpiomem", os.O_RDWR | os.O_SYNC)
+    except OSError:
+        return None
+    try:
+        return mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+    except (OSError, ValueError):
+        return None
+    finally:
+        os.close(fd)  # the mapping stays valid after the fd is closed
+
+
+_MM = _map_gpiomem() if HARDWARE else None
+_pack_into = struct.Struct("<I").pack_into
+MMAP_ACTIVE = _MM is not None
+
+
+def write_masks(set_mask: int, clr_mask: int):
+    """Drive every bit in set_mask high and every bit in clr_mask low (bank 0, pins 0-31)."""
+    if _MM is None:
+        pins, levels = [], []
+        for pin in range(32):
+            bit = 1 << pin
+            if set_mask & bit:
+                pins.append(pin); levels.append(GPIO.HIGH)
+            elif clr_mask & bit:
+                pins.append(pin); levels.append(GPIO.LOW)
+        if pins:
+            GPIO.output(pins, levels)
+        return
+    if set_mask:
+        _pack_into(_MM, _GPSET0, set_mask)
+    if clr_mask:
+        _pack_into(_MM, _GPCLR0, clr_mask)
+
+
+def output(pins, levels):
+    """Drop-in for GPIO.output(pin, level) / GPIO.output([pins], [levels])."""
+    if _MM is None:
+        GPIO.output(pins, levels)
+        return
+    if isinstance(pins, int):
+        _pack_into(_MM, _GPSET0 if levels else _GPCLR0, 1 << pins)
+        return
+    set_mask = clr_mask = 0
+    for pin, level in zip(pins, levels):
+        if level:
+            set_mask |= 1 << pin
+        else:
+            clr_mask |= 1 << pin
+    write_masks(set_mask, clr_mask)
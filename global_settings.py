@@ -2,11 +2,19 @@
 # global_settings.py
 import os, json
 import tempfile, os, json, threading, shutil, time  # ensure tempfile, threading, shutil, time imported
+import hashlib
+from types import MappingProxyType
 
 _LOCK = threading.RLock()
 _CACHE = None           # last loaded dict
 _CACHE_VERSION = 0
 _CACHE_LOADED_TS = 0.0
+_CACHE_MTIME_NS = None  # st_mtime_ns of GLOBALS_PATH when _CACHE was (re)built
+_CACHE_VIEW = None      # (_CACHE object, MappingProxyType over it)
+_LAST_WRITE_SHA = None  # sha256 of the payload we last wrote (skip identical re-saves)
+
+# Rotating backups: global_settings.backup.0.json (newest) .. .{N-1}.json; 0 disables
+BACKUP_KEEP = 5
 
 # Where the settings live on disk (create the folder if it doesn't exist)
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), "config")
@@ -114,8 +122,14 @@ def humid_water_kg_from_gross(gross_kg: float, s: dict) -> float:
 
 # --------------------------------------------------------------------
 
+def _stat_mtime_ns():
+    try:
+        return os.stat(GLOBALS_PATH).st_mtime_ns
+    except OSError:
+        return None
+
 def load_global_settings():
-    global _CACHE, _CACHE_VERSION, _CACHE_LOADED_TS
+    global _CACHE, _CACHE_VERSION, _CACHE_LOADED_TS, _CACHE_MTIME_NS
     with _LOCK:
         if _CACHE is not None:
             return dict(_CACHE)
@@ -134,7 +148,7 @@ def load_global_settings():
             except Exception: pass
             data = {}
 
-        merged = dict(DEFAULTS); merged.update(data or {})
+        merged = {**DEFAULTS, **(data or {})}
 
         # --- MIGRATION: if old 'reservoir_full_weight_kg' present but no 'reservoir_full_capacity_kg',
         # derive capacity = full_gross - empty_gross.
@@ -147,44 +161,105 @@ def load_global_settings():
 
         # purge obsolete keys (but we KEEP reservoir_full_weight_kg for compatibility)
         removed = False
-        for k in list(merged.keys()):
-            if k in OBSOLETE_KEYS:
-                merged.pop(k, None); removed = True
+        for k in OBSOLETE_KEYS:
+            if k in merged:
+                del merged[k]; removed = True
         if removed:
             save_global_settings(merged)
-            return dict(merged)
+            return merged  # save took its own copy for _CACHE
 
-        _CACHE = dict(merged)
+        _CACHE = merged
         _CACHE_VERSION += 1
         _CACHE_LOADED_TS = time.time()
+        _CACHE_MTIME_NS = _stat_mtime_ns()
         return dict(_CACHE)
 
-def _atomic_write(path: str, text: str):
+def get_cached_global_settings():
+    """
+    Hot-path accessor for samplers / the control loop.
+    Costs one stat() per call and only reparses when the file's mtime changes.
+    Returns the shared cached dict (do NOT mutate it); the same object comes
+    back until the settings change, so callers can detect a reload with `is not`.
+    """
+    global _CACHE
+    mtime_ns = _stat_mtime_ns()
+    cache = _CACHE
+    if cache is not None and mtime_ns == _CACHE_MTIME_NS:
+        return cache
+    with _LOCK:
+        if _CACHE is None or mtime_ns != _CACHE_MTIME_NS:
+            _CACHE = None  # edited outside the app: force a reparse
+            load_global_settings()
+        return _CACHE
+
+def get_global_settings_view():
+    """
+    Read-only MappingProxyType over the cached settings, with the same stat()-gated
+    reload as get_cached_global_settings. Nothing is copied per call; callers
+    that need to edit should use load_global_settings(), which still copies.
+    """
+    global _CACHE_VIEW
+    cache = get_cached_global_settings()
+    hit = _CACHE_VIEW
+    if hit is None or hit[0] is not cache:
+        hit = _CACHE_VIEW = (cache, MappingProxyType(cache))
+    return hit[1]
+
+def _atomic_write(path: str, text: str, *, durable: bool = False):
+    """tmp file + os.replace; durable=True also fsyncs the data before the swap."""
     d = os.path.dirname(path) or "."
     with tempfile.NamedTemporaryFile("w", dir=d, delete=False) as tmp:
         tmp.write(text)
-        tmp.flush()
-        os.fsync(tmp.fileno())
+        if durable:
+            tmp.flush()
+            os.fsync(tmp.fileno())
         tmp_path = tmp.name
     os.replace(tmp_path, path)
 
-def save_global_settings(data: dict):
-    global _CACHE, _CACHE_VERSION, _CACHE_LOADED_TS
+def _backup_path(n: int) -> str:
+    return os.path.join(CONFIG_DIR, f"global_settings.backup.{n}.json")
+
+def _rotate_backups():
+    """
+    Shift backup.N -> backup.N+1 (dropping the oldest) and hard-link the current
+    file as backup.0. No data is copied: _atomic_write swaps in a new inode, so
+    the link keeps the previous contents.
+    """
+    if BACKUP_KEEP <= 0:
+        return
+    try:
+        for n in range(BACKUP_KEEP - 1, 0, -1):
+            src = _backup_path(n - 1)
+            if os.path.exists(src):
+                os.replace(src, _backup_path(n))
+        try:
+            os.link(GLOBALS_PATH, _backup_path(0))
+        except OSError:  # no hard links on this filesystem
+            shutil.copyfile(GLOBALS_PATH, _backup_path(0))
+    except Exception:
+        pass
+
+def save_global_settings(data: dict, *, durable: bool = False):
+    global _CACHE, _CACHE_VERSION, _CACHE_LOADED_TS, _CACHE_MTIME_NS, _LAST_WRITE_SHA
     with _LOCK:
         # keep cache in sync before write
-        _CACHE = dict(DEFAULTS); _CACHE.update(data or {})
+        _CACHE = {**DEFAULTS, **(data or {})}
 
         # ★ Back-compat mirror: always write derived 'reservoir_full_weight_kg'
         _CACHE["reservoir_full_weight_kg"] = full_gross_weight_kg(_CACHE)
         _CACHE["humid_res_full_weight_kg"] = humid_full_gross_weight_kg(_CACHE)
 
         payload = json.dumps(_CACHE, indent=2, sort_keys=True)
+        sha = hashlib.sha256(payload.encode()).digest()
+        if sha == _LAST_WRITE_SHA and _stat_mtime_ns() == _CACHE_MTIME_NS:
+            return  # same bytes as the file we wrote, and nobody touched it since
         if os.path.exists(GLOBALS_PATH):
-            ts = int(time.time())
-            shutil.copyfile(GLOBALS_PATH, os.path.join(CONFIG_DIR, f"global_settings.backup.{ts}.json"))
-        _atomic_write(GLOBALS_PATH, payload)
+            _rotate_backups()
+        _atomic_write(GLOBALS_PATH, payload, durable=durable)
+        _LAST_WRITE_SHA = sha
         _CACHE_VERSION += 1
         _CACHE_LOADED_TS = time.time()
+        _CACHE_MTIME_NS = _stat_mtime_ns()
 
 def validate_settings(raw: dict):
     """
@@ -3,12 +3,19 @@ import sqlite3, csv, io, json
 
 logs_bp = Blueprint("logs_bp", __name__)
 
+EXPORT_FETCH_ROWS = 1000  # rows per fetchmany()/yielded CSV chunk
+
+# Columns returned by /events, in SELECT order (rows come back as plain tuples)
+EVENT_COLS = (
+    "ts_local", "event_type", "reason_code", "msg",
+    "profile_id", "profile_version", "stage", "cycle_id", "actor", "cfg_sha",
+)
+_EVENT_COLS_SQL = ", ".join(EVENT_COLS)
+
 # ───────────────────────────── helpers ─────────────────────────────
 def _get_db():
     path = current_app.config.get("EVENTS_DB_PATH", "data/logs/events.db")
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return sqlite3.connect(path)
 
 
 # ───────────────────────────── routes ──────────────────────────────
@@ -32,8 +39,7 @@ def list_events():
     qmarks = ",".join("?" for _ in types)
 
     sql = f"""
-        SELECT ts_local, event_type, reason_code, msg,
-               profile_id, profile_version, stage, cycle_id, actor, cfg_sha
+        SELECT {_EVENT_COLS_SQL}
         FROM events
         WHERE event_type IN ({qmarks})
         ORDER BY ts_utc DESC
@@ -41,7 +47,7 @@ def list_events():
     """
     with _get_db() as conn:
         rows = conn.execute(sql, [*types, limit]).fetchall()
-    return jsonify([dict(r) for r in rows])
+    return jsonify([dict(zip(EVENT_COLS, r)) for r in rows])
 
 
 @logs_bp.route("/export.csv")
@@ -121,7 +127,7 @@ def export_csv():
 
     def generate():
         with sqlite3.connect(db_path) as conn:
-            conn.row_factory = sqlite3.Row
+            # Plain tuples already come back in base_cols order
             cur = conn.execute(sql, params)
 
             header = base_cols
@@ -129,15 +135,18 @@ def export_csv():
             buf = io.StringIO()
             writer = csv.writer(buf)
             writer.writerow(header)
-            yield buf.getvalue()
-            buf.seek(0)
-            buf.truncate(0)
 
-            for row in cur:
-                writer.writerow([row[c] for c in base_cols])
+            # One chunk per EXPORT_FETCH_ROWS rows (the header rides with the first)
+            while True:
+                rows = cur.fetchmany(EXPORT_FETCH_ROWS)
+                if not rows:
+                    break
+                writer.writerows(rows)
                 yield buf.getvalue()
                 buf.seek(0)
                 buf.truncate(0)
+            if buf.tell():
+                yield buf.getvalue()  # empty export: header only
 
     filename_bits = [frm or "start", to or "now"]
     if profile_id:
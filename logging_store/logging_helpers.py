@@ -12,7 +12,9 @@ def _log(event_type: str, msg: str, **kw):
     if LOGGER is None:
         return
     try:
-        LOGGER.log_event(event_type, msg, **kw)
+        kw["event_type"] = event_type
+        kw["msg"] = msg
+        LOGGER.emit(kw)
     except Exception:
         pass
 
@@ -23,7 +25,7 @@ def log_global_settings_snapshot(profile_id: str, globals_dict: Dict[str, Any],
         reason_code=reason,            # "globals" or "globals_edit"
         profile_id=(profile_id or ""),
         actor="ui",
-        payload={"global_parameters": globals_dict or {}},
+        payload={"global_parameters": dict(globals_dict or {})},
     )
 
 
@@ -18,6 +18,8 @@ CREATE TABLE IF NOT EXISTS events (
 CREATE INDEX IF NOT EXISTS idx_events_time ON events(ts_utc);
 CREATE INDEX IF NOT EXISTS idx_events_type_time ON events(event_type, ts_utc);
 CREATE INDEX IF NOT EXISTS idx_events_profile_time ON events(profile_id, ts_utc);
+-- newest-profiled-event lookup (export "current=1"): covering, skips rows without a profile
+CREATE INDEX IF NOT EXISTS idx_events_profiled_time ON events(ts_utc, profile_id) WHERE profile_id IS NOT NULL;
 
 -- optional: minute summaries for charts later (not used yet)
 CREATE TABLE IF NOT EXISTS minute_summaries (
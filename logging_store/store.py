@@ -1,26 +1,132 @@
-import os, json, sqlite3, threading, queue, time, datetime, atexit
+import os, json, sqlite3, threading, time, atexit
+from collections import deque
 from typing import Optional, Dict, Any, Iterable, Tuple
 
 ISO_UTC = "%Y-%m-%dT%H:%M:%S.%fZ"
 
+# Applied to the writer connection once; WAL lets readers (API/CSV export) run
+# alongside the writer and NORMAL skips the per-commit fsync of the WAL.
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=67108864",
+)
+
+# Module constant: the same string every batch, so sqlite3's statement cache
+# hands back the prepared statement instead of reparsing it.
+_INSERT_SQL = (
+    "INSERT INTO events ("
+    " ts_utc, ts_local, event_type, reason_code, msg,"
+    " profile_id, profile_version, stage, cycle_id, actor, cfg_sha, payload_json"
+    ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+def _apply_pragmas(conn: sqlite3.Connection):
+    for pragma in _WRITER_PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.Error:
+            pass
+
+# Timestamp strings: the "YYYY-MM-DDTHH:MM:SS" part comes from gmtime()/localtime()
+# and is reused while the second doesn't change (events arrive in bursts); only
+# the fraction is formatted per call. Output matches the datetime strftime()/
+# isoformat() chain it replaces, rounding included.
+_UTC_PREFIX = (None, "")
+_LOCAL_PREFIX = (None, "")
+
+def _split_us(t: float) -> Tuple[int, int]:
+    s = int(t)
+    us = round((t - s) * 1e6)  # same rounding as datetime.fromtimestamp
+    if us >= 1_000_000:
+        s += 1; us -= 1_000_000
+    return s, us
+
+def _utc_prefix(s: int) -> str:
+    global _UTC_PREFIX
+    hit = _UTC_PREFIX
+    if hit[0] != s:
+        tm = time.gmtime(s)
+        hit = _UTC_PREFIX = (s, f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+                                f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}")
+    return hit[1]
+
+def _local_prefix(s: int) -> str:
+    global _LOCAL_PREFIX
+    hit = _LOCAL_PREFIX
+    if hit[0] != s:
+        tm = time.localtime(s)
+        hit = _LOCAL_PREFIX = (s, f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}"
+                                  f"T{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}")
+    return hit[1]
+
 def _utc_now() -> str:
-    return datetime.datetime.utcnow().strftime(ISO_UTC)
+    s, us = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{_utc_prefix(s)}.{us:06d}Z"
 
 def _local_now() -> str:
-    return datetime.datetime.now().isoformat(timespec="milliseconds")
+    s, us = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{_local_prefix(s)}.{us // 1000:03d}"
+
+def _utc_iso(t: float) -> str:
+    s, us = _split_us(t)
+    return f"{_utc_prefix(s)}.{us:06d}Z"
+
+def _local_iso(t: float) -> str:
+    s, us = _split_us(t)
+    return f"{_local_prefix(s)}.{us // 1000:03d}"
+
+_SCALARS = frozenset((str, int, float, bool))
+
+class _Encoded(str):
+    """payload_json text already produced by _snapshot (a plain str payload is still data)."""
+    __slots__ = ()
+
+def _snapshot(payload):
+    """
+    Freeze a payload at log time. Immutable values and flat dicts of scalars
+    (shallow-copied) are left for the writer thread to encode; anything nested
+    is JSON-encoded here, since the caller may keep mutating the inner
+    dicts/lists after logging.
+    """
+    if payload is None or payload.__class__ in _SCALARS:
+        return payload
+    if payload.__class__ is dict:
+        for v in payload.values():
+            if v is not None and v.__class__ not in _SCALARS:
+                break
+        else:
+            return dict(payload)
+    try:
+        return _Encoded(json.dumps(payload, ensure_ascii=False, default=str))
+    except Exception as e:
+        return _Encoded(json.dumps({"_encode_error": repr(e)}))
 
 class EventLogger:
     """
     Single-writer event logger.
-    Use: LOGGER.log_event(...); a background thread batches inserts into SQLite.
+    Use: LOGGER.log_event(...) or LOGGER.emit({...}); a background thread
+    drains the ring buffer and batches inserts into SQLite.
     """
 
-    def __init__(self, db_path: str, schema_path: str, batch_size: int = 50, flush_ms: int = 250):
+    def __init__(self, db_path: str, schema_path: str, batch_size: int = 500, flush_ms: int = 250,
+                 max_pending: int = 5000, commit_interval_s: float = 0.5,
+                 checkpoint_interval_s: float = 30.0):
         self.db_path = db_path
         self.schema_path = schema_path
         self.batch_size = batch_size
         self.flush_ms = flush_ms
-        self.q: "queue.Queue[Tuple[str, Tuple]]" = queue.Queue(maxsize=5000)
+        # A trickle of events is coalesced into one transaction per interval;
+        # a full batch is written straight away.
+        self.commit_interval_s = commit_interval_s
+        # synchronous=NORMAL only fsyncs at WAL checkpoints; force one this often
+        # so a power cut loses at most this much history.
+        self.checkpoint_interval_s = checkpoint_interval_s
+        # Bounded ring: when full the oldest row is dropped, never the caller.
+        self.q: "deque[Tuple]" = deque(maxlen=max_pending)
+        self._wake = threading.Event()
         self._stop = threading.Event()
         self._thr: Optional[threading.Thread] = None
 
@@ -32,6 +138,7 @@ class EventLogger:
     def _init_db(self):
         conn = sqlite3.connect(self.db_path)
         try:
+            _apply_pragmas(conn)
             with open(self.schema_path, "r", encoding="utf-8") as f:
                 conn.executescript(f.read())
             conn.commit()
@@ -48,59 +155,84 @@ class EventLogger:
 
     def stop(self):
         self._stop.set()
-        try:
-            self.q.put_nowait(("__STOP__", ()))
-        except queue.Full:
-            pass
+        self._wake.set()
         if self._thr and self._thr.is_alive():
             self._thr.join(timeout=2.0)
         self._thr = None
 
     def _run(self):
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        cur = conn.cursor()
-        insert_sql = """
-            INSERT INTO events (
-              ts_utc, ts_local, event_type, reason_code, msg,
-              profile_id, profile_version, stage, cycle_id, actor, cfg_sha, payload_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        pending = []
-        deadline = time.time() + (self.flush_ms / 1000.0)
+        # isolation_level="IMMEDIATE": `with conn` opens each batch with BEGIN IMMEDIATE,
+        # taking the write lock up front instead of upgrading mid-transaction.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level="IMMEDIATE")
+        _apply_pragmas(conn)
+        q = self.q
+        popleft, encode = q.popleft, self._encode
+        wake = self._wake
+        wait_s = self.flush_ms / 1000.0
+        next_checkpoint = time.monotonic() + self.checkpoint_interval_s
 
-        while not self._stop.is_set():
-            try:
-                item = self.q.get(timeout=self.flush_ms / 1000.0)
-            except queue.Empty:
-                item = None
-
-            if item is not None:
-                tag, values = item
-                if tag == "__STOP__":
-                    if pending:
-                        cur.executemany(insert_sql, pending)
-                        conn.commit()
-                        pending.clear()
+        while True:
+            if not q:
+                if self._stop.is_set():
                     break
-                pending.append(values)
+                wake.wait(wait_s)
+                wake.clear()
+                continue
 
-            if pending and (len(pending) >= self.batch_size or time.time() >= deadline):
+            if len(q) < self.batch_size and not self._stop.is_set():
+                self._stop.wait(self.commit_interval_s)
+
+            # One transaction per batch (up to batch_size rows). Only this thread
+            # pops and appends never shrink the ring, so len(q) rows are there.
+            n = min(len(q), self.batch_size)
+            rows = [encode(popleft()) for _ in range(n)]
+            try:
+                with conn:
+                    conn.executemany(_INSERT_SQL, rows)
+            except Exception as e:
+                self._fallback_dump(rows, e)
+
+            if time.monotonic() >= next_checkpoint:
+                next_checkpoint = time.monotonic() + self.checkpoint_interval_s
                 try:
-                    cur.executemany(insert_sql, pending)
-                    conn.commit()
-                except Exception as e:
-                    self._fallback_dump(pending, e)
-                finally:
-                    pending.clear()
-                    deadline = time.time() + (self.flush_ms / 1000.0)
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.Error:
+                    pass
 
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")  # durable on clean shutdown
+        except sqlite3.Error:
+            pass
         conn.close()
 
+    @staticmethod
+    def _encode(row: Tuple) -> Tuple:
+        # Callers enqueue a raw time.time() float unless they pass explicit
+        # timestamps; the strings are formatted here, on the writer thread.
+        # Must not raise: an exception here would end the writer thread.
+        tsu, tsl, payload = row[0], row[1], row[11]
+        try:
+            if tsu.__class__ is float:
+                tsu = _utc_iso(tsu)
+            if tsl.__class__ is float:
+                tsl = _local_iso(tsl)
+        except (OverflowError, OSError, ValueError):
+            tsu, tsl = _utc_now(), _local_now()
+        if payload.__class__ is not _Encoded:
+            try:
+                payload = json.dumps(payload or {}, ensure_ascii=False, default=str)
+            except Exception as e:  # circular refs, dict changed size during iteration, ...
+                payload = json.dumps({"_encode_error": repr(e)})
+        return (tsu, tsl) + row[2:11] + (payload,)
+
     def _fallback_dump(self, rows: Iterable[Tuple], err: Exception):
         dump_path = self.db_path + ".fallback.ndjson"
         now = _utc_now()
-        with open(dump_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps({"ts_utc": now, "error": str(err), "rows": len(list(rows))}) + "\n")
+        try:
+            with open(dump_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"ts_utc": now, "error": str(err), "rows": len(list(rows))}) + "\n")
+        except Exception:
+            pass  # nowhere left to report it; keep the writer alive
 
     # ---------- Public API ----------
     def log_event(
@@ -119,8 +251,9 @@ class EventLogger:
         ts_utc: Optional[str] = None,
         ts_local: Optional[str] = None,
     ):
-        tsu = ts_utc or _utc_now()
-        tsl = ts_local or _local_now()
+        now = time.time()
+        tsu = ts_utc or now
+        tsl = ts_local or now
         values = (
             tsu,
             tsl,
@@ -133,19 +266,36 @@ class EventLogger:
             cycle_id,
             actor,
             cfg_sha,
-            json.dumps(payload or {}, ensure_ascii=False),
+            _snapshot(payload),  # flat dicts are JSON-encoded by the writer thread (see _encode)
         )
-        try:
-            self.q.put_nowait(("insert", values))
-        except queue.Full:
-            try:
-                self.q.get_nowait()
-                self.q.put_nowait(("insert", values))
-            except Exception:
-                pass
+        self.q.append(values)
+        self._wake.set()
+
+    def emit(self, event: Dict[str, Any]):
+        """
+        Non-blocking enqueue of an event dict (same keys as log_event's arguments).
+        Timestamp formatting (and encoding of flat payloads) is deferred to the writer thread.
+        """
+        g = event.get
+        now = time.time()
+        self.q.append((
+            g("ts_utc") or now,
+            g("ts_local") or now,
+            event["event_type"],
+            g("reason_code"),
+            g("msg", ""),
+            g("profile_id"),
+            g("profile_version"),
+            g("stage"),
+            g("cycle_id"),
+            g("actor"),
+            g("cfg_sha"),
+            _snapshot(g("payload")),
+        ))
+        self._wake.set()
 
     def flush(self):
-        time.sleep(self.flush_ms / 1000.0 + 0.05)
+        time.sleep(self.commit_interval_s + self.flush_ms / 1000.0 + 0.05)
 
 
 
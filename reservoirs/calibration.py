@@ -7,18 +7,34 @@ from devices import _set_nutrient_a, _set_nutrient_b
 
 CAL_PATH = "config/nutrient_cal.json"
 
+# (st_mtime_ns, st_size, parsed calibration); re-parsed only when the file changes
+_CAL_CACHE = None
+
 def _load() -> Dict[str, Any]:
-    if not os.path.exists(CAL_PATH):
+    """Calibration mapping; a fresh top-level copy, so callers may replace entries."""
+    global _CAL_CACHE
+    try:
+        st = os.stat(CAL_PATH)
+    except OSError:
+        _CAL_CACHE = None
         return {"A": {"ml_per_s": None, "last_cal": None}, "B": {"ml_per_s": None, "last_cal": None}}
-    with open(CAL_PATH, "r") as f:
-        return json.load(f)
+    hit = _CAL_CACHE
+    if hit is None or hit[0] != st.st_mtime_ns or hit[1] != st.st_size:
+        with open(CAL_PATH, "r") as f:
+            hit = _CAL_CACHE = (st.st_mtime_ns, st.st_size, json.load(f))
+    return dict(hit[2])
 
-def _save(d: Dict[str, Any]) -> None:
+def _save(d: Dict[str, Any], *, durable: bool = False) -> None:
+    global _CAL_CACHE
     os.makedirs("config", exist_ok=True)
     tmp = tempfile.mktemp(prefix="nutcal_", dir="config")
     with open(tmp, "w") as f:
         json.dump(d, f, indent=2)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
     shutil.move(tmp, CAL_PATH)
+    _CAL_CACHE = None
 
 def prime(pump: str, on: bool) -> None:
     """
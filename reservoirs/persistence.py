@@ -1,77 +1,142 @@
+import atexit
 import json
 import os
 import tempfile
+import threading
 from typing import Optional
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), "..", "config")
 STATE_PATH = os.path.join(CONFIG_DIR, "reservoir_state.json")
 os.makedirs(CONFIG_DIR, exist_ok=True)
 
+# (st_mtime_ns, st_size, parsed state); the load_* helpers are polled, the file rarely changes
+_STATE_CACHE = None
+
+# Saved-but-not-yet-written keys. Bursts of saves coalesce into one write
+# _FLUSH_DELAY_S after the last one; atexit forces whatever is left to disk.
+_FLUSH_DELAY_S = 0.5
+_PENDING = {}
+_FLUSH_TIMER = None
+_FLUSH_LOCK = threading.Lock()
+
 def _read_state() -> dict:
+    """
+    Parsed reservoir_state.json ({} if missing/invalid), re-read only when the
+    file's mtime/size change. Callers must not mutate it (copy before editing).
+    """
+    global _STATE_CACHE
+    try:
+        st = os.stat(STATE_PATH)
+    except OSError:
+        _STATE_CACHE = None
+        return {}
+    hit = _STATE_CACHE
+    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
     try:
         with open(STATE_PATH, "r") as f:
-            return json.load(f) or {}
+            data = json.load(f) or {}
     except Exception:
-        return {}
+        data = {}
+    _STATE_CACHE = (st.st_mtime_ns, st.st_size, data)
+    return data
 
 def load_last_fill_iso() -> Optional[str]:
     """Return the last reservoir fill ISO timestamp persisted to disk, if any."""
-    data = _read_state()
-    val = data.get("last_fill_iso")
+    val = _PENDING.get("last_fill_iso") or _read_state().get("last_fill_iso")
     return val if isinstance(val, str) and val.strip() else None
 
 def load_humid_last_fill_iso() -> Optional[str]:
     """Return the last humidifier reservoir fill ISO timestamp, if any."""
-    data = _read_state()
-    val = data.get("humid_last_fill_iso")
+    val = _PENDING.get("humid_last_fill_iso") or _read_state().get("humid_last_fill_iso")
     return val if isinstance(val, str) and val.strip() else None
 
 
-def save_last_fill_iso(iso_str: str) -> None:
-    """Persist the provided ISO timestamp so it survives restarts/crashes."""
+def _write_state(payload: dict, durable: bool) -> bool:
+    """
+    Atomically replace reservoir_state.json (tmp file + os.replace). The two
+    fsyncs (file data, then the directory entry) only run when durable=True.
+    Returns False if the file could not be replaced.
+    """
+    global _STATE_CACHE
     tmp_path = None
     try:
-        payload = _read_state()
-        payload["last_fill_iso"] = iso_str
         fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".resstate_", suffix=".json")
         with os.fdopen(fd, "w") as f:
             json.dump(payload, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
         os.replace(tmp_path, STATE_PATH)
-        # fsync the directory entry to be extra safe
-        dir_fd = os.open(CONFIG_DIR, os.O_DIRECTORY)
-        try:
-            os.fsync(dir_fd)
-        finally:
-            os.close(dir_fd)
+        _STATE_CACHE = None
+        if durable:
+            dir_fd = os.open(CONFIG_DIR, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        return True
     except Exception:
         if tmp_path and os.path.exists(tmp_path):
             try:
                 os.remove(tmp_path)
             except Exception:
                 pass
+        return False
 
-def save_humid_last_fill_iso(iso_str: str) -> None:
-    """Persist the humidifier reservoir last fill time alongside the main value."""
-    tmp_path = None
-    try:
-        payload = _read_state()
-        payload["humid_last_fill_iso"] = iso_str
-        fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".resstate_", suffix=".json")
-        with os.fdopen(fd, "w") as f:
-            json.dump(payload, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(tmp_path, STATE_PATH)
-        dir_fd = os.open(CONFIG_DIR, os.O_DIRECTORY)
+def _flush_locked(durable: bool) -> None:
+    global _FLUSH_TIMER
+    if _FLUSH_TIMER is not None:
+        _FLUSH_TIMER.cancel()
+        _FLUSH_TIMER = None
+    if not _PENDING:
+        return
+    payload = dict(_read_state())
+    payload.update(_PENDING)
+    if _write_state(payload, durable):
+        _PENDING.clear()
+    else:
+        # keep the values (getters still see them) and retry later
         try:
-            os.fsync(dir_fd)
-        finally:
-            os.close(dir_fd)
-    except Exception:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.remove(tmp_path)
-            except Exception:
-                pass
+            _arm_timer()
+        except RuntimeError:  # no new threads at interpreter shutdown (atexit flush)
+            pass
+
+def _flush(durable: bool = False) -> None:
+    """Write all pending keys in one atomic replace."""
+    with _FLUSH_LOCK:
+        _flush_locked(durable)
+
+def _flush_sync() -> None:
+    _flush(durable=True)
+
+atexit.register(_flush_sync)
+
+def _save_key(key: str, value, durable: bool) -> None:
+    with _FLUSH_LOCK:
+        _PENDING[key] = value
+        if durable:
+            _flush_locked(True)
+            return
+        _arm_timer()
+
+def _arm_timer() -> None:
+    """(Re)start the deferred flush; caller holds _FLUSH_LOCK."""
+    global _FLUSH_TIMER
+    if _FLUSH_TIMER is not None:
+        _FLUSH_TIMER.cancel()
+    t = threading.Timer(_FLUSH_DELAY_S, _flush)
+    t.daemon = True
+    _FLUSH_TIMER = t
+    t.start()
+
+def save_last_fill_iso(iso_str: str, *, durable: bool = False) -> None:
+    """
+    Persist the provided ISO timestamp so it survives restarts. The write is
+    deferred/coalesced; durable=True writes (and fsyncs) immediately.
+    """
+    _save_key("last_fill_iso", iso_str, durable)
+
+def save_humid_last_fill_iso(iso_str: str, *, durable: bool = False) -> None:
+    """Persist the humidifier reservoir last fill time alongside the main value."""
+    _save_key("humid_last_fill_iso", iso_str, durable)
@@ -5,7 +5,7 @@ import threading
 from typing import Optional, Dict, Any
 from time import monotonic as _mono
 
-from global_settings import load_global_settings
+from global_settings import get_global_settings_view
 from devices import _set_agitator, _set_concentrate_mix, _set_nutrient_a, _set_nutrient_b
 
 # NEW: capacity & conversion helpers
@@ -89,7 +89,7 @@ def compute_fill_status(res_gross_kg: Optional[float]) -> Dict[str, Any]:
     Kept for compatibility if you want to call it elsewhere.
     Not used directly by the current routes.py.
     """
-    gs = load_global_settings()
+    gs = get_global_settings_view()
     target_l = float(gs.get("reservoir_target_liters", 0.0) or 0.0)
 
     # If we don't have a reading or capacity is invalid, return empty-ish status
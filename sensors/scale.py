@@ -1,5 +1,6 @@
 # sensors/scale.py
 import os, json, statistics, threading
+from time import monotonic as _mono
 import RPi.GPIO as GPIO
 GPIO.setwarnings(False)
 # Ensure pins use BCM numbering (required before interacting with GPIO)
@@ -29,8 +30,22 @@ HUMID_SCK_PIN = 19
 _SCALE_LOCK = threading.RLock()
 _HUMID_SCALE_LOCK = threading.RLock()
 
+# path -> (st_mtime_ns, parsed cal or None); the samplers ask every tick
+_CAL_CACHE: dict = {}
+
 def _load_scale_cal(path: str = CAL_PATH):
-    """Return calibration dict or None if missing/invalid."""
+    """
+    Return calibration dict or None if missing/invalid.
+    Re-parsed only when the file's mtime changes; callers must not mutate it.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        _CAL_CACHE.pop(path, None)
+        return None
+    hit = _CAL_CACHE.get(path)
+    if hit is not None and hit[0] == mtime_ns:
+        return hit[1]
     try:
         with open(path, "r") as f:
             cal = json.load(f)
@@ -38,9 +53,10 @@ def _load_scale_cal(path: str = CAL_PATH):
         _ = float(cal["baseline_counts"])
         _ = float(cal["counts_per_kg"])
         # Optional pins for documentation; the HX711 object is still created with BCM GPIO numbers
-        return cal
     except Exception:
-        return None
+        cal = None
+    _CAL_CACHE[path] = (mtime_ns, cal)
+    return cal
 
 def _load_humid_scale_cal():
     return _load_scale_cal(HUMID_CAL_PATH)
@@ -57,13 +73,47 @@ def _open_hx(dt_pin: int | None = None, sck_pin: int | None = None):
     hx.reset()
     return hx
 
-def _read_counts_n(hx, n=15):
+# Max time to block for DOUT to go low (HX711 at 10 SPS converts every ~100 ms)
+READY_TIMEOUT_MS = 200
+# Each edge wait is this short, with the level re-read in between: a falling
+# edge that lands between the level check and the wait costs at most one slice
+READY_SLICE_MS = 5
+
+
+def _wait_ready(dt_pin: int, timeout_ms: int = READY_TIMEOUT_MS) -> bool:
+    """
+    Block in the kernel until the HX711 signals data-ready (DOUT falling),
+    so the library's own ready poll finds the sample waiting instead of spinning.
+    Returns False on timeout.
+    """
+    deadline = _mono() + timeout_ms / 1000.0
+    while GPIO.input(dt_pin) != 0:
+        left_ms = int((deadline - _mono()) * 1000)
+        if left_ms <= 0:
+            return False
+        try:
+            GPIO.wait_for_edge(dt_pin, GPIO.FALLING, timeout=min(READY_SLICE_MS, left_ms))
+        except RuntimeError:
+            # Edge detection unavailable/conflicting on this pin: let the library poll
+            return True
+    return True
+
+
+def _read_counts_n(hx, n=15, dt_pin: int | None = None):
     """
     Return a median of n raw counts, supporting several hx711 APIs.
+    With dt_pin, each sample is taken only after DOUT reports ready.
     """
     # Preferred: batch list
     if hasattr(hx, "get_raw_data"):
-        vals = hx.get_raw_data(n)
+        if dt_pin is None:
+            vals = hx.get_raw_data(n)
+        else:
+            vals = []
+            for _ in range(n):
+                if not _wait_ready(dt_pin):
+                    continue
+                vals.extend(hx.get_raw_data(1) or ())
         if vals:
             try:
                 vals = [int(v) for v in vals if v is not None]
@@ -88,7 +138,7 @@ def _scale_read_counts_for_pins(dt_pin: int, sck_pin: int, n=8, lock=None):
     with lock_obj:
         hx = _open_hx(dt_pin=dt_pin, sck_pin=sck_pin)
         try:
-            return _read_counts_n(hx, n=n)
+            return _read_counts_n(hx, n=n, dt_pin=dt_pin)
         finally:
             try:
                 if hasattr(hx, "power_down"):
@@ -106,6 +156,19 @@ def _scale_read_counts_humid(n=8):
     return _scale_read_counts_for_pins(HUMID_DT_PIN, HUMID_SCK_PIN, n=n, lock=_HUMID_SCALE_LOCK)
 
 
+def _median_ema(ring, prev, alpha):
+    """
+    Median of the recent counts in ``ring`` folded into the running EMA ``prev``.
+    The ring is tiny (a handful of ticks), so a sort is cheaper than anything fancier.
+    """
+    vals = sorted(ring)
+    k = len(vals)
+    med = vals[k // 2] if k % 2 else (vals[k // 2 - 1] + vals[k // 2]) / 2.0
+    if prev is None:
+        return float(med)
+    return prev + alpha * (med - prev)
+
+
 
 
 def _read_scale_kg(*, cal_loader, reader, empty_kg: float = 0.0):
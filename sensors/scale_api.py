@@ -13,7 +13,7 @@ from sensors.scale import (
     CAL_PATH,
     HUMID_CAL_PATH,
 )
-from global_settings import load_global_settings
+from global_settings import get_global_settings_view
 
 scale_bp = Blueprint("scale", __name__)
 
@@ -67,7 +67,7 @@ def _compute_from_counts(scale_id: str, counts: float | None, cal: dict | None):
         except Exception:
             water_kg = None
 
-        gs = load_global_settings()
+        gs = get_global_settings_view()
         defs = _scale_defs()[scale_id]
         empty = float(gs.get(defs["empty_key"], 0.0) or 0.0)
         usable = float(gs.get(defs["capacity_key"], 0.0) or 0.0)
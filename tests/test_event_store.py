@@ -0,0 +1,53 @@
+import json
+import os
+import sqlite3
+
+from logging_store.store import EventLogger
+
+SCHEMA = os.path.join(os.path.dirname(__file__), "..", "logging_store", "schema.sql")
+
+
+def _payloads(tmp_path, log):
+    db = str(tmp_path / "events.db")
+    logger = EventLogger(db, SCHEMA).start()
+    try:
+        log(logger)
+    finally:
+        logger.stop()
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute("SELECT msg, payload_json FROM events ORDER BY id").fetchall()
+    return {msg: json.loads(p) for msg, p in rows}
+
+
+def test_payload_json_round_trips(tmp_path):
+    nested = {"pump": {"on_duration_sec": 10}}
+    flat = {"device_name": "fan", "after_state": "on"}
+
+    def log(logger):
+        logger.log_event("profile_lifecycle", "str", payload="profile paused")
+        logger.log_event("profile_lifecycle", "none")
+        logger.log_event("actuator_change", "flat", payload=flat)
+        logger.emit({"event_type": "profile_lifecycle", "msg": "nested",
+                     "payload": {"parameters": nested}})
+        # mutated after logging: the rows keep the values from log time
+        flat["after_state"] = "off"
+        nested["pump"]["_win_on_h"] = 1.0
+
+    got = _payloads(tmp_path, log)
+    assert got["str"] == "profile paused"
+    assert got["none"] == {}
+    assert got["flat"] == {"device_name": "fan", "after_state": "on"}
+    assert got["nested"] == {"parameters": {"pump": {"on_duration_sec": 10}}}
+
+
+def test_unencodable_payload_keeps_writer_alive(tmp_path):
+    loop = {}
+    loop["self"] = loop
+
+    def log(logger):
+        logger.log_event("alert", "bad", payload=loop)
+        logger.log_event("alert", "ok", payload={"a": 1})
+
+    got = _payloads(tmp_path, log)
+    assert "_encode_error" in got["bad"]
+    assert got["ok"] == {"a": 1}
@@ -23,8 +23,16 @@ def _ensure_gpio_mode():       return ctx()["_ensure_gpio_mode"]()
 
 def PROFILE_DIR():             return ctx()["PROFILE_DIR"]
 
+def _onoff(v):
+    """Canonical "ON"/"OFF" literal, so the control loop's == "ON" checks hit the identity fast path."""
+    return "ON" if str(v).strip().upper() == "ON" else "OFF"
+
 @bp.route('/run/<profile_name>', methods=['POST'])
 def run_profile(profile_name):
+    if running_profile() == profile_name:
+        flash(f"Profile '{profile_name}' is already running.")
+        return redirect(url_for('profiles.list_profiles'))
+
     pth = os.path.join(PROFILE_DIR(), profile_name)
     if not os.path.exists(pth):
         flash(f"Profile '{profile_name}' not found.")
@@ -285,13 +293,13 @@ def resume_profile():
     sd.update(
         profile=pname,
         start_time=state.get("start_time"),
-        pump_state=state.get("pump_state", "OFF"),
-        fan_state=state.get("fan_state", "OFF"),
+        pump_state=_onoff(state.get("pump_state", "OFF")),
+        fan_state=_onoff(state.get("fan_state", "OFF")),
         cycle_count=state.get("cycle_count", 0),
         paused=state.get("paused", False),
-        heater_state=state.get("heater_state", "OFF"),
-        humidifier_state=state.get("humidifier_state", "OFF"),
-        agitator_state=state.get("agitator_state", "OFF"),
+        heater_state=_onoff(state.get("heater_state", "OFF")),
+        humidifier_state=_onoff(state.get("humidifier_state", "OFF")),
+        agitator_state=_onoff(state.get("agitator_state", "OFF")),
     )
 
     try: apply_outputs_from_status()
@@ -18,6 +18,7 @@ def PROFILE_DIR():             return ctx()["PROFILE_DIR"]
 def ARCHIVE_DIR():             return ctx()["ARCHIVE_DIR"]
 
 def running_profile():         return ctx()["get_running_profile"]()
+def request_profile_reload():  return ctx()["request_profile_reload"]()
 def status_data():             return ctx()["status_data"]
 
 def load_state():              return ctx()["load_state"]()
@@ -200,6 +201,8 @@ def edit_profile(profile_name):
 
         with open(src_path, "w") as f:
             json.dump(data, f, indent=2)
+        if running_profile() == profile_name:
+            request_profile_reload()
 
         try:
             LOGGER().log_event(
@@ -1,7 +1,15 @@
 #web/systems_routes.py
-from flask import Blueprint, render_template, jsonify, make_response, current_app
+import json
+import threading
+from time import monotonic as _mono
+from flask import Blueprint, render_template, jsonify, make_response, current_app, Response
 # NEW: capacity helper to compute "water used"
-from global_settings import usable_capacity_kg
+from global_settings import usable_capacity_kg, get_global_settings_view
+
+try:
+    import orjson as _orjson  # optional: C-speed serializer
+except ImportError:
+    _orjson = None
 
 bp = Blueprint("system", __name__)
 
@@ -19,28 +27,73 @@ def home():
 def logs_ui():
     return render_template('logs.html')
 
-@bp.route('/status.json')
-def status_json():
-    sd = status_data()
-    def ONOFF(val): return "ON" if str(val).strip().upper() == "ON" else "OFF"
+# Pre-serialized /status.json body, refreshed by the control loop / ambient sampler.
+# Polls within STATUS_JSON_MAX_AGE_S reuse the bytes instead of re-serializing.
+STATUS_JSON_MAX_AGE_S = 1.0
+STATUS_JSON_MIN_REFRESH_S = 0.5
+_STATUS_JSON = (float("-inf"), b"{}")   # (monotonic ts, body)
+_STATUS_JSON_LOCK = threading.Lock()
+
+def _dumps(payload) -> bytes:
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(payload)
+        except TypeError:
+            pass
+    return json.dumps(payload, default=str).encode("utf-8")
+
+def _store_status_json(body: bytes, ts: float):
+    global _STATUS_JSON
+    with _STATUS_JSON_LOCK:
+        _STATUS_JSON = (ts, body)
+
+def refresh_status_json(c, *, force=False):
+    """
+    Rebuild the cached /status.json body from CTX `c` (no request context needed).
+    Rate-limited to STATUS_JSON_MIN_REFRESH_S unless force=True.
+    """
+    now = _mono()
+    if not force and (now - _STATUS_JSON[0]) < STATUS_JSON_MIN_REFRESH_S:
+        return
+    _store_status_json(_dumps(_build_status_payload(c)), now)
+
+# State values that read as ON: the "ON" literal (what the control loop and
+# routes store) and True (nutrient_A_on/B_on are bools; True == 1 also matches 1)
+_ON_VALUES = frozenset(("ON", True))
+
+def _onoff(val) -> str:
+    try:
+        if val in _ON_VALUES:
+            return "ON"
+    except TypeError:  # unhashable junk
+        return "OFF"
+    if val.__class__ is str and val != "OFF":
+        return "ON" if val.strip().upper() == "ON" else "OFF"  # legacy " on " etc.
+    return "OFF"
+
+def _build_status_payload(c) -> dict:
+    sd = c["status_data"]
+    if hasattr(sd, "as_dict"):
+        sd = sd.as_dict()  # one flat copy; the ~60 lookups below are then plain dict gets
+    profile = c["get_running_profile"]()
     payload = {
-        "profile":        running_profile(),
+        "profile":        profile,
         "start_time":     sd.get("start_time"),
 
-        "pump_state":     ONOFF(sd.get("pump_state")),
-        "agitator_state": ONOFF(sd.get("agitator_state")),
-        "air_pump_state": ONOFF(sd.get("air_pump_state")),
+        "pump_state":     _onoff(sd.get("pump_state")),
+        "agitator_state": _onoff(sd.get("agitator_state")),
+        "air_pump_state": _onoff(sd.get("air_pump_state")),
 
         "cycle_count":    sd.get("cycle_count") or 0,
-        "fan_state":      ONOFF(sd.get("fan_state")),
+        "fan_state":      _onoff(sd.get("fan_state")),
         "paused":         bool(sd.get("paused")),
 
-        "heater_state":       ONOFF(sd.get("heater_state")),
-        "humidifier_state":   ONOFF(sd.get("humidifier_state")),
-        "extractor_state":    ONOFF(sd.get("extractor_state", sd.get("fan_state", "OFF"))),
-        "nutrient_a_state":   ONOFF(sd.get("nutrient_A_on")),
-        "nutrient_b_state":   ONOFF(sd.get("nutrient_B_on")),
-        "concentrate_mix_state": ONOFF(sd.get("concentrate_mix_state")),
+        "heater_state":       _onoff(sd.get("heater_state")),
+        "humidifier_state":   _onoff(sd.get("humidifier_state")),
+        "extractor_state":    _onoff(sd.get("extractor_state", sd.get("fan_state", "OFF"))),
+        "nutrient_a_state":   _onoff(sd.get("nutrient_A_on")),
+        "nutrient_b_state":   _onoff(sd.get("nutrient_B_on")),
+        "concentrate_mix_state": _onoff(sd.get("concentrate_mix_state")),
 
         "pump_time_remaining_s":      sd.get("pump_time_remaining_s"),
         "agitator_time_remaining_s":  sd.get("agitator_time_remaining_s"),
@@ -72,7 +125,7 @@ def status_json():
         "last_error":               sd.get("last_error"),
     }
 
-    payload["system_active"] = bool(running_profile())
+    payload["system_active"] = bool(profile)
 
 
 
@@ -99,8 +152,8 @@ def status_json():
 
     # NEW: compute "Water Used" = full capacity - water left
     try:
-        gs = ctx()["load_global_settings"]()
-        cap = usable_capacity_kg(gs)  # kg at "full"
+        # read-only cached view: this runs on every status refresh, so no copy
+        cap = usable_capacity_kg(get_global_settings_view())  # kg at "full"
     except Exception:
         cap = 0.0
     water_left = payload.get("reservoir_water_kg")
@@ -110,7 +163,7 @@ def status_json():
     )
 
     try:
-        payload["banner"] = compute_banner(payload)
+        payload["banner"] = c["compute_banner"](payload)
     except Exception:
         payload["banner"] = {"level": "info", "message": "System nominal", "rotate": []}
 
@@ -122,8 +175,16 @@ def status_json():
         }
     except Exception:
         payload["manual_overrides"] = {}
+    return payload
 
-    resp = make_response(jsonify(payload))
+@bp.route('/status.json')
+def status_json():
+    ts, body = _STATUS_JSON
+    now = _mono()
+    if (now - ts) > STATUS_JSON_MAX_AGE_S:
+        body = _dumps(_build_status_payload(ctx()))
+        _store_status_json(body, now)
+    resp = Response(body, mimetype="application/json")
     resp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
     resp.headers['Pragma'] = 'no-cache'
     return resp